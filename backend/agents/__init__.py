@@ -3,6 +3,7 @@ from .icp_agent import ICPAgent
 from .segmentation_agent import SegmentationAgent
 from .messaging_agent import MessagingAgent
 from .critic_agent import CriticAgent
+from .section_critic import SectionCriticAgent
 from .orchestrator import orchestrate, orchestrate_stream
 
 __all__ = [
@@ -11,6 +12,7 @@ __all__ = [
     "SegmentationAgent",
     "MessagingAgent",
     "CriticAgent",
+    "SectionCriticAgent",
     "orchestrate",
     "orchestrate_stream",
 ]
@@ -3,8 +3,10 @@ BaseAgent — abstract class every agent inherits from.
 
 Guarantees:
   - Uniform interface (.run())
-  - Structured JSON output
-  - Timing metadata
+  - Structured JSON output, validated against the agent's output_schema;
+    invalid or missing fields are repaired with small follow-up calls
+  - Per-agent model tier, routed around latency SLOs (agents/routing.py)
+  - Timing metadata, a tracing span and Prometheus metrics per call
   - Isolated system prompts
 """
 
@@ -15,21 +17,83 @@ import logging
 import os
 import time
 from abc import ABC, abstractmethod
-from openai import AsyncOpenAI
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from opentelemetry.trace import Status, StatusCode
+from pydantic import BaseModel, ValidationError
+
+from core.metrics import (
+    AGENT_LATENCY,
+    LLM_ERRORS,
+    LLM_JSON_FAILURES,
+    LLM_REPAIR_LATENCY,
+    LLM_REPAIRS,
+    LLM_RETRIES,
+    LLM_ROUTES,
+    LLM_VALIDATION_FAILURES,
+)
+from core.tracing import tracer
+
+from .routing import Route, router
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
 _client: AsyncOpenAI | None = None
 
+# Agent making the current LLM call, for labelling retries seen by the HTTP client
+_current_agent: ContextVar[str] = ContextVar("current_agent", default="unknown")
+
+
+async def _count_retry(request) -> None:
+    if request.headers.get("x-stainless-retry-count", "0") != "0":
+        LLM_RETRIES.labels(_current_agent.get()).inc()
+
 
 def _get_client() -> AsyncOpenAI:
     global _client
     if _client is None:
-        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Imported on first use: the SDK is the slowest import at startup
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(event_hooks={"request": [_count_retry]}),
+        )
     return _client
 
 
-MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+MAX_REPAIR_ATTEMPTS = int(os.getenv("AGENT_REPAIR_ATTEMPTS", "2"))
+
+_MAX_ERRORS_IN_PROMPT = 20
+
+
+def _invalid_fields(errors: list[dict], schema: type[BaseModel]) -> list[str]:
+    """Top-level fields named by validation errors (all required ones if the whole object is bad)."""
+    fields = {str(e["loc"][0]) for e in errors if e["loc"]}
+    if any(not e["loc"] for e in errors):
+        fields |= {name for name, f in schema.model_fields.items() if f.is_required()}
+    return sorted(fields)
+
+
+def _schema_errors(data: dict, schema: type[BaseModel]) -> list[dict]:
+    try:
+        schema.model_validate(data)
+    except ValidationError as e:
+        return e.errors(include_url=False)
+    return []
+
+
+def _add_usage(usage: dict[str, int], u) -> None:
+    """Accumulate token counts from an SDK usage object or a batch-output usage dict."""
+    if u is None:
+        return
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = u.get(key) if isinstance(u, dict) else getattr(u, key, 0)
+        usage[key] = usage.get(key, 0) + (value or 0)
 
 
 class BaseAgent(ABC):
@@ -38,38 +102,210 @@ class BaseAgent(ABC):
       - name        (str)  — identifier
       - system_prompt (str) — its reasoning persona
       - build_user_prompt(**ctx) → str
+    and may set output_schema to have responses validated and repaired.
     """
 
     name: str = "base"
     system_prompt: str = "You are a helpful assistant."
+    output_schema: type[BaseModel] | None = None  # see agents/schemas.py
 
     @abstractmethod
     def build_user_prompt(self, **context) -> str:
         ...
 
-    async def run(self, **context) -> dict:
-        """Execute the agent: call LLM, parse JSON, attach timing."""
-        start = time.time()
-        user_prompt = self.build_user_prompt(**context)
+    def _request_body(self, user_prompt: str, route: Route, temperature: float | None = None) -> dict:
+        """chat.completions parameters for one JSON-mode call; also the body of a batch request line."""
+        return {
+            "model": route.model,
+            "temperature": route.temperature if temperature is None else temperature,
+            "max_tokens": route.max_tokens,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        }
+
+    async def _complete(
+        self, user_prompt: str, usage: dict[str, int], route: Route, temperature: float | None = None
+    ) -> str:
+        """One chat completion in JSON mode on the routed model; adds token usage to `usage`."""
+        resp = await _get_client().chat.completions.create(**self._request_body(user_prompt, route, temperature))
+        _add_usage(usage, getattr(resp, "usage", None))
+        return resp.choices[0].message.content or "{}"
+
+    def _repair_prompt(self, data: dict, fields: list[str], errors: list[dict]) -> str:
+        lines = [
+            f"- {'.'.join(str(p) for p in e['loc']) or '(response)'}: {e['msg']}"
+            for e in errors[:_MAX_ERRORS_IN_PROMPT]
+        ]
+        current = {k: data[k] for k in fields if k in data}
+        return (
+            "Your previous JSON response failed schema validation.\n\n"
+            "ERRORS:\n" + "\n".join(lines) + "\n\n"
+            f"CURRENT VALUES OF THE FIELDS TO FIX:\n{json.dumps(current)}\n\n"
+            f"Return a JSON object containing ONLY these keys, corrected to match the schema "
+            f"in your instructions: {', '.join(fields)}."
+        )
+
+    async def _validated(self, raw: str, usage: dict[str, int], route: Route, span) -> tuple[dict, dict]:
+        """
+        Validate `raw` against output_schema, then repair: resend only the
+        failing top-level fields and their errors, merge the answer back,
+        re-validate — at most MAX_REPAIR_ATTEMPTS times.
+        Returns (result, validation info).
+        """
+        schema = self.output_schema
+        try:
+            return schema.model_validate_json(raw).model_dump(mode="json"), {"valid": True, "repairs": 0}
+        except ValidationError as e:
+            errors = e.errors(include_url=False)
+
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict):
+            logger.warning("[%s] Response is not a JSON object: %s", self.name, raw[:200])
+            span.set_attribute("agent.json_parse_failed", True)
+            LLM_JSON_FAILURES.labels(self.name).inc()
+            data = {}
+            errors = _schema_errors(data, schema)
+
+        fields = _invalid_fields(errors, schema)
+        first_fields = fields
+        for f in fields:
+            LLM_VALIDATION_FAILURES.labels(self.name, f).inc()
+
+        result = None
+        attempts = 0
+        repair_start = time.time()
+        while attempts < MAX_REPAIR_ATTEMPTS:
+            attempts += 1
+            try:
+                patch = json.loads(await self._complete(self._repair_prompt(data, fields, errors), usage, route, 0.0))
+            except Exception as e:
+                logger.warning("[%s] Repair call %d failed: %s", self.name, attempts, e)
+                LLM_REPAIRS.labels(self.name, "error").inc()
+                continue
+            if isinstance(patch, dict):
+                data.update({k: v for k, v in patch.items() if k in fields})
+            errors = _schema_errors(data, schema)
+            if not errors:
+                result = schema.model_validate(data).model_dump(mode="json")
+                LLM_REPAIRS.labels(self.name, "fixed").inc()
+                break
+            LLM_REPAIRS.labels(self.name, "invalid").inc()
+            fields = _invalid_fields(errors, schema)
+
+        repair_s = time.time() - repair_start
+        if attempts:
+            LLM_REPAIR_LATENCY.labels(self.name).observe(repair_s)
+        valid = result is not None
+        if not valid:
+            logger.warning("[%s] Still invalid after %d repairs: %s", self.name, attempts, ", ".join(fields))
+            result = data or {"raw": raw}  # best effort, as before validation existed
+        span.set_attribute("agent.validation_failed", True)
+        span.set_attribute("agent.invalid_fields", first_fields)
+        span.set_attribute("agent.repairs", attempts)
+        span.set_attribute("agent.repaired", valid)
+        return result, {
+            "valid": valid,
+            "repairs": attempts,
+            "repair_s": round(repair_s, 2),
+            "invalid_fields": first_fields,
+        }
+
+    async def _parse(self, raw: str, usage: dict[str, int], route: Route, span) -> tuple[dict, dict | None]:
+        """Response text → (result, validation info or None for schema-less agents)."""
+        span.set_attribute("llm.response_chars", len(raw))
+        if self.output_schema is not None:
+            return await self._validated(raw, usage, route, span)
         try:
-            client = _get_client()
-            resp = await client.chat.completions.create(
-                model=MODEL,
-                temperature=0.4,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-            )
-            raw = resp.choices[0].message.content or "{}"
-            result = json.loads(raw)
+            return json.loads(raw), None
         except json.JSONDecodeError:
             logger.warning("[%s] Failed to parse JSON response: %s", self.name, raw[:200])
-            result = {"raw": raw}  # type: ignore[possibly-undefined]
-        except Exception as e:
-            logger.error("[%s] Agent call failed: %s", self.name, e)
-            result = {"error": str(e)}
+            span.set_attribute("agent.json_parse_failed", True)
+            LLM_JSON_FAILURES.labels(self.name).inc()
+            return {"raw": raw}, None
+
+    def _span_attributes(self, span, route: Route, prompt_chars: int) -> None:
+        span.set_attribute("agent.name", self.name)
+        span.set_attribute("llm.model", route.model)
+        span.set_attribute("llm.tier", route.tier)
+        span.set_attribute("llm.route_reason", route.reason)
+        span.set_attribute("llm.prompt_chars", prompt_chars)
+
+    def _fail(self, span, error: Exception | str) -> dict:
+        logger.error("[%s] Agent call failed: %s", self.name, error)
+        if isinstance(error, Exception):
+            span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, str(error)))
+        LLM_ERRORS.labels(self.name).inc()
+        return {"error": str(error)}
+
+    def _output(self, result: dict, elapsed_s: float, route: Route, validation: dict | None) -> dict:
+        out = {"agent": self.name, "result": result, "elapsed_s": round(elapsed_s, 2), "routing": route.as_dict()}
+        if validation is not None:
+            out["validation"] = validation
+        return out
+
+    async def run(self, **context) -> dict:
+        """Execute the agent: call LLM, validate (and repair) JSON, attach timing."""
+        start = time.time()
+        user_prompt = self.build_user_prompt(**context)
+        _current_agent.set(self.name)
+        validation = None
+        route = router.route(self.name)
+        LLM_ROUTES.labels(self.name, route.model, route.reason).inc()
+        with tracer.start_as_current_span(f"agent {self.name}") as span:
+            self._span_attributes(span, route, len(self.system_prompt) + len(user_prompt))
+            usage: dict[str, int] = {}
+            try:
+                call_start = time.time()
+                raw = await self._complete(user_prompt, usage, route)
+                router.observe(self.name, route.model, time.time() - call_start)
+                result, validation = await self._parse(raw, usage, route, span)
+            except Exception as e:
+                result = self._fail(span, e)
+            for key, value in usage.items():
+                span.set_attribute(f"llm.usage.{key}", value)
+
+        AGENT_LATENCY.labels(self.name).observe(time.time() - start)
+        return self._output(result, time.time() - start, route, validation)
+
+    # ── Batch execution (agents/batch.py) ──
+
+    def batch_request(self, **context) -> tuple[Route, dict]:
+        """
+        Route and chat.completions body for this call, to be submitted in a
+        batch. Batches are not latency-bound, so the SLO router is bypassed.
+        """
+        route = router.route(self.name, use_slo=False)
+        route.reason = "batch"
+        LLM_ROUTES.labels(self.name, route.model, route.reason).inc()
+        return route, self._request_body(self.build_user_prompt(**context), route)
 
-        elapsed = round(time.time() - start, 2)
-        return {"agent": self.name, "result": result, "elapsed_s": elapsed}
+    async def from_batch(
+        self, route: Route, raw: str | None, error: str | None, usage: dict | None, elapsed_s: float
+    ) -> dict:
+        """
+        Finish a call answered by a batch: same validation, repair and output
+        shape as run(). Repairs, if any, are ordinary interactive calls.
+        """
+        _current_agent.set(self.name)
+        validation = None
+        totals: dict[str, int] = {}
+        _add_usage(totals, usage)
+        with tracer.start_as_current_span(f"agent {self.name} (batch)") as span:
+            self._span_attributes(span, route, 0)
+            try:
+                if error is not None:
+                    result = self._fail(span, error)
+                else:
+                    result, validation = await self._parse(raw or "{}", totals, route, span)
+            except Exception as e:
+                result = self._fail(span, e)
+            for key, value in totals.items():
+                span.set_attribute(f"llm.usage.{key}", value)
+        return self._output(result, elapsed_s, route, validation)
@@ -0,0 +1,259 @@
+"""
+Batch orchestration — the same pipeline for many briefs, one provider batch per stage.
+
+For bulk runs (a brief per segment, nightly) latency does not matter but
+interactive rate limits and prices do. orchestrate_batch() advances every
+job through the DAG together:
+
+  stage 1  ICP + Segmentation for every job     → one batch
+  stage 2  Messaging for every job               → one batch
+           compose every brief locally
+  stage 3  Critic for every job                  → one batch
+
+Each stage's requests are written as JSONL under BATCH_DIR/<run_id>/,
+submitted through a BatchProvider (batch_providers.py), polled every
+BATCH_POLL_S, and fed back through BaseAgent.from_batch, so results are
+validated and shaped exactly as in orchestrate(). A stage larger than
+BATCH_MAX_REQUESTS is split into several batches submitted together.
+Validation repairs are interactive calls; at most BATCH_REPAIR_CONCURRENCY
+jobs of a stage repair at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable
+
+from core.metrics import track_orchestration
+from core.tracing import tracer
+from .base import BaseAgent
+from .batch_providers import COMPLETED, TERMINAL, BatchProvider, get_provider
+from .critic_agent import CriticAgent
+from .icp_agent import ICPAgent
+from .messaging_agent import MessagingAgent
+from .orchestrator import (
+    _apply_fit_distribution,
+    _compose_brief_offloaded,
+    _prompt_stats,
+    _record,
+    _relevance_query,
+    _user_context_offloaded,
+)
+from .routing import Route
+from .segmentation_agent import SegmentationAgent
+
+logger = logging.getLogger(__name__)
+
+BATCH_DIR = Path(os.getenv("BATCH_DIR", "./batches"))
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "50000"))  # OpenAI's per-batch limit
+BATCH_POLL_S = float(os.getenv("BATCH_POLL_S", "30"))
+BATCH_TIMEOUT_S = float(os.getenv("BATCH_TIMEOUT_S", str(26 * 3600)))  # 24h window plus slack
+BATCH_REPAIR_CONCURRENCY = int(os.getenv("BATCH_REPAIR_CONCURRENCY", "4"))
+if BATCH_REPAIR_CONCURRENCY < 1:
+    raise ValueError(f"BATCH_REPAIR_CONCURRENCY must be >= 1, got {BATCH_REPAIR_CONCURRENCY}")
+
+
+class BatchRunError(RuntimeError):
+    pass
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _response_content(line: dict | None) -> tuple[str | None, str | None, dict | None]:
+    """Output line → (message content, error, usage)."""
+    if line is None:
+        return None, "Missing from batch output", None
+    if line.get("error"):
+        err = line["error"]
+        return None, err.get("message") if isinstance(err, dict) else str(err), None
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code", 200) != 200:
+        return None, (body.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}", None
+    try:
+        return body["choices"][0]["message"]["content"] or "{}", None, body.get("usage")
+    except (KeyError, IndexError, TypeError):
+        return None, "Malformed batch response", None
+
+
+class _Stage:
+    """One pipeline stage: collects (agent, context) calls, runs them as batches."""
+
+    def __init__(self, run_dir: Path, provider: BatchProvider, name: str):
+        self.run_dir = run_dir
+        self.provider = provider
+        self.name = name
+        self._calls: dict[str, tuple[BaseAgent, Route]] = {}
+        self._lines: list[dict] = []
+
+    def add(self, custom_id: str, agent: BaseAgent, **context) -> None:
+        route, body = agent.batch_request(**context)
+        self._calls[custom_id] = (agent, route)
+        self._lines.append({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body})
+
+    def _write(self) -> list[Path]:
+        paths = []
+        for n, i in enumerate(range(0, len(self._lines), BATCH_MAX_REQUESTS)):
+            path = self.run_dir / f"{self.name}-{n}.jsonl"
+            with path.open("w") as f:
+                for line in self._lines[i:i + BATCH_MAX_REQUESTS]:
+                    f.write(json.dumps(line) + "\n")
+            paths.append(path)
+        return paths
+
+    async def _wait(self, batch_id: str, deadline: float) -> list[dict]:
+        while True:
+            status = await self.provider.poll(batch_id)
+            if status.state in TERMINAL:
+                break
+            if time.monotonic() > deadline:
+                raise BatchRunError(f"Stage {self.name}: batch {batch_id} not done after {BATCH_TIMEOUT_S:.0f}s")
+            await asyncio.sleep(BATCH_POLL_S)
+        if status.state != COMPLETED:
+            raise BatchRunError(f"Stage {self.name}: batch {batch_id} failed: {status.error}")
+        return await self.provider.results(batch_id)
+
+    async def run(self) -> tuple[dict[str, dict], dict]:
+        """Submit, poll, and finish every call; returns ({custom_id: agent output}, stage report)."""
+        start = time.perf_counter()
+        paths = await asyncio.to_thread(self._write)
+        batch_ids = [await self.provider.submit(p) for p in paths]
+        deadline = time.monotonic() + BATCH_TIMEOUT_S
+        lines = [line for chunk in await asyncio.gather(*(self._wait(b, deadline) for b in batch_ids)) for line in chunk]
+        wait_s = time.perf_counter() - start
+
+        by_id = {line.get("custom_id"): line for line in lines}
+        # Validation repairs, when needed, are interactive calls: bound them
+        # so a prompt that fails for every job doesn't burst the rate limits
+        limit = asyncio.Semaphore(BATCH_REPAIR_CONCURRENCY)
+
+        async def finish(custom_id: str, agent: BaseAgent, route: Route) -> dict:
+            raw, error, usage = _response_content(by_id.get(custom_id))
+            async with limit:
+                return await agent.from_batch(route, raw, error, usage, wait_s)
+
+        finished = await asyncio.gather(*(finish(cid, a, r) for cid, (a, r) in self._calls.items()))
+        outs = dict(zip(self._calls, finished))
+        wall = time.perf_counter() - start
+        return outs, {
+            "stage": self.name,
+            "requests": len(self._lines),
+            "batches": batch_ids,
+            "failed": sum(1 for o in outs.values() if "error" in o["result"]),
+            "wait_s": round(wait_s, 2),
+            "wall_s": round(wall, 2),
+        }
+
+
+async def orchestrate_batch(
+    jobs: list[dict],
+    provider: BatchProvider | None = None,
+    interview_context_builder: Callable[[str], str] | None = None,
+    run_id: str | None = None,
+) -> tuple[list[dict], dict]:
+    """
+    Run the pipeline for every job ({"key", "users", "stats"}) stage by stage.
+    Returns (one orchestrate()-shaped result per job, in order; run report).
+    Failed agent calls surface as {"error": …} results, as in orchestrate();
+    a batch that fails or times out as a whole raises BatchRunError.
+    """
+    provider = provider or get_provider()
+    run_id = run_id or new_run_id()
+    run_dir = BATCH_DIR / run_id
+    run_dir.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    stages: list[dict] = []
+
+    with track_orchestration("bulk"), tracer.start_as_current_span(
+        "orchestrate_batch", attributes={"batch.run_id": run_id, "batch.jobs": len(jobs), "batch.provider": provider.name}
+    ):
+        state: list[dict[str, Any]] = []
+        summaries: list[str] = []
+        for job in jobs:
+            summary, clusters = await _user_context_offloaded(job["users"])
+            summaries.append(summary)
+            state.append({
+                "agent_outputs": {"clusters": clusters} if clusters is not None else {},
+                "timing": {},
+                "stats": _prompt_stats(job.get("stats"), clusters),
+            })
+
+        # ── Stage 1: ICP + Segmentation ──
+        stage = _Stage(run_dir, provider, "1-analysis")
+        for i, s in enumerate(state):
+            stage.add(f"{i}:icp", ICPAgent(), user_summary=summaries[i], stats=s["stats"])
+            stage.add(f"{i}:seg", SegmentationAgent(), user_summary=summaries[i], stats=s["stats"])
+        outs, report = await stage.run()
+        stages.append(report)
+        for i, s in enumerate(state):
+            s["icp"], s["seg"] = outs[f"{i}:icp"], outs[f"{i}:seg"]
+            await _apply_fit_distribution(jobs[i]["users"], s["icp"]["result"])
+            _record(s["agent_outputs"], s["timing"], s["icp"])
+            _record(s["agent_outputs"], s["timing"], s["seg"])
+
+        # ── Stage 2: Messaging ──
+        stage = _Stage(run_dir, provider, "2-messaging")
+        for i, s in enumerate(state):
+            interview_context = ""
+            if interview_context_builder is not None:
+                interview_context = interview_context_builder(_relevance_query(s["icp"]["result"], s["seg"]["result"]))
+            stage.add(
+                f"{i}:msg",
+                MessagingAgent(),
+                user_summary=summaries[i],
+                stats=s["stats"],
+                icp_result=json.dumps(s["icp"]["result"]),
+                segmentation_result=json.dumps(s["seg"]["result"]),
+                interview_context=interview_context,
+            )
+        outs, report = await stage.run()
+        stages.append(report)
+        for i, s in enumerate(state):
+            s["msg"] = outs[f"{i}:msg"]
+            _record(s["agent_outputs"], s["timing"], s["msg"])
+            s["brief"] = await _compose_brief_offloaded(
+                s["icp"]["result"], s["seg"]["result"], s["msg"]["result"], None
+            )
+
+        # ── Stage 3: Critic ──
+        stage = _Stage(run_dir, provider, "3-critic")
+        for i, s in enumerate(state):
+            stage.add(f"{i}:critic", CriticAgent(), brief=json.dumps(s["brief"]), feedback="")
+        outs, report = await stage.run()
+        stages.append(report)
+
+    results = []
+    for i, s in enumerate(state):
+        critic_out = outs[f"{i}:critic"]
+        _record(s["agent_outputs"], s["timing"], critic_out)
+        if critic_out["result"].get("revised_executive_summary"):
+            s["brief"]["executive_summary"] = critic_out["result"]["revised_executive_summary"]
+        results.append({
+            "key": jobs[i].get("key"),
+            "brief": s["brief"],
+            "confidence_score": critic_out["result"].get("confidence_score", 0.5),
+            "agent_outputs": s["agent_outputs"],
+            "timing": s["timing"],
+        })
+
+    wall = time.perf_counter() - start
+    requests = sum(st["requests"] for st in stages)
+    run_report = {
+        "run_id": run_id,
+        "provider": provider.name,
+        "jobs": len(jobs),
+        "requests": requests,
+        "stages": stages,
+        "wall_s": round(wall, 2),
+        "requests_per_s": round(requests / wall, 2) if wall else None,
+    }
+    logger.info("Batch run %s: %d jobs, %d requests in %.1fs", run_id, len(jobs), requests, wall)
+    return results, run_report
@@ -0,0 +1,223 @@
+"""
+Batch providers — submit a JSONL file of chat.completions requests, poll, fetch results.
+
+Input and output lines use the OpenAI Batch API format:
+
+  in:  {"custom_id": …, "method": "POST", "url": "/v1/chat/completions", "body": {…}}
+  out: {"custom_id": …, "response": {"status_code": 200, "body": {…}} | null, "error": {…} | null}
+
+BATCH_PROVIDER selects the implementation:
+  openai — the OpenAI Batch API (discounted, 24h completion window); default
+  local  — file-based stand-in: a background task answers each line with
+           an ordinary chat completion and writes the output file next to
+           the input. Used for development and tests; no batch discount,
+           so it is only used when chosen explicitly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+BATCH_PROVIDER = os.getenv("BATCH_PROVIDER", "openai")
+BATCH_LOCAL_CONCURRENCY = int(os.getenv("BATCH_LOCAL_CONCURRENCY", "8"))
+
+# Provider-neutral states
+PENDING, RUNNING, COMPLETED, FAILED = "pending", "running", "completed", "failed"
+TERMINAL = (COMPLETED, FAILED)
+
+
+@dataclass
+class BatchStatus:
+    state: str
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class BatchProvider(ABC):
+    name: str = "base"
+
+    @abstractmethod
+    async def submit(self, input_path: Path) -> str:
+        """Upload and start one batch; returns the provider's batch id."""
+
+    @abstractmethod
+    async def poll(self, batch_id: str) -> BatchStatus:
+        ...
+
+    @abstractmethod
+    async def results(self, batch_id: str) -> list[dict]:
+        """Output lines of a completed batch (failed requests included, with `error`)."""
+
+
+# ── Local stand-in ──
+
+Responder = Callable[[dict], Awaitable[dict]]
+
+
+async def _chat_completion(body: dict) -> dict:
+    from .base import _get_client
+
+    resp = await _get_client().chat.completions.create(**body)
+    return resp.model_dump(mode="json")
+
+
+class LocalBatchProvider(BatchProvider):
+    """
+    Answers each request line with `responder` (default: a chat completion
+    through the shared client), at most `concurrency` at a time. State lives
+    in files: <id>.status.json and <id>.output.jsonl beside the input.
+    """
+
+    name = "local"
+
+    def __init__(self, responder: Responder | None = None, concurrency: int = BATCH_LOCAL_CONCURRENCY):
+        self.responder = responder or _chat_completion
+        self.concurrency = concurrency
+        self._inputs: dict[str, Path] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _path(self, batch_id: str, suffix: str) -> Path:
+        return self._inputs[batch_id].with_name(f"{batch_id}.{suffix}")
+
+    def _write_status(self, batch_id: str, status: BatchStatus) -> None:
+        self._path(batch_id, "status.json").write_text(json.dumps(status.as_dict()))
+
+    async def submit(self, input_path: Path) -> str:
+        batch_id = f"local_{uuid.uuid4().hex[:12]}"
+        self._inputs[batch_id] = input_path
+        with input_path.open() as f:
+            total = sum(1 for line in f if line.strip())
+        self._write_status(batch_id, BatchStatus(PENDING, total=total))
+        task = asyncio.create_task(self._process(batch_id, total))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return batch_id
+
+    async def _process(self, batch_id: str, total: int) -> None:
+        status = BatchStatus(RUNNING, total=total)
+        self._write_status(batch_id, status)
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def answer(line: dict) -> dict:
+            async with limit:
+                try:
+                    body = await self.responder(line["body"])
+                    status.completed += 1
+                    return {"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}, "error": None}
+                except Exception as e:
+                    status.failed += 1
+                    return {
+                        "custom_id": line["custom_id"],
+                        "response": None,
+                        "error": {"code": type(e).__name__, "message": str(e)},
+                    }
+
+        try:
+            with self._inputs[batch_id].open() as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+            outputs = await asyncio.gather(*(answer(line) for line in lines))
+            with self._path(batch_id, "output.jsonl").open("w") as f:
+                for out in outputs:
+                    f.write(json.dumps(out) + "\n")
+            status.state = COMPLETED
+        except Exception as e:
+            logger.exception("Local batch %s failed", batch_id)
+            status.state, status.error = FAILED, str(e)
+        self._write_status(batch_id, status)
+
+    async def poll(self, batch_id: str) -> BatchStatus:
+        return BatchStatus(**json.loads(self._path(batch_id, "status.json").read_text()))
+
+    async def results(self, batch_id: str) -> list[dict]:
+        with self._path(batch_id, "output.jsonl").open() as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+# ── OpenAI Batch API ──
+
+_OPENAI_STATES = {
+    "validating": PENDING,
+    "in_progress": RUNNING,
+    "finalizing": RUNNING,
+    "completed": COMPLETED,
+    "failed": FAILED,
+    "expired": FAILED,
+    "cancelling": FAILED,
+    "cancelled": FAILED,
+}
+
+
+class OpenAIBatchProvider(BatchProvider):
+    name = "openai"
+
+    def __init__(self):
+        self._batches: dict[str, object] = {}
+
+    async def submit(self, input_path: Path) -> str:
+        from .base import _get_client
+
+        client = _get_client()
+        with input_path.open("rb") as f:
+            uploaded = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=uploaded.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> BatchStatus:
+        from .base import _get_client
+
+        batch = await _get_client().batches.retrieve(batch_id)
+        self._batches[batch_id] = batch
+        counts = batch.request_counts
+        errors = getattr(batch.errors, "data", None) or []
+        return BatchStatus(
+            state=_OPENAI_STATES.get(batch.status, RUNNING),
+            total=counts.total if counts else 0,
+            completed=counts.completed if counts else 0,
+            failed=counts.failed if counts else 0,
+            error="; ".join(e.message or "" for e in errors) or (batch.status if batch.status != "completed" else None),
+        )
+
+    async def results(self, batch_id: str) -> list[dict]:
+        from .base import _get_client
+
+        client = _get_client()
+        batch = self._batches.get(batch_id) or await client.batches.retrieve(batch_id)
+        lines: list[dict] = []
+        # Successful requests land in the output file, failed ones in the error file
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                lines += [json.loads(line) for line in content.text.splitlines() if line.strip()]
+        return lines
+
+
+_PROVIDERS: dict[str, Callable[[], BatchProvider]] = {
+    "local": LocalBatchProvider,
+    "openai": OpenAIBatchProvider,
+}
+if BATCH_PROVIDER not in _PROVIDERS:
+    raise ValueError(f"BATCH_PROVIDER must be one of {sorted(_PROVIDERS)}, got {BATCH_PROVIDER!r}")
+
+
+def get_provider(name: str | None = None) -> BatchProvider:
+    name = name or BATCH_PROVIDER
+    if name not in _PROVIDERS:
+        raise ValueError(f"Unknown batch provider {name!r}; expected one of {sorted(_PROVIDERS)}")
+    return _PROVIDERS[name]()
@@ -0,0 +1,201 @@
+"""
+User clustering — deterministic k-modes over the categorical user attributes.
+
+Runs before phase 1 so ICPAgent and SegmentationAgent start from computed
+segments with measured conversion instead of raw count tables.
+
+company_size, role, industry and source are dictionary-encoded into an
+(n, 4) int32 array (vocabularies sorted, so codes are stable). Users are
+then collapsed to their distinct attribute combinations with counts —
+at most a few thousand rows however many users there are — and weighted
+k-modes (Cao initialisation, no randomness) runs on those. Each cluster
+gets its modal profile, how dominant each mode is, its size and its
+conversion rate.
+
+Results are cached per dataset version: the DataVersion number when the
+caller has one, otherwise a hash of the encoded combinations and counts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+CLUSTER_ATTRIBUTES = ("company_size", "role", "industry", "source")
+CLUSTER_K = int(os.getenv("USER_CLUSTERS_K", "6"))
+CLUSTER_MAX_ITER = int(os.getenv("USER_CLUSTERS_MAX_ITER", "25"))
+_CACHE_SIZE = 16
+
+_cache: dict[tuple, dict] = {}
+_cache_lock = threading.Lock()
+
+
+def encode_users(users: list[dict]) -> tuple[np.ndarray, list[list[str]], np.ndarray]:
+    """
+    (codes (n, d) int32, per-attribute vocabularies, signed_up bool (n,)).
+    Missing values encode as "unknown".
+    """
+    n = len(users)
+    codes = np.empty((n, len(CLUSTER_ATTRIBUTES)), dtype=np.int32)
+    vocabs: list[list[str]] = []
+    for j, attr in enumerate(CLUSTER_ATTRIBUTES):
+        index: dict[str, int] = {}
+        raw = np.fromiter(
+            (index.setdefault(u.get(attr) or "unknown", len(index)) for u in users), dtype=np.int32, count=n
+        )
+        vocab = sorted(index)
+        # Re-number in sorted order so codes do not depend on row order
+        remap = np.empty(len(index), dtype=np.int32)
+        for new, value in enumerate(vocab):
+            remap[index[value]] = new
+        codes[:, j] = remap[raw] if n else raw
+        vocabs.append(vocab)
+    signed = np.fromiter((u.get("status") == "signed_up" for u in users), dtype=bool, count=n)
+    return codes, vocabs, signed
+
+
+def _compress(codes: np.ndarray, cards: list[int], signed: np.ndarray):
+    """Distinct rows (sorted), their user counts and signed-up counts."""
+    radix = np.cumprod([1] + cards[:-1], dtype=np.int64)
+    keys = codes.astype(np.int64) @ radix
+    uniq, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    signed_counts = np.bincount(inverse, weights=signed, minlength=len(uniq))
+    rows = (uniq[:, None] // radix[None, :]) % np.asarray(cards, dtype=np.int64)[None, :]
+    return rows.astype(np.int32), counts.astype(np.float64), signed_counts
+
+
+def _mismatches(rows: np.ndarray, modes: np.ndarray) -> np.ndarray:
+    """Hamming distance of every row to every mode, shape (rows, modes)."""
+    return (rows[:, None, :] != modes[None, :, :]).sum(axis=2)
+
+
+def _cao_init(rows: np.ndarray, w: np.ndarray, k: int, cards: list[int]) -> np.ndarray:
+    """Deterministic seeds: densest row first, then rows far from the chosen and dense."""
+    total = w.sum()
+    density = np.zeros(len(rows))
+    for j, card in enumerate(cards):
+        freq = np.bincount(rows[:, j], weights=w, minlength=card) / total
+        density += freq[rows[:, j]]
+    chosen = [int(np.argmax(density))]
+    nearest = _mismatches(rows, rows[chosen]).min(axis=1)
+    while len(chosen) < k:
+        score = nearest * density
+        best = int(np.argmax(score))
+        if score[best] <= 0:
+            break  # fewer distinct rows than k
+        chosen.append(best)
+        nearest = np.minimum(nearest, _mismatches(rows, rows[[best]])[:, 0])
+    return rows[chosen].copy()
+
+
+def kmodes(rows: np.ndarray, w: np.ndarray, k: int, cards: list[int], max_iter: int = CLUSTER_MAX_ITER):
+    """Weighted k-modes. Returns (labels per row, modes (k, d), iterations, cost)."""
+    modes = _cao_init(rows, w, k, cards)
+    k = len(modes)
+    labels = np.full(len(rows), -1)
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        new_labels = _mismatches(rows, modes).argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for j, card in enumerate(cards):
+            votes = np.bincount(labels * card + rows[:, j], weights=w, minlength=k * card).reshape(k, card)
+            filled = votes.sum(axis=1) > 0
+            modes[filled, j] = votes[filled].argmax(axis=1)
+    cost = float((w * _mismatches(rows, modes)[np.arange(len(rows)), labels]).sum())
+    return labels, modes, iterations, cost
+
+
+def _describe(rows, w, signed_w, labels, modes, vocabs, n_users: int) -> list[dict]:
+    overall = signed_w.sum() / n_users if n_users else 0.0
+    sizes = np.bincount(labels, weights=w, minlength=len(modes))
+    signed = np.bincount(labels, weights=signed_w, minlength=len(modes))
+    clusters = []
+    for c in np.argsort(-sizes, kind="stable"):
+        if sizes[c] == 0:
+            continue
+        member = labels == c
+        profile = {}
+        for j, attr in enumerate(CLUSTER_ATTRIBUTES):
+            share = w[member & (rows[:, j] == modes[c, j])].sum() / sizes[c]
+            profile[attr] = {"value": vocabs[j][modes[c, j]], "share": round(float(share), 3)}
+        conversion = signed[c] / sizes[c]
+        clusters.append({
+            "id": f"C{len(clusters) + 1}",
+            "users": int(sizes[c]),
+            "share": round(float(sizes[c] / n_users), 3),
+            "signed_up": int(signed[c]),
+            "conversion": round(float(conversion), 3),
+            "lift": round(float(conversion / overall), 2) if overall else None,
+            "profile": profile,
+        })
+    return clusters
+
+
+def cluster_users(users: list[dict], k: int = CLUSTER_K, version: int | None = None) -> dict:
+    """
+    {"clusters": [...], "k", "iterations", "cost", "distinct_profiles",
+     "users", "conversion", "elapsed_s", "cached"}; clusters largest first.
+    `version` (DataVersion.version) lets a repeat call skip encoding too.
+    """
+    vkey = ("version", version, len(users), k) if version is not None else None
+    with _cache_lock:
+        if vkey is not None and vkey in _cache:
+            return {**_cache[vkey], "cached": True}
+
+    start = time.perf_counter()
+    codes, vocabs, signed = encode_users(users)
+    cards = [max(1, len(v)) for v in vocabs]
+    rows, w, signed_w = _compress(codes, cards, signed)
+
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (rows, w, signed_w, np.asarray([k])):
+        digest.update(np.ascontiguousarray(part).tobytes())
+    digest.update("\x1f".join("\x1e".join(v) for v in vocabs).encode())
+    hkey = ("data", digest.hexdigest())
+    with _cache_lock:
+        hit = _cache.get(hkey)
+    if hit is not None:
+        result = hit
+    elif not len(rows):
+        result = {"clusters": [], "k": 0, "iterations": 0, "cost": 0.0, "distinct_profiles": 0,
+                  "users": 0, "conversion": None}
+    else:
+        labels, modes, iterations, cost = kmodes(rows, w, k, cards)
+        result = {
+            "clusters": _describe(rows, w, signed_w, labels, modes, vocabs, len(users)),
+            "k": len(modes),
+            "iterations": iterations,
+            "cost": round(cost / (len(users) * len(CLUSTER_ATTRIBUTES)), 4),  # mismatch rate
+            "distinct_profiles": len(rows),
+            "users": len(users),
+            "conversion": round(float(signed.mean()), 3),
+            "elapsed_s": round(time.perf_counter() - start, 4),
+        }
+
+    with _cache_lock:
+        for key in filter(None, (hkey, vkey)):
+            _cache[key] = result
+        while len(_cache) > _CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+    return {**result, "cached": hit is not None}
+
+
+def cluster_descriptors(result: dict) -> list[str]:
+    """One compact line per cluster for agent prompts."""
+    lines = []
+    for c in result["clusters"]:
+        profile = ", ".join(
+            f"{attr}={p['value']} ({100 * p['share']:.0f}%)" for attr, p in c["profile"].items()
+        )
+        lift = f", {c['lift']:.2f}x overall" if c["lift"] is not None else ""
+        lines.append(
+            f"{c['id']}: {c['users']} users ({100 * c['share']:.1f}%), "
+            f"conversion {100 * c['conversion']:.1f}%{lift} | {profile}"
+        )
+    return lines
@@ -5,10 +5,12 @@ Also handles the feedback-loop re-evaluation.
 """
 
 from .base import BaseAgent
+from .schemas import CriticOutput
 
 
 class CriticAgent(BaseAgent):
     name = "critic_agent"
+    output_schema = CriticOutput
     system_prompt = (
         "You are a ruthlessly honest strategy evaluator and editor.\n"
         "Given a composed 1-page meeting brief (and optionally prior feedback), "
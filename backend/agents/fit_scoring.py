@@ -0,0 +1,118 @@
+"""
+ICP fit scoring — a 0–1 fit score per user against a brief's ICP segments.
+
+The ICP agent names a primary segment and secondary segments, each a
+company_size / role / industry profile. A user's fit against one segment
+is the weighted share of those attributes that match (FIT_WEIGHTS); the
+score is the best segment match, secondary segments discounted by
+SECONDARY_DISCOUNT.
+
+Scoring is vectorized: each attribute column is dictionary-encoded, the
+match is decided once per distinct value, and the per-user score is a
+gather over the code arrays — so it costs the same per user whether there
+are ten distinct industries or ten thousand users per industry.
+
+Buckets (high ≥ FIT_HIGH_AT, medium ≥ FIT_MEDIUM_AT, else low) give the
+fit_score_distribution reported in briefs, replacing the model's estimate.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable, Sequence
+
+import numpy as np
+
+FIT_ATTRIBUTES = ("company_size", "role", "industry")
+FIT_WEIGHTS = {"industry": 0.4, "company_size": 0.35, "role": 0.25}
+SECONDARY_DISCOUNT = float(os.getenv("FIT_SECONDARY_DISCOUNT", "0.8"))
+FIT_HIGH_AT = float(os.getenv("FIT_HIGH_AT", "0.7"))
+FIT_MEDIUM_AT = float(os.getenv("FIT_MEDIUM_AT", "0.4"))
+if not 0 < FIT_MEDIUM_AT <= FIT_HIGH_AT <= 1:
+    raise ValueError(f"Need 0 < FIT_MEDIUM_AT <= FIT_HIGH_AT <= 1, got {FIT_MEDIUM_AT}, {FIT_HIGH_AT}")
+
+# "SaaS / FinTech", "PM, Product Manager", "51-200 or 201-500"
+_ALTERNATIVES = re.compile(r"\s*(?:,|/|\||;|\bor\b|\band\b|&)\s*")
+_SPACES = re.compile(r"\s+")
+
+
+def _norm(value: str | None) -> str:
+    return _SPACES.sub(" ", (value or "").strip().lower())
+
+
+def _target(text: str | None) -> tuple[str, list[re.Pattern]] | None:
+    """Normalized segment value and one whole-word pattern per alternative it lists."""
+    text = _norm(text)
+    if not text or text in ("...", "any", "all", "unknown"):
+        return None
+    alternatives = [a for a in _ALTERNATIVES.split(text) if a] or [text]
+    return text, [re.compile(rf"(?<![\w+-]){re.escape(a)}(?![\w+-])") for a in alternatives]
+
+
+def value_matches(value: str | None, target: tuple[str, list[re.Pattern]] | None) -> bool:
+    """A user value matches if it equals the segment value or one of its alternatives appears as a word."""
+    value = _norm(value)
+    if not value or target is None:
+        return False
+    text, patterns = target
+    if value == text:
+        return True
+    # "Series B SaaS" matches "saas"; "51-200 employees" matches "51-200"
+    return any(p.search(value) for p in patterns) or bool(
+        re.search(rf"(?<![\w+-]){re.escape(value)}(?![\w+-])", text)
+    )
+
+
+def icp_segments(icp: dict | None) -> list[tuple[float, dict]]:
+    """[(weight, segment)] from an ICP agent result: primary at 1.0, secondaries discounted."""
+    if not isinstance(icp, dict):
+        return []
+    segments: list[tuple[float, dict]] = []
+    if isinstance(icp.get("primary_segment"), dict):
+        segments.append((1.0, icp["primary_segment"]))
+    for seg in icp.get("secondary_segments") or ():
+        if isinstance(seg, dict):
+            segments.append((SECONDARY_DISCOUNT, seg))
+    return [(w, s) for w, s in segments if any(_target(s.get(a)) for a in FIT_ATTRIBUTES)]
+
+
+def _encode(values: Iterable[str | None], n: int) -> tuple[np.ndarray, list[str | None]]:
+    index: dict[str | None, int] = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int32, count=n)
+    return codes, list(index)
+
+
+def fit_scores(columns: dict[str, Sequence[str | None]], segments: list[tuple[float, dict]]) -> np.ndarray:
+    """
+    Fit score per row (float32, 0–1) for attribute columns of equal length
+    ({"company_size": [...], "role": [...], "industry": [...]}).
+    """
+    n = len(columns[FIT_ATTRIBUTES[0]])
+    scores = np.zeros(n, dtype=np.float32)
+    if not n or not segments:
+        return scores
+    encoded = {a: _encode(columns[a], n) for a in FIT_ATTRIBUTES}
+    for seg_weight, segment in segments:
+        seg_score = np.zeros(n, dtype=np.float32)
+        for attr in FIT_ATTRIBUTES:
+            target = _target(segment.get(attr))
+            if target is None:
+                continue
+            codes, vocab = encoded[attr]
+            hits = np.fromiter((value_matches(v, target) for v in vocab), dtype=bool, count=len(vocab))
+            seg_score += np.float32(FIT_WEIGHTS[attr]) * hits[codes]
+        np.maximum(scores, np.float32(seg_weight) * seg_score, out=scores)
+    return np.round(scores, 4)
+
+
+def score_users(users: list[dict], segments: list[tuple[float, dict]]) -> np.ndarray:
+    """fit_scores() over user dicts."""
+    return fit_scores({a: [u.get(a) for u in users] for a in FIT_ATTRIBUTES}, segments)
+
+
+def fit_distribution(scores: np.ndarray) -> dict[str, int]:
+    """Bucket counts in the ICP agent's fit_score_distribution shape."""
+    high = int((scores >= FIT_HIGH_AT).sum())
+    medium = int((scores >= FIT_MEDIUM_AT).sum()) - high
+    return {"high_fit": high, "medium_fit": medium, "low_fit": int(len(scores)) - high - medium}
@@ -4,10 +4,12 @@ Determines the Ideal Customer Profile from the user dataset.
 """
 
 from .base import BaseAgent
+from .schemas import ICPOutput
 
 
 class ICPAgent(BaseAgent):
     name = "icp_agent"
+    output_schema = ICPOutput
     system_prompt = (
         "You are an expert B2B go-to-market analyst.\n"
         "Given a dataset summary of users (signed-up customers and non-engaged leads), "
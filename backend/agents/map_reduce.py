@@ -0,0 +1,132 @@
+"""
+Map-reduce helpers for phase 1 — shard the user base, merge shard outputs.
+
+shard_users() groups users by one dimension (industry, role, …); the
+orchestrator runs ICPAgent and SegmentationAgent once per shard. The
+reducers below merge the per-shard JSON back into the single-prompt shape
+MessagingAgent and _compose_brief expect. They are deterministic (no extra
+LLM round trip): shards are weighted by how many signed-up users they hold.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any
+
+SHARD_DIMENSIONS = ("industry", "company_size", "role", "source", "company")
+MAX_SHARDS = int(os.getenv("ORCHESTRATOR_MAX_SHARDS", "8"))
+
+_SEVERITY = {"high": 0, "medium": 1, "low": 2}
+_OTHER = "other"
+
+
+def shard_users(users: list[dict], dimension: str, max_shards: int = MAX_SHARDS) -> dict[str, list[dict]]:
+    """Group by `dimension`; groups beyond the largest max_shards - 1 are pooled as 'other'."""
+    if dimension not in SHARD_DIMENSIONS:
+        raise ValueError(f"Cannot shard by {dimension!r}; expected one of {SHARD_DIMENSIONS}")
+    groups: dict[str, list[dict]] = {}
+    for u in users:
+        groups.setdefault(str(u.get(dimension) or "unknown"), []).append(u)
+    if len(groups) <= max_shards:
+        return groups
+    ranked = sorted(groups.items(), key=lambda kv: len(kv[1]), reverse=True)
+    shards = dict(ranked[: max_shards - 1])
+    shards[_OTHER] = [u for _, members in ranked[max_shards - 1:] for u in members]
+    return shards
+
+
+def _usable(result: Any) -> bool:
+    return isinstance(result, dict) and "error" not in result and "raw" not in result
+
+
+def _dedupe(items: list, key=lambda x: str(x).strip().lower(), limit: int | None = None) -> list:
+    seen, out = set(), []
+    for item in items:
+        k = key(item)
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append(item)
+    return out[:limit] if limit is not None else out
+
+
+def _ranked(shards: list[dict]) -> list[dict]:
+    return sorted(shards, key=lambda s: s["signed_up"], reverse=True)
+
+
+def reduce_icp(shards: list[dict], dimension: str) -> dict:
+    """shards: [{key, users, signed_up, result}] with ICPAgent results."""
+    ok = _ranked([s for s in shards if _usable(s["result"])])
+    if not ok:
+        return {"error": "All ICP shards failed"}
+    top = ok[0]["result"]
+
+    segments = [top.get("primary_segment")] if top.get("primary_segment") else []
+    segments += [s["result"].get("primary_segment") for s in ok[1:] if s["result"].get("primary_segment")]
+    segments += [seg for s in ok for seg in s["result"].get("secondary_segments") or []]
+    segments = _dedupe([seg for seg in segments if isinstance(seg, dict)], key=lambda d: json.dumps(d, sort_keys=True, default=str))
+
+    fit: dict[str, int] = {}
+    for s in ok:
+        for k, v in (s["result"].get("fit_score_distribution") or {}).items():
+            if isinstance(v, (int, float)):
+                fit[k] = fit.get(k, 0) + int(v)
+
+    return {
+        "icp_summary": " ".join(
+            f"[{dimension}={s['key']}] {s['result'].get('icp_summary', '')}".strip() for s in ok[:3]
+        ),
+        "primary_segment": segments[0] if segments else None,
+        "secondary_segments": segments[1:6],
+        "signals": _dedupe([x for s in ok for x in s["result"].get("signals") or []], limit=10),
+        "fit_score_distribution": fit,
+    }
+
+
+def reduce_segmentation(shards: list[dict], dimension: str, stats: dict | None = None) -> dict:
+    """shards: [{key, users, signed_up, result}] with SegmentationAgent results."""
+    ok = _ranked([s for s in shards if _usable(s["result"])])
+    if not ok:
+        return {"error": "All segmentation shards failed"}
+
+    total = (stats or {}).get("total") or sum(s["users"] for s in shards)
+    signed = (stats or {}).get("signed_up", 0) if stats else sum(s["signed_up"] for s in shards)
+    conversion = f"{100 * signed / total:.1f}%" if total else None
+
+    drop_offs: dict[str, dict] = {}
+    for s in ok:
+        for d in s["result"].get("drop_off_points") or []:
+            if not isinstance(d, dict):
+                continue
+            k = str(d.get("stage", "")).strip().lower()
+            if k not in drop_offs or _SEVERITY.get(d.get("severity"), 3) < _SEVERITY.get(drop_offs[k].get("severity"), 3):
+                drop_offs[k] = d
+
+    patterns = [
+        {**p, "segment": p.get("segment") or f"{dimension}={s['key']}"}
+        for s in ok
+        for p in s["result"].get("engagement_patterns") or []
+        if isinstance(p, dict)
+    ]
+    actions = _dedupe(
+        [
+            (rank, a)
+            for rank, s in enumerate(ok)
+            for a in s["result"].get("recommended_actions") or []
+            if isinstance(a, dict)
+        ],
+        key=lambda ra: str(ra[1].get("action", "")).strip().lower(),
+    )
+    actions.sort(key=lambda ra: (_SEVERITY.get(ra[1].get("priority"), 3), ra[0]))
+
+    return {
+        "engagement_summary": " ".join(
+            f"[{dimension}={s['key']}] {s['result'].get('engagement_summary', '')}".strip() for s in ok[:3]
+        ),
+        "conversion_rate": conversion,
+        "drop_off_points": sorted(drop_offs.values(), key=lambda d: _SEVERITY.get(d.get("severity"), 3))[:6],
+        "engagement_patterns": patterns[:8],
+        "at_risk_segments": _dedupe([x for s in ok for x in s["result"].get("at_risk_segments") or []], limit=8),
+        "recommended_actions": [a for _, a in actions[:6]],
+    }
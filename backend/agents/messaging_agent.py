@@ -4,10 +4,12 @@ Proposes positioning, value props, competitive analysis, and growth hypotheses.
 """
 
 from .base import BaseAgent
+from .schemas import MessagingOutput
 
 
 class MessagingAgent(BaseAgent):
     name = "messaging_agent"
+    output_schema = MessagingOutput
     system_prompt = (
         "You are a senior product marketing strategist.\n"
         "Based on ICP analysis, engagement data, and user interview insights, craft targeted messaging and competitive analysis.\n\n"
@@ -14,10 +14,23 @@ Execution DAG:
   │    Agent      │
   └───────────────┘
 
-Phase 1 (parallel):  ICP + Segmentation
+Phase 0:             k-modes user clusters (clustering.py), cached per
+                     dataset version, summarized for the agents
+Phase 1 (parallel):  ICP + Segmentation — or, with ORCHESTRATOR_SHARD_BY set,
+                     both agents per shard of users (map) merged by the
+                     reducers in map_reduce.py (reduce); then every user is
+                     scored against the ICP (fit_scoring.py) for the real
+                     fit_score_distribution
 Phase 2 (needs P1):  Messaging Agent
 Phase 3:             Compose 1-pager
-Phase 4:             Critic Agent evaluates
+Phase 4:             Critic Agent evaluates — or, with CRITIC_MODE=sections,
+                     one critic per brief section, concurrently, merged by
+                     section_critic.merge_critiques; the ICP and
+                     segmentation critiques start right after phase 1 and
+                     overlap phase 2 (CRITIC_EARLY_START)
+
+Each run is traced: one root span, a span per phase, and the agent spans
+from BaseAgent.run nested under their phase.
 """
 
 from __future__ import annotations
@@ -25,15 +38,45 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, AsyncGenerator
+import os
+import time
+from typing import Any, AsyncGenerator, Callable
 
+from opentelemetry import trace
+
+from core.executor import run_cpu
+from core.metrics import track_orchestration
+from core.tracing import tracer
 from .icp_agent import ICPAgent
 from .segmentation_agent import SegmentationAgent
 from .messaging_agent import MessagingAgent
 from .critic_agent import CriticAgent
+from .clustering import cluster_descriptors, cluster_users
+from .fit_scoring import fit_distribution, icp_segments, score_users
+from .map_reduce import SHARD_DIMENSIONS, reduce_icp, reduce_segmentation, shard_users
+from .section_critic import CRITIC_EARLY_START, CRITIC_SECTIONS, SECTION_CRITIC, SectionCritique
 
 logger = logging.getLogger(__name__)
 
+# run_cpu size thresholds. The user list is costly to pickle, so the summary
+# only ever goes to a thread; compose is cheap until outputs get very long.
+SUMMARY_THREAD_AT = 5_000  # users
+COMPOSE_THREAD_AT = 2_000  # recommended actions + email hooks
+
+# Map-reduce phase 1: dimension to shard users by (unset = one global prompt)
+# and the number of shard agent calls in flight at once
+SHARD_BY = os.getenv("ORCHESTRATOR_SHARD_BY", "") or None
+SHARD_CONCURRENCY = int(os.getenv("ORCHESTRATOR_SHARD_CONCURRENCY", "4"))
+if SHARD_BY is not None and SHARD_BY not in SHARD_DIMENSIONS:
+    raise ValueError(f"ORCHESTRATOR_SHARD_BY must be one of {SHARD_DIMENSIONS}, got {SHARD_BY!r}")
+# Also time the single-prompt phase 1 on the same users after each map-reduce
+# run, to report a measured speedup (doubles phase-1 LLM calls; for evaluation)
+SHARD_COMPARE = os.getenv("ORCHESTRATOR_SHARD_COMPARE", "0") == "1"
+
+# Agents see computed k-modes segments instead of raw distribution tables;
+# 0 restores the distribution summary
+USER_CLUSTERS = os.getenv("ORCHESTRATOR_CLUSTERS", "1") == "1"
+
 AGENT_DESCRIPTIONS = {
     "icp_agent": {
         "label": "ICP Agent",
@@ -78,11 +121,30 @@ AGENT_DESCRIPTIONS = {
 }
 
 
-def _summarize_users(users: list[dict]) -> str:
-    """Build a compact statistical summary string for agent context."""
+def _summarize_users(users: list[dict], clusters: dict | None = None) -> str:
+    """
+    Build a compact statistical summary string for agent context. With
+    `clusters` (cluster_users output) the per-attribute distributions are
+    replaced by the cluster descriptors.
+    """
     if not users:
         return "No user data available."
 
+    if clusters is not None:
+        signed_up = sum(1 for u in users if u.get("status") == "signed_up")
+        return json.dumps({
+            "total_users": len(users),
+            "signed_up": signed_up,
+            "not_engaged": sum(1 for u in users if u.get("status") == "not_engaged"),
+            "conversion": f"{100 * signed_up / len(users):.1f}%",
+            "segments": cluster_descriptors(clusters),
+            "segments_note": (
+                "Segments are deterministic k-modes clusters over company_size, role, industry and "
+                "source. Each profile value shows the share of the segment that has it; conversion "
+                "is measured. Build on these segments rather than re-deriving them from counts."
+            ),
+        }, indent=2)
+
     signed = [u for u in users if u.get("status") == "signed_up"]
     not_eng = [u for u in users if u.get("status") == "not_engaged"]
 
@@ -107,6 +169,83 @@ def _summarize_users(users: list[dict]) -> str:
     }, indent=2)
 
 
+def _user_context(users: list[dict], data_version: int | None = None) -> tuple[str, dict | None]:
+    """(prompt summary, clusters or None); CPU-bound, run through run_cpu."""
+    clusters = cluster_users(users, version=data_version) if USER_CLUSTERS and users else None
+    return _summarize_users(users, clusters), clusters
+
+
+async def _user_context_offloaded(users: list[dict], data_version: int | None = None) -> tuple[str, dict | None]:
+    return await run_cpu(_user_context, users, data_version, size=len(users), thread_at=SUMMARY_THREAD_AT)
+
+
+def _prompt_stats(stats: dict | None, clusters: dict | None) -> dict | None:
+    """Stats as shown to agents: with clusters, only the totals (no by_* tables)."""
+    if stats is None or clusters is None:
+        return stats
+    return {k: v for k, v in stats.items() if not k.startswith("by_")}
+
+
+def _fit_from_scores(users: list[dict], icp_result: dict) -> dict | None:
+    segments = icp_segments(icp_result)
+    return fit_distribution(score_users(users, segments)) if segments else None
+
+
+async def _apply_fit_distribution(users: list[dict], icp_result: dict) -> None:
+    """Replace the model's fit_score_distribution with counts from scoring every user."""
+    if not users or "error" in icp_result:
+        return
+    dist = await run_cpu(_fit_from_scores, users, icp_result, size=len(users), thread_at=SUMMARY_THREAD_AT)
+    if dist is not None:
+        icp_result["fit_score_distribution"] = dist
+        icp_result["fit_score_source"] = "scored"
+
+
+def _phase_span(phase: int, label: str, parent: trace.Span | None = None) -> trace.Span:
+    """Start (not activate) a phase span; wrap awaits in trace.use_span()."""
+    ctx = trace.set_span_in_context(parent) if parent is not None else None
+    return tracer.start_span(
+        f"phase {phase} {label}", context=ctx, attributes={"orchestrator.phase": phase}
+    )
+
+
+def _relevance_query(*results: dict) -> str:
+    """Flatten the string values of agent outputs into one ranking query."""
+    parts: list[str] = []
+
+    def walk(v: Any) -> None:
+        if isinstance(v, str):
+            parts.append(v)
+        elif isinstance(v, dict):
+            for x in v.values():
+                walk(x)
+        elif isinstance(v, list):
+            for x in v:
+                walk(x)
+
+    for r in results:
+        walk(r)
+    return " ".join(parts)
+
+
+def _icp_section(icp: dict) -> dict:
+    return {
+        "primary_segment": icp.get("primary_segment"),
+        "secondary_segments": icp.get("secondary_segments", []),
+        "signals": icp.get("signals", []),
+        "fit_score_distribution": icp.get("fit_score_distribution"),
+    }
+
+
+def _segmentation_section(segmentation: dict) -> dict:
+    return {
+        "conversion_rate": segmentation.get("conversion_rate"),
+        "drop_off_points": segmentation.get("drop_off_points", []),
+        "at_risk_segments": segmentation.get("at_risk_segments", []),
+        "engagement_patterns": segmentation.get("engagement_patterns", []),
+    }
+
+
 def _compose_brief(
     icp: dict,
     segmentation: dict,
@@ -134,17 +273,8 @@ def _compose_brief(
             f"{segmentation.get('engagement_summary', '')} "
             f"{messaging.get('positioning_statement', '')}"
         ),
-        "icp": {
-            "primary_segment": icp.get("primary_segment"),
-            "secondary_segments": icp.get("secondary_segments", []),
-            "signals": icp.get("signals", []),
-        },
-        "segmentation": {
-            "conversion_rate": segmentation.get("conversion_rate"),
-            "drop_off_points": segmentation.get("drop_off_points", []),
-            "at_risk_segments": segmentation.get("at_risk_segments", []),
-            "engagement_patterns": segmentation.get("engagement_patterns", []),
-        },
+        "icp": _icp_section(icp),
+        "segmentation": _segmentation_section(segmentation),
         "messaging": {
             "value_propositions": messaging.get("value_propositions", []),
             "competitive_analysis": messaging.get("competitive_analysis", {}),
@@ -158,59 +288,295 @@ def _compose_brief(
     return brief
 
 
+async def _compose_brief_offloaded(
+    icp: dict, segmentation: dict, messaging: dict, feedback: str | None
+) -> dict:
+    size = len(segmentation.get("recommended_actions") or ()) + len(messaging.get("email_hooks") or ())
+    return await run_cpu(
+        _compose_brief, icp, segmentation, messaging, feedback, size=size, thread_at=COMPOSE_THREAD_AT
+    )
+
+
+def _record(agent_outputs: dict[str, Any], timing: dict[str, float], out: dict) -> None:
+    """Store one agent's result and timing; routing/validation go to agent_outputs["agent_meta"]."""
+    agent = out["agent"]
+    agent_outputs[agent] = out["result"]
+    timing[agent] = out["elapsed_s"]
+    agent_outputs.setdefault("agent_meta", {})[agent] = {
+        "elapsed_s": out["elapsed_s"],
+        "routing": out.get("routing"),
+        "validation": out.get("validation"),
+    }
+
+
+def _shard_routing(outs: list[dict]) -> dict:
+    """Routing summary for an agent that ran once per shard."""
+    models: dict[str, int] = {}
+    for o in outs:
+        model = (o.get("routing") or {}).get("model", "unknown")
+        models[model] = models.get(model, 0) + 1
+    return {
+        "calls": len(outs),
+        "models": models,
+        "fallbacks": sum(1 for o in outs if (o.get("routing") or {}).get("reason") == "slo_fallback"),
+    }
+
+
+def _start_critique(
+    icp_result: dict, seg_result: dict, feedback: str | None, parent: trace.Span | None = None
+) -> tuple[SectionCritique | None, trace.Span | None]:
+    """
+    CRITIC_MODE=sections: the run's SectionCritique, and with
+    CRITIC_EARLY_START the phase-4 span, opened now so the ICP and
+    segmentation critiques started here nest under it. (None, None) in
+    whole-brief mode. The caller must close() the critique.
+    """
+    if not SECTION_CRITIC:
+        return None, None
+    critique = SectionCritique(feedback)
+    if not CRITIC_EARLY_START:
+        return critique, None
+    span = _phase_span(4, "critic", parent)
+    with trace.use_span(span):
+        critique.start("icp", _icp_section(icp_result), early=True)
+        critique.start("segmentation", _segmentation_section(seg_result), early=True)
+    return critique, span
+
+
+async def _critique(
+    brief: dict,
+    feedback: str | None,
+    critique: SectionCritique | None,
+    span: trace.Span | None,
+    parent: trace.Span | None = None,
+) -> dict:
+    """Phase 4: the whole-brief CriticAgent, or the remaining section critics and their merge."""
+    span = span or _phase_span(4, "critic", parent)
+    with trace.use_span(span, end_on_exit=True):
+        if critique is None:
+            return await CriticAgent().run(brief=json.dumps(brief), feedback=feedback or "")
+        return await critique.finish(brief)
+
+
+def _close_critique(critique: SectionCritique | None, span: trace.Span | None) -> None:
+    """Cancel section critiques and end the early phase-4 span if the run stopped before phase 4 did."""
+    if critique is not None:
+        critique.close()
+    if span is not None and span.is_recording():
+        span.end()
+
+
+async def _single_phase1(user_summary: str, agent_stats: dict | None) -> tuple[dict, dict]:
+    """Phase 1 as one ICP and one Segmentation prompt over every user."""
+    return tuple(await asyncio.gather(
+        ICPAgent().run(user_summary=user_summary, stats=agent_stats),
+        SegmentationAgent().run(user_summary=user_summary, stats=agent_stats),
+    ))
+
+
+async def _run_phase1(
+    users: list[dict], user_summary: str, stats: dict | None, agent_stats: dict | None, shard_by: str | None
+) -> tuple[dict, dict, dict | None]:
+    """
+    ICP + Segmentation outputs ({agent, result, elapsed_s} each) and, in
+    map-reduce mode, a report with per-shard timing and parallelism, plus
+    the speedup over the single prompt with ORCHESTRATOR_SHARD_COMPARE.
+    Agents get agent_stats; the reducers use the full stats.
+    """
+    start = time.perf_counter()
+    if not shard_by:
+        return (*await _single_phase1(user_summary, agent_stats), None)
+
+    shards = await run_cpu(shard_users, users, shard_by, size=len(users), thread_at=SUMMARY_THREAD_AT)
+    limit = asyncio.Semaphore(SHARD_CONCURRENCY)
+
+    async def call(agent, **ctx) -> dict:
+        async with limit:
+            return await agent.run(**ctx)
+
+    async def map_shard(key: str, members: list[dict]) -> dict:
+        summary, _ = await _user_context_offloaded(members)
+        summary = f"SHARD {shard_by}={key} ({len(members)} of {len(users)} users)\n{summary}"
+        t = time.perf_counter()
+        icp, seg = await asyncio.gather(
+            call(ICPAgent(), user_summary=summary, stats=agent_stats),
+            call(SegmentationAgent(), user_summary=summary, stats=agent_stats),
+        )
+        return {
+            "key": key,
+            "users": len(members),
+            "signed_up": sum(1 for u in members if u.get("status") == "signed_up"),
+            "icp": icp,
+            "seg": seg,
+            "wall_s": time.perf_counter() - t,
+        }
+
+    mapped = await asyncio.gather(*(map_shard(k, m) for k, m in shards.items()))
+
+    reduce_start = time.perf_counter()
+    icp_result = reduce_icp([{**m, "result": m["icp"]["result"]} for m in mapped], shard_by)
+    seg_result = reduce_segmentation([{**m, "result": m["seg"]["result"]} for m in mapped], shard_by, stats)
+    wall = time.perf_counter() - start
+    agent_s = sum(m["icp"]["elapsed_s"] + m["seg"]["elapsed_s"] for m in mapped)
+
+    report = {
+        "shard_by": shard_by,
+        "concurrency": SHARD_CONCURRENCY,
+        "shards": [
+            {
+                "key": m["key"],
+                "users": m["users"],
+                "signed_up": m["signed_up"],
+                "icp_s": m["icp"]["elapsed_s"],
+                "segmentation_s": m["seg"]["elapsed_s"],
+                "icp_model": (m["icp"].get("routing") or {}).get("model"),
+                "segmentation_model": (m["seg"].get("routing") or {}).get("model"),
+                "wall_s": round(m["wall_s"], 2),
+            }
+            for m in mapped
+        ],
+        "wall_s": round(wall, 2),
+        "reduce_s": round(time.perf_counter() - reduce_start, 4),
+        "agent_time_s": round(agent_s, 2),
+        "parallelism": round(agent_s / wall, 2) if wall else None,
+        "single_prompt_s": None,
+        "speedup_vs_single": None,
+    }
+    if SHARD_COMPARE:
+        # Run after the shards, not alongside them, so neither skews the other's timing
+        single_start = time.perf_counter()
+        await _single_phase1(user_summary, agent_stats)
+        single = time.perf_counter() - single_start
+        report["single_prompt_s"] = round(single, 2)
+        report["speedup_vs_single"] = round(single / wall, 2) if wall else None
+    elapsed = round(wall, 2)
+    return (
+        {
+            "agent": "icp_agent",
+            "result": icp_result,
+            "elapsed_s": elapsed,
+            "routing": _shard_routing([m["icp"] for m in mapped]),
+        },
+        {
+            "agent": "segmentation_agent",
+            "result": seg_result,
+            "elapsed_s": elapsed,
+            "routing": _shard_routing([m["seg"] for m in mapped]),
+        },
+        report,
+    )
+
+
+def _messaging_summary(user_summary: str, shard_report: dict | None) -> str:
+    """
+    MessagingAgent's user data. In map-reduce mode the reduced ICP and
+    segmentation already carry the analysis, so it gets a totals line
+    instead of the global summary the shards were built to avoid.
+    """
+    if shard_report is None:
+        return user_summary
+    shards = shard_report["shards"]
+    total = sum(s["users"] for s in shards)
+    signed_up = sum(s["signed_up"] for s in shards)
+    sizes = ", ".join(f"{s['key']} {s['users']}" for s in shards)
+    return (
+        f"TOTALS: {total} users, {signed_up} signed up, {total - signed_up} not engaged. "
+        f"ICP and segmentation below are merged from {len(shards)} shards by {shard_report['shard_by']} ({sizes})."
+    )
+
+
 async def orchestrate(
     users: list[dict],
     stats: dict | None = None,
     previous_brief: dict | None = None,
     feedback: str | None = None,
+    interview_context: str | None = None,
+    interview_context_builder: Callable[[str], str] | None = None,
+    shard_by: str | None = None,
+    data_version: int | None = None,
 ) -> dict:
     """
     Full orchestration pipeline (batch mode).
     Returns: { brief, confidence_score, agent_outputs, timing }
+
+    interview_context_builder, when given, is called after Phase 1 with the
+    ICP + segmentation text and replaces interview_context with its result.
+    shard_by (default ORCHESTRATOR_SHARD_BY) switches phase 1 to map-reduce;
+    its report is added to agent_outputs["map_reduce"]. Per-agent routing
+    decisions and validation results are in agent_outputs["agent_meta"].
+    The user clusters agents were given are in agent_outputs["clusters"];
+    data_version (DataVersion.version of `users`) keys their cache.
     """
-    user_summary = _summarize_users(users)
+    shard_by = shard_by or SHARD_BY
+    with track_orchestration("batch"), tracer.start_as_current_span(
+        "orchestrate",
+        attributes={
+            "orchestrator.mode": "batch",
+            "orchestrator.users": len(users),
+            "orchestrator.shard_by": shard_by or "",
+        },
+    ):
+        return await _orchestrate(
+            users, stats, feedback, interview_context, interview_context_builder, shard_by, data_version
+        )
+
+
+async def _orchestrate(
+    users: list[dict],
+    stats: dict | None,
+    feedback: str | None,
+    interview_context: str | None,
+    interview_context_builder: Callable[[str], str] | None,
+    shard_by: str | None,
+    data_version: int | None,
+) -> dict:
+    user_summary, clusters = await _user_context_offloaded(users, data_version)
+    agent_stats = _prompt_stats(stats, clusters)
     agent_outputs: dict[str, Any] = {}
     timing: dict[str, float] = {}
+    if clusters is not None:
+        agent_outputs["clusters"] = clusters
 
     # ── Phase 1: Parallel — ICP + Segmentation ───────────────────────
-    icp_agent = ICPAgent()
-    seg_agent = SegmentationAgent()
-
-    phase1 = await asyncio.gather(
-        icp_agent.run(user_summary=user_summary, stats=stats),
-        seg_agent.run(user_summary=user_summary, stats=stats),
-    )
-
-    icp_out, seg_out = phase1
-    agent_outputs[icp_out["agent"]] = icp_out["result"]
-    agent_outputs[seg_out["agent"]] = seg_out["result"]
-    timing[icp_out["agent"]] = icp_out["elapsed_s"]
-    timing[seg_out["agent"]] = seg_out["elapsed_s"]
-
-    # ── Phase 2: Messaging Agent (depends on Phase 1) ────────────────
-    msg_agent = MessagingAgent()
-    msg_out = await msg_agent.run(
-        user_summary=user_summary,
-        stats=stats,
-        icp_result=json.dumps(icp_out["result"]),
-        segmentation_result=json.dumps(seg_out["result"]),
-    )
-    agent_outputs[msg_out["agent"]] = msg_out["result"]
-    timing[msg_out["agent"]] = msg_out["elapsed_s"]
-
-    # ── Phase 3: Compose the 1-pager ─────────────────────────────────
-    brief = _compose_brief(
-        icp=icp_out["result"],
-        segmentation=seg_out["result"],
-        messaging=msg_out["result"],
-        feedback=feedback,
-    )
-
-    # ── Phase 4: Critic evaluates the brief ──────────────────────────
-    critic = CriticAgent()
-    critic_out = await critic.run(brief=json.dumps(brief), feedback=feedback or "")
-    agent_outputs[critic_out["agent"]] = critic_out["result"]
-    timing[critic_out["agent"]] = critic_out["elapsed_s"]
+    with trace.use_span(_phase_span(1, "parallel analysis"), end_on_exit=True):
+        icp_out, seg_out, shard_report = await _run_phase1(users, user_summary, stats, agent_stats, shard_by)
+        await _apply_fit_distribution(users, icp_out["result"])
+
+    if shard_report is not None:
+        agent_outputs["map_reduce"] = shard_report
+    _record(agent_outputs, timing, icp_out)
+    _record(agent_outputs, timing, seg_out)
+    critique, critic_span = _start_critique(icp_out["result"], seg_out["result"], feedback)
+
+    try:
+        # ── Phase 2: Messaging Agent (depends on Phase 1) ────────────
+        with trace.use_span(_phase_span(2, "messaging"), end_on_exit=True):
+            if interview_context_builder is not None:
+                interview_context = interview_context_builder(
+                    _relevance_query(icp_out["result"], seg_out["result"])
+                )
+
+            msg_agent = MessagingAgent()
+            msg_out = await msg_agent.run(
+                user_summary=_messaging_summary(user_summary, shard_report),
+                stats=agent_stats,
+                icp_result=json.dumps(icp_out["result"]),
+                segmentation_result=json.dumps(seg_out["result"]),
+                interview_context=interview_context or "",
+            )
+        _record(agent_outputs, timing, msg_out)
+
+        # ── Phase 3: Compose the 1-pager ─────────────────────────────
+        with trace.use_span(_phase_span(3, "compose"), end_on_exit=True):
+            brief = await _compose_brief_offloaded(
+                icp_out["result"], seg_out["result"], msg_out["result"], feedback
+            )
+
+        # ── Phase 4: Critic evaluates the brief ──────────────────────
+        critic_out = await _critique(brief, feedback, critique, critic_span)
+    finally:
+        _close_critique(critique, critic_span)
+    _record(agent_outputs, timing, critic_out)
 
     # Apply critic's revised summary if available
     if critic_out["result"].get("revised_executive_summary"):
@@ -232,14 +598,56 @@ async def orchestrate_stream(
     previous_brief: dict | None = None,
     feedback: str | None = None,
     interview_context: str | None = None,
+    interview_context_builder: Callable[[str], str] | None = None,
+    shard_by: str | None = None,
+    data_version: int | None = None,
 ) -> AsyncGenerator[dict, None]:
     """
     Streaming orchestration pipeline — yields SSE-compatible events
-    as each agent starts, thinks, and completes.
+    as each agent starts, thinks, and completes. A `clusters` event with
+    the computed user clusters comes first; in map-reduce mode a
+    `map_reduce` event with the shard report follows phase 1.
+
+    Spans are only activated around awaits, never across a yield, so the
+    consumer's context is left untouched between events.
     """
-    user_summary = _summarize_users(users)
+    shard_by = shard_by or SHARD_BY
+    root = tracer.start_span(
+        "orchestrate_stream",
+        attributes={
+            "orchestrator.mode": "stream",
+            "orchestrator.users": len(users),
+            "orchestrator.shard_by": shard_by or "",
+        },
+    )
+    try:
+        with track_orchestration("stream"):
+            async for event in _orchestrate_stream(
+                root, users, stats, feedback, interview_context, interview_context_builder, shard_by,
+                data_version,
+            ):
+                yield event
+    finally:
+        root.end()
+
+
+async def _orchestrate_stream(
+    root: trace.Span,
+    users: list[dict],
+    stats: dict | None,
+    feedback: str | None,
+    interview_context: str | None,
+    interview_context_builder: Callable[[str], str] | None,
+    shard_by: str | None,
+    data_version: int | None,
+) -> AsyncGenerator[dict, None]:
+    user_summary, clusters = await _user_context_offloaded(users, data_version)
+    agent_stats = _prompt_stats(stats, clusters)
     agent_outputs: dict[str, Any] = {}
     timing: dict[str, float] = {}
+    if clusters is not None:
+        agent_outputs["clusters"] = clusters
+        yield {"event": "clusters", **clusters}
 
     # ── Phase 1: ICP + Segmentation in parallel ──────────────────────
     yield {
@@ -259,19 +667,15 @@ async def orchestrate_stream(
             "thinking": desc["thinking"],
         }
 
-    icp_agent = ICPAgent()
-    seg_agent = SegmentationAgent()
-
-    phase1 = await asyncio.gather(
-        icp_agent.run(user_summary=user_summary, stats=stats),
-        seg_agent.run(user_summary=user_summary, stats=stats),
-    )
-    icp_out, seg_out = phase1
+    with trace.use_span(_phase_span(1, "parallel analysis", root), end_on_exit=True):
+        icp_out, seg_out, shard_report = await _run_phase1(users, user_summary, stats, agent_stats, shard_by)
+        await _apply_fit_distribution(users, icp_out["result"])
 
-    agent_outputs[icp_out["agent"]] = icp_out["result"]
-    agent_outputs[seg_out["agent"]] = seg_out["result"]
-    timing[icp_out["agent"]] = icp_out["elapsed_s"]
-    timing[seg_out["agent"]] = seg_out["elapsed_s"]
+    if shard_report is not None:
+        agent_outputs["map_reduce"] = shard_report
+        yield {"event": "map_reduce", **shard_report}
+    _record(agent_outputs, timing, icp_out)
+    _record(agent_outputs, timing, seg_out)
 
     yield {
         "event": "agent_complete",
@@ -279,6 +683,7 @@ async def orchestrate_stream(
         "label": "ICP Agent",
         "summary": icp_out["result"].get("icp_summary", "Analysis complete"),
         "elapsed_s": icp_out["elapsed_s"],
+        "routing": icp_out.get("routing"),
     }
     yield {
         "event": "agent_complete",
@@ -286,95 +691,104 @@ async def orchestrate_stream(
         "label": "Segmentation Agent",
         "summary": seg_out["result"].get("engagement_summary", "Analysis complete"),
         "elapsed_s": seg_out["elapsed_s"],
+        "routing": seg_out.get("routing"),
     }
 
-    # ── Phase 2: Messaging Agent ─────────────────────────────────────
-    yield {
-        "event": "phase_start",
-        "phase": 2,
-        "label": "Messaging Strategy",
-        "agents": ["messaging_agent"],
-    }
+    critique, critic_span = _start_critique(icp_out["result"], seg_out["result"], feedback, root)
+    try:
+        # ── Phase 2: Messaging Agent ─────────────────────────────────
+        yield {
+            "event": "phase_start",
+            "phase": 2,
+            "label": "Messaging Strategy",
+            "agents": ["messaging_agent"],
+        }
 
-    desc = AGENT_DESCRIPTIONS["messaging_agent"]
-    yield {
-        "event": "agent_start",
-        "agent": "messaging_agent",
-        "label": desc["label"],
-        "message": desc["description"],
-        "thinking": desc["thinking"],
-    }
+        desc = AGENT_DESCRIPTIONS["messaging_agent"]
+        yield {
+            "event": "agent_start",
+            "agent": "messaging_agent",
+            "label": desc["label"],
+            "message": desc["description"],
+            "thinking": desc["thinking"],
+        }
 
-    msg_agent = MessagingAgent()
-    msg_out = await msg_agent.run(
-        user_summary=user_summary,
-        stats=stats,
-        icp_result=json.dumps(icp_out["result"]),
-        segmentation_result=json.dumps(seg_out["result"]),
-        interview_context=interview_context or "",
-    )
-    agent_outputs[msg_out["agent"]] = msg_out["result"]
-    timing[msg_out["agent"]] = msg_out["elapsed_s"]
+        with trace.use_span(_phase_span(2, "messaging", root), end_on_exit=True):
+            if interview_context_builder is not None:
+                interview_context = interview_context_builder(
+                    _relevance_query(icp_out["result"], seg_out["result"])
+                )
+
+            msg_agent = MessagingAgent()
+            msg_out = await msg_agent.run(
+                user_summary=_messaging_summary(user_summary, shard_report),
+                stats=agent_stats,
+                icp_result=json.dumps(icp_out["result"]),
+                segmentation_result=json.dumps(seg_out["result"]),
+                interview_context=interview_context or "",
+            )
+        _record(agent_outputs, timing, msg_out)
 
-    yield {
-        "event": "agent_complete",
-        "agent": "messaging_agent",
-        "label": "Messaging Agent",
-        "summary": msg_out["result"].get("positioning_statement", "Strategy complete"),
-        "elapsed_s": msg_out["elapsed_s"],
-    }
+        yield {
+            "event": "agent_complete",
+            "agent": "messaging_agent",
+            "label": "Messaging Agent",
+            "summary": msg_out["result"].get("positioning_statement", "Strategy complete"),
+            "elapsed_s": msg_out["elapsed_s"],
+            "routing": msg_out.get("routing"),
+        }
 
-    # ── Phase 3: Compose brief ───────────────────────────────────────
-    yield {
-        "event": "phase_start",
-        "phase": 3,
-        "label": "Composing Brief",
-        "agents": [],
-    }
+        # ── Phase 3: Compose brief ───────────────────────────────────
+        yield {
+            "event": "phase_start",
+            "phase": 3,
+            "label": "Composing Brief",
+            "agents": [],
+        }
 
-    brief = _compose_brief(
-        icp=icp_out["result"],
-        segmentation=seg_out["result"],
-        messaging=msg_out["result"],
-        feedback=feedback,
-    )
+        with trace.use_span(_phase_span(3, "compose", root), end_on_exit=True):
+            brief = await _compose_brief_offloaded(
+                icp_out["result"], seg_out["result"], msg_out["result"], feedback
+            )
 
-    yield {"event": "compose_complete", "message": "1-page brief composed"}
+        yield {"event": "compose_complete", "message": "1-page brief composed"}
 
-    # ── Phase 4: Critic Agent ────────────────────────────────────────
-    yield {
-        "event": "phase_start",
-        "phase": 4,
-        "label": "Quality Review",
-        "agents": ["critic_agent"],
-    }
+        # ── Phase 4: Critic Agent ────────────────────────────────────
+        yield {
+            "event": "phase_start",
+            "phase": 4,
+            "label": "Quality Review",
+            "agents": ["critic_agent"],
+        }
 
-    desc = AGENT_DESCRIPTIONS["critic_agent"]
-    yield {
-        "event": "agent_start",
-        "agent": "critic_agent",
-        "label": desc["label"],
-        "message": desc["description"],
-        "thinking": desc["thinking"],
-    }
+        desc = AGENT_DESCRIPTIONS["critic_agent"]
+        yield {
+            "event": "agent_start",
+            "agent": "critic_agent",
+            "label": desc["label"],
+            "message": desc["description"],
+            "thinking": desc["thinking"],
+            **({"sections": list(CRITIC_SECTIONS)} if critique is not None else {}),
+        }
 
-    critic = CriticAgent()
-    critic_out = await critic.run(brief=json.dumps(brief), feedback=feedback or "")
-    agent_outputs[critic_out["agent"]] = critic_out["result"]
-    timing[critic_out["agent"]] = critic_out["elapsed_s"]
+        critic_out = await _critique(brief, feedback, critique, critic_span, root)
+        _record(agent_outputs, timing, critic_out)
 
-    if critic_out["result"].get("revised_executive_summary"):
-        brief["executive_summary"] = critic_out["result"]["revised_executive_summary"]
+        if critic_out["result"].get("revised_executive_summary"):
+            brief["executive_summary"] = critic_out["result"]["revised_executive_summary"]
 
-    confidence = critic_out["result"].get("confidence_score", 0.5)
+        confidence = critic_out["result"].get("confidence_score", 0.5)
 
-    yield {
-        "event": "agent_complete",
-        "agent": "critic_agent",
-        "label": "Critic Agent",
-        "summary": critic_out["result"].get("overall_assessment", "Review complete"),
-        "elapsed_s": critic_out["elapsed_s"],
-    }
+        yield {
+            "event": "agent_complete",
+            "agent": "critic_agent",
+            "label": "Critic Agent",
+            "summary": critic_out["result"].get("overall_assessment", "Review complete"),
+            "elapsed_s": critic_out["elapsed_s"],
+            "routing": critic_out.get("routing"),
+        }
+    finally:
+        _close_critique(critique, critic_span)
 
     # ── Final result ─────────────────────────────────────────────────
     yield {
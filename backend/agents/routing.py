@@ -0,0 +1,180 @@
+"""
+Model routing — per-agent model, temperature and max tokens via named tiers.
+
+Tiers (fast / balanced / strong) each name a model and sampling settings;
+every agent is assigned a tier. ICP and segmentation are distribution
+readouts and default to `fast`; messaging and the critic default to
+`strong`. All of it is overridable from the environment:
+
+  LLM_TIER_<TIER>_MODEL / _TEMPERATURE / _MAX_TOKENS
+  AGENT_TIERS="icp_agent=balanced,critic_agent=fast"
+
+The latency-SLO router is optional and only active for agents listed in
+AGENT_LATENCY_SLO_S ("messaging_agent=20,critic_agent=15"). When the
+rolling p95 of an agent's calls on its current model exceeds the budget,
+the agent falls back one tier (strong → balanced → fast). Every
+ROUTER_PROBE_EVERY-th call still goes to the preferred tier so the router
+notices when it has recovered: a probe that comes in under budget clears
+that model's window, and samples older than ROUTER_WINDOW_S age out, so
+one slow spell doesn't pin the agent to the fallback.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+# OPENAI_MODEL (the old global setting) still applies to any tier without its own model
+_DEFAULT_MODEL = os.getenv("OPENAI_MODEL")
+
+TIER_ORDER = ("strong", "balanced", "fast")  # each tier falls back to the next
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    model: str
+    temperature: float
+    max_tokens: int
+
+
+def _tier(name: str, model: str, temperature: float, max_tokens: int) -> Tier:
+    prefix = f"LLM_TIER_{name.upper()}_"
+    return Tier(
+        name=name,
+        model=os.getenv(prefix + "MODEL") or _DEFAULT_MODEL or model,
+        temperature=float(os.getenv(prefix + "TEMPERATURE", str(temperature))),
+        max_tokens=int(os.getenv(prefix + "MAX_TOKENS", str(max_tokens))),
+    )
+
+
+TIERS: dict[str, Tier] = {
+    "fast": _tier("fast", "gpt-4o-mini", 0.3, 1500),
+    "balanced": _tier("balanced", "gpt-4o-mini", 0.4, 2500),
+    "strong": _tier("strong", "gpt-4o", 0.5, 3000),
+}
+
+_DEFAULT_AGENT_TIERS = {
+    "icp_agent": "fast",
+    "segmentation_agent": "fast",
+    "messaging_agent": "strong",
+    "critic_agent": "strong",
+    "section_critic_agent": "strong",
+}
+
+
+def _parse_pairs(spec: str) -> dict[str, str]:
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {k.strip(): v.strip() for k, v in pairs}
+
+
+AGENT_TIERS = {**_DEFAULT_AGENT_TIERS, **_parse_pairs(os.getenv("AGENT_TIERS", ""))}
+for _agent, _name in AGENT_TIERS.items():
+    if _name not in TIERS:
+        raise ValueError(f"AGENT_TIERS: unknown tier {_name!r} for {_agent}; expected one of {sorted(TIERS)}")
+
+LATENCY_SLO_S = {k: float(v) for k, v in _parse_pairs(os.getenv("AGENT_LATENCY_SLO_S", "")).items()}
+ROUTER_WINDOW = int(os.getenv("ROUTER_WINDOW", "50"))
+ROUTER_WINDOW_S = float(os.getenv("ROUTER_WINDOW_S", "300"))
+if ROUTER_WINDOW_S <= 0:
+    raise ValueError(f"ROUTER_WINDOW_S must be > 0, got {ROUTER_WINDOW_S}")
+ROUTER_MIN_SAMPLES = int(os.getenv("ROUTER_MIN_SAMPLES", "5"))
+ROUTER_PROBE_EVERY = int(os.getenv("ROUTER_PROBE_EVERY", "10"))
+
+
+@dataclass
+class Route:
+    agent: str
+    tier: str
+    model: str
+    temperature: float
+    max_tokens: int
+    preferred_tier: str
+    reason: str                       # configured | slo_fallback | probe | batch
+    p95_s: float | None = None        # rolling p95 of the preferred tier when the SLO applies
+    budget_s: float | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+class LatencyRouter:
+    """Picks a tier per call; learns latency per (agent, model) from observe()."""
+
+    def __init__(self, slo_s: dict[str, float], window: int = ROUTER_WINDOW, window_s: float = ROUTER_WINDOW_S):
+        self.slo_s = slo_s
+        self.window = window
+        self.window_s = window_s
+        # (time.monotonic(), seconds) per (agent, model), oldest first
+        self._latency: dict[tuple[str, str], deque[tuple[float, float]]] = {}
+        self._calls: dict[str, int] = {}
+
+    def _expire(self, samples: deque[tuple[float, float]]) -> None:
+        cutoff = time.monotonic() - self.window_s
+        while samples and samples[0][0] < cutoff:
+            samples.popleft()
+
+    def p95(self, agent: str, model: str) -> float | None:
+        samples = self._latency.get((agent, model))
+        if samples:
+            self._expire(samples)
+        if not samples or len(samples) < ROUTER_MIN_SAMPLES:
+            return None
+        ordered = sorted(seconds for _, seconds in samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def route(self, agent: str, use_slo: bool = True) -> Route:
+        preferred = AGENT_TIERS.get(agent, "balanced")
+        tier, reason = TIERS[preferred], "configured"
+        budget = self.slo_s.get(agent) if use_slo else None
+        p95 = None
+        if budget is not None:
+            n = self._calls[agent] = self._calls.get(agent, 0) + 1
+            p95 = self.p95(agent, tier.model)
+            # Walk down the tiers while the current one is over budget
+            chain = list(TIER_ORDER[TIER_ORDER.index(preferred):])
+            while len(chain) > 1 and (self.p95(agent, TIERS[chain[0]].model) or 0) > budget:
+                chain.pop(0)
+            if chain[0] != preferred:
+                if ROUTER_PROBE_EVERY and n % ROUTER_PROBE_EVERY == 0:
+                    reason = "probe"
+                else:
+                    tier, reason = TIERS[chain[0]], "slo_fallback"
+        return Route(
+            agent=agent,
+            tier=tier.name,
+            model=tier.model,
+            temperature=tier.temperature,
+            max_tokens=tier.max_tokens,
+            preferred_tier=preferred,
+            reason=reason,
+            p95_s=round(p95, 2) if p95 is not None else None,
+            budget_s=budget,
+        )
+
+    def observe(self, agent: str, model: str, seconds: float) -> None:
+        """Latency of one completed primary call (repairs excluded)."""
+        samples = self._latency.setdefault((agent, model), deque(maxlen=self.window))
+        budget = self.slo_s.get(agent)
+        preferred = TIERS[AGENT_TIERS.get(agent, "balanced")].model
+        if budget is not None and model == preferred and seconds <= budget and (self.p95(agent, model) or 0) > budget:
+            # A probe came back under budget: the slow samples no longer describe this model
+            samples.clear()
+        samples.append((time.monotonic(), seconds))
+
+    def stats(self) -> dict:
+        return {
+            "tiers": {name: asdict(t) for name, t in TIERS.items()},
+            "agent_tiers": dict(AGENT_TIERS),
+            "latency_slo_s": dict(self.slo_s),
+            "p95_s": {
+                f"{agent}/{model}": round(p, 2)
+                for (agent, model) in self._latency
+                if (p := self.p95(agent, model)) is not None
+            },
+        }
+
+
+router = LatencyRouter(LATENCY_SLO_S)
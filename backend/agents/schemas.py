@@ -0,0 +1,155 @@
+"""
+Agent output schemas — what each agent's JSON must contain.
+
+One pydantic model per agent, matching the keys its system prompt asks
+for. BaseAgent.run validates the raw response with model_validate_json
+(parsed and validated in pydantic-core) and repairs only the top-level
+fields that fail. Extra keys are kept; enums the frontend switches on are
+strict.
+"""
+
+from __future__ import annotations
+
+from typing import Literal, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+Level = Literal["high", "medium", "low"]
+
+
+class _Out(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+# ── ICPAgent ──
+
+class Segment(_Out):
+    company_size: str
+    role: str
+    industry: str
+
+
+class FitDistribution(_Out):
+    high_fit: int
+    medium_fit: int
+    low_fit: int
+
+
+class ICPOutput(_Out):
+    icp_summary: str
+    primary_segment: Segment
+    secondary_segments: list[Segment]
+    signals: list[str]
+    fit_score_distribution: FitDistribution
+
+
+# ── SegmentationAgent ──
+
+class DropOff(_Out):
+    stage: str
+    description: str
+    severity: Level
+
+
+class EngagementPattern(_Out):
+    pattern: str
+    segment: str
+    insight: str
+
+
+class RecommendedAction(_Out):
+    action: str
+    type: Literal["send_email", "schedule_zoom", "schedule_meeting", "crm_update", "create_campaign", "send_slack"]
+    target_segment: str
+    priority: Level
+    details: str
+
+
+class SegmentationOutput(_Out):
+    engagement_summary: str
+    conversion_rate: Union[str, float]
+    drop_off_points: list[DropOff]
+    engagement_patterns: list[EngagementPattern]
+    at_risk_segments: list[str]
+    recommended_actions: list[RecommendedAction] = Field(min_length=1)
+
+
+# ── MessagingAgent ──
+
+class ValueProposition(_Out):
+    segment: str
+    headline: str
+    body: str
+    cta: str
+
+
+class Competitor(_Out):
+    name: str
+    strength: str
+    weakness: str
+    our_advantage: str
+
+
+class CompetitiveAnalysis(_Out):
+    market_position: str
+    competitors: list[Competitor]
+    positioning_gaps: list[str] = []
+    differentiation_opportunities: list[str] = []
+
+
+class ProductRecommendation(_Out):
+    title: str
+    description: str
+    source: str = ""
+    impact: Level
+    effort: Level
+    category: str = ""
+    action_type: str = ""
+
+
+class EmailHook(_Out):
+    subject_line: str
+    preview_text: str
+    target_segment: str
+
+
+class GrowthHypothesis(_Out):
+    hypothesis: str
+    expected_impact: Level
+    effort: Level
+
+
+class MessagingOutput(_Out):
+    positioning_statement: str
+    value_propositions: list[ValueProposition]
+    competitive_analysis: CompetitiveAnalysis
+    product_recommendations: list[ProductRecommendation]
+    email_hooks: list[EmailHook]
+    growth_hypotheses: list[GrowthHypothesis]
+    messaging_do_nots: list[str] = []
+
+
+# ── CriticAgent ──
+
+class Suggestion(_Out):
+    section: str
+    issue: str
+    suggestion: str
+
+
+class CriticOutput(_Out):
+    overall_assessment: str
+    confidence_score: float = Field(ge=0, le=1)
+    strengths: list[str]
+    weaknesses: list[str]
+    specific_suggestions: list[Suggestion]
+    revised_executive_summary: str = ""
+
+
+class SectionCriticOutput(_Out):
+    assessment: str
+    confidence_score: float = Field(ge=0, le=1)
+    strengths: list[str]
+    weaknesses: list[str]
+    specific_suggestions: list[Suggestion] = []
+    revised_executive_summary: str = ""
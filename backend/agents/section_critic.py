@@ -0,0 +1,220 @@
+"""
+Section critics — the CriticAgent's evaluation split by brief section.
+
+One CriticAgent call reads the whole composed brief at the tail of the
+critical path, so its latency grows with the brief and nothing overlaps
+it. With CRITIC_MODE=sections each of CRITIC_SECTIONS is reviewed by its
+own small SectionCriticAgent call instead, all concurrently. The ICP and
+segmentation sections only depend on phase 1, so with CRITIC_EARLY_START
+their critiques start as soon as those agents finish and run alongside
+MessagingAgent; only the messaging, actions and product_recommendations
+critiques wait for the composed brief.
+
+merge_critiques() folds the section results into the CriticAgent output
+shape: confidence_score is the SECTION_WEIGHTS-weighted mean of the
+section scores, strengths / weaknesses / suggestions are concatenated
+with their section named, and the messaging critic (which also sees the
+executive summary) supplies revised_executive_summary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+
+from .base import BaseAgent
+from .schemas import SectionCriticOutput
+
+CRITIC_MODE = os.getenv("CRITIC_MODE", "whole")
+if CRITIC_MODE not in ("whole", "sections"):
+    raise ValueError(f"CRITIC_MODE must be 'whole' or 'sections', got {CRITIC_MODE!r}")
+SECTION_CRITIC = CRITIC_MODE == "sections"
+CRITIC_EARLY_START = os.getenv("CRITIC_EARLY_START", "1") == "1"
+
+CRITIC_SECTIONS = ("icp", "segmentation", "messaging", "actions", "product_recommendations")
+SECTION_WEIGHTS = {
+    "icp": 0.2,
+    "segmentation": 0.2,
+    "messaging": 0.25,
+    "actions": 0.2,
+    "product_recommendations": 0.15,
+}
+SECTION_LABELS = {
+    "icp": "ICP",
+    "segmentation": "Segmentation",
+    "messaging": "Messaging",
+    "actions": "Recommended actions",
+    "product_recommendations": "Product recommendations",
+}
+
+_SECTION_FOCUS = {
+    "icp": "Is the ICP specific, supported by the data, and are the signals real buying signals?",
+    "segmentation": "Are the drop-off points, at-risk segments and patterns backed by the numbers?",
+    "messaging": (
+        "Are the value propositions differentiated per segment, the competitors real and relevant, "
+        "and the growth hypotheses testable? Also judge the executive summary."
+    ),
+    "actions": "Is every action specific, implementable, correctly typed and aimed at a clear segment?",
+    "product_recommendations": "Is every recommendation concrete, grounded in a source, with credible impact and effort?",
+}
+
+
+def brief_section(brief: dict, section: str):
+    """The part of a composed brief one section critic reviews."""
+    if section == "messaging":
+        return {"executive_summary": brief.get("executive_summary", ""), **(brief.get("messaging") or {})}
+    if section == "actions":
+        return brief.get("recommended_actions", [])
+    return brief.get(section)
+
+
+class SectionCriticAgent(BaseAgent):
+    name = "section_critic_agent"
+    output_schema = SectionCriticOutput
+    system_prompt = (
+        "You are a ruthlessly honest strategy evaluator and editor.\n"
+        "Given ONE section of a 1-page meeting brief (and optionally prior feedback), "
+        "evaluate the quality of that section only.\n\n"
+        "Return JSON with EXACTLY these keys:\n"
+        "{\n"
+        '  "assessment": "1 sentence summary",\n'
+        '  "confidence_score": <float 0-1>,\n'
+        '  "strengths": ["..."],\n'
+        '  "weaknesses": ["..."],\n'
+        '  "specific_suggestions": [\n'
+        '    { "section": "...", "issue": "...", "suggestion": "..." }\n'
+        "  ],\n"
+        '  "revised_executive_summary": "only when asked, else empty"\n'
+        "}"
+    )
+
+    def __init__(self, section: str):
+        self.section = section
+
+    def _span_attributes(self, span, route, prompt_chars: int) -> None:
+        super()._span_attributes(span, route, prompt_chars)
+        span.set_attribute("critic.section", self.section)
+
+    def build_user_prompt(self, **ctx) -> str:
+        parts = [
+            f"Evaluate the {SECTION_LABELS[self.section]} section of a 1-page meeting brief.\n",
+            f"FOCUS: {_SECTION_FOCUS[self.section]}\n",
+            f"SECTION:\n{ctx.get('content', 'N/A')}\n",
+        ]
+        if self.section == "messaging":
+            parts.append(
+                "If the executive_summary is weak, put an improved one in revised_executive_summary; "
+                "otherwise repeat it unchanged.\n"
+            )
+        if ctx.get("feedback"):
+            parts.append(
+                f"\nUSER FEEDBACK ON PREVIOUS VERSION:\n{ctx['feedback']}\n"
+                "Take this feedback into account where it concerns this section.\n"
+            )
+        parts.append("\nReturn structured JSON as specified.")
+        return "\n".join(parts)
+
+
+def merge_critiques(results: dict[str, dict]) -> dict:
+    """Section results ({section: SectionCriticOutput or {"error"}}) → CriticOutput shape."""
+    ok = {s: r for s, r in results.items() if "error" not in r}
+    failed = [s for s in results if s not in ok]
+    if not ok:
+        return {"error": "Every section critique failed", "failed_sections": failed}
+
+    weight = sum(SECTION_WEIGHTS[s] for s in ok)
+    confidence = sum(SECTION_WEIGHTS[s] * float(r.get("confidence_score", 0.5)) for s, r in ok.items()) / weight
+    strengths, weaknesses, suggestions = [], [], []
+    for s, r in ok.items():
+        label = SECTION_LABELS[s]
+        strengths.extend(f"{label}: {x}" for x in r.get("strengths") or ())
+        weaknesses.extend(f"{label}: {x}" for x in r.get("weaknesses") or ())
+        suggestions.extend({**x, "section": x.get("section") or s} for x in r.get("specific_suggestions") or ())
+
+    weakest = min(ok, key=lambda s: ok[s].get("confidence_score", 0.5))
+    scores = ", ".join(f"{SECTION_LABELS[s]} {ok[s].get('confidence_score', 0.5):.2f}" for s in ok)
+    merged = {
+        "overall_assessment": f"{scores}. Weakest — {SECTION_LABELS[weakest]}: {ok[weakest].get('assessment', '')}",
+        "confidence_score": round(confidence, 3),
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "specific_suggestions": suggestions,
+        "revised_executive_summary": (ok.get("messaging") or {}).get("revised_executive_summary", ""),
+    }
+    if failed:
+        merged["failed_sections"] = failed
+    return merged
+
+
+class SectionCritique:
+    """
+    The section critics of one run. start() launches one section's critique
+    as a task (in the caller's trace context); finish() starts the rest
+    from the composed brief, waits for all and returns a BaseAgent.run()
+    shaped output for critic_agent. close() cancels anything still running.
+    """
+
+    def __init__(self, feedback: str | None = None):
+        self.feedback = feedback or ""
+        self._tasks: dict[str, asyncio.Future] = {}
+        self._early: set[str] = set()
+        self._first_start: float | None = None
+
+    def start(self, section: str, content, early: bool = False) -> None:
+        if section in self._tasks:
+            return
+        if self._first_start is None:
+            self._first_start = time.perf_counter()
+        if early:
+            self._early.add(section)
+        agent = SectionCriticAgent(section)
+        self._tasks[section] = asyncio.ensure_future(
+            agent.run(content=json.dumps(content), feedback=self.feedback)
+        )
+
+    async def finish(self, brief: dict) -> dict:
+        waited_from = time.perf_counter()
+        for section in CRITIC_SECTIONS:
+            self.start(section, brief_section(brief, section))
+        outs = dict(zip(self._tasks, await asyncio.gather(*self._tasks.values())))
+        outs = {s: outs[s] for s in CRITIC_SECTIONS}
+        done = time.perf_counter()
+
+        result = merge_critiques({s: o["result"] for s, o in outs.items()})
+        result["sections"] = {
+            s: {
+                "confidence_score": o["result"].get("confidence_score"),
+                "elapsed_s": o["elapsed_s"],
+                "started": "early" if s in self._early else "composed",
+                "model": (o.get("routing") or {}).get("model"),
+            }
+            for s, o in outs.items()
+        }
+        result["wall_s"] = round(done - self._first_start, 2)
+        models: dict[str, int] = {}
+        for o in outs.values():
+            model = (o.get("routing") or {}).get("model", "unknown")
+            models[model] = models.get(model, 0) + 1
+        validations = [o.get("validation") or {} for o in outs.values()]
+        return {
+            "agent": "critic_agent",
+            "result": result,
+            # What phase 4 added to the critical path; early sections overlapped phase 2
+            "elapsed_s": round(done - waited_from, 2),
+            "routing": {
+                "calls": len(outs),
+                "models": models,
+                "fallbacks": sum(1 for o in outs.values() if (o.get("routing") or {}).get("reason") == "slo_fallback"),
+            },
+            "validation": {
+                "valid": all(v.get("valid", True) for v in validations),
+                "repairs": sum(v.get("repairs", 0) for v in validations),
+            },
+        }
+
+    def close(self) -> None:
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
@@ -5,10 +5,12 @@ Produces structured, actionable recommended actions.
 """
 
 from .base import BaseAgent
+from .schemas import SegmentationOutput
 
 
 class SegmentationAgent(BaseAgent):
     name = "segmentation_agent"
+    output_schema = SegmentationOutput
     system_prompt = (
         "You are a product analytics expert specializing in user engagement.\n"
         "Given user data, analyze engagement patterns between signed-up users and "
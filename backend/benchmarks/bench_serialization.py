@@ -0,0 +1,105 @@
+"""
+Benchmark — response / SSE serialization and bytes on the wire.
+
+Compares, for a large /api/users payload and a large brief `complete` event:
+  - stdlib:  jsonable_encoder + json.dumps (the old FastAPI / SSE path)
+  - orjson:  core.serialization.dumps
+and reports the encoded size raw, gzip and brotli (if installed).
+
+Run from backend/:
+    python -m benchmarks.bench_serialization [--users 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from core.compression import BROTLI_QUALITY, GZIP_LEVEL, brotli
+from core.serialization import dumps
+
+SIZES = ["1-10", "11-50", "51-200", "201-500", "500+"]
+ROLES = ["Founder", "PM", "Marketing", "Engineering", "Sales", "CS", "Design"]
+INDUSTRIES = ["SaaS", "FinTech", "HealthTech", "E-commerce", "AI/ML", "DevTools", "EdTech"]
+
+
+def users_payload(n: int) -> dict:
+    users = [
+        {
+            "id": str(uuid.UUID(int=i)),
+            "email": f"user{i}@example.com",
+            "name": f"User {i}",
+            "company": f"Company {i % 500}",
+            "company_size": SIZES[i % len(SIZES)],
+            "role": ROLES[i % len(ROLES)],
+            "industry": INDUSTRIES[i % len(INDUSTRIES)],
+            "source": "hubspot" if i % 2 else "salesforce",
+            "status": "signed_up" if i % 3 == 0 else "not_engaged",
+        }
+        for i in range(n)
+    ]
+    return {"users": users, "count": n}
+
+
+def brief_event(n_items: int = 200) -> dict:
+    text = "Mid-market SaaS PMs convert 2x faster when onboarding surfaces cohort views early. "
+    items = [
+        {"action": f"{text}#{i}", "type": "send_email", "target_segment": "PM", "priority": "high", "details": text * 3}
+        for i in range(n_items)
+    ]
+    brief = {
+        "executive_summary": text * 10,
+        "recommended_actions": items,
+        "product_recommendations": items,
+        "messaging": {"value_propositions": items[:50], "growth_hypotheses": items[:50]},
+    }
+    return {
+        "event": "complete",
+        "brief": brief,
+        "confidence_score": 0.82,
+        "agent_outputs": {name: brief for name in ("icp_agent", "segmentation_agent", "messaging_agent")},
+        "timing": {"icp_agent": 4.2, "segmentation_agent": 5.1},
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _bench(fn, repeat: int) -> tuple[float, bytes]:
+    out = fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat, out
+
+
+def report(label: str, payload: dict, repeat: int) -> None:
+    stdlib_t, stdlib_b = _bench(lambda: json.dumps(jsonable_encoder(payload), default=str).encode(), repeat)
+    orjson_t, orjson_b = _bench(lambda: dumps(payload), repeat)
+    gz = gzip.compress(orjson_b, compresslevel=GZIP_LEVEL)
+    br = brotli.compress(orjson_b, quality=BROTLI_QUALITY) if brotli else None
+
+    print(f"\n{label}")
+    print(f"  stdlib   {stdlib_t * 1000:9.2f} ms   {len(stdlib_b):>11,} B")
+    print(f"  orjson   {orjson_t * 1000:9.2f} ms   {len(orjson_b):>11,} B   ({stdlib_t / orjson_t:.1f}x faster)")
+    print(f"  gzip     {'':>12}   {len(gz):>11,} B   ({len(gz) / len(orjson_b):.1%} of raw)")
+    if br is not None:
+        print(f"  brotli   {'':>12}   {len(br):>11,} B   ({len(br) / len(orjson_b):.1%} of raw)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    report(f"/api/users ({args.users:,} users)", users_payload(args.users), args.repeat)
+    report("SSE complete event (large brief)", brief_event(), args.repeat * 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark — cold-start time of the API process, for CI.
+
+Boots the app in a fresh interpreter (import main + run the lifespan, no
+server) against a temporary SQLite DB, twice per run:
+  - first boot:  empty DB, so the schema DDL and data sync run
+  - reboot:      same DB, so only the schema fingerprint check runs
+Cache warm-up is disabled (WARM_CACHES=0) so the numbers are the time
+until the worker can serve. Also checks that the LLM SDK was not imported.
+
+Exits 1 if the median reboot exceeds --max-seconds or the SDK was loaded.
+
+Run from backend/:
+    python -m benchmarks.bench_startup [--runs 3] [--max-seconds 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_CHILD = """
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+
+async def boot():
+    async with main.lifespan(main.app):
+        pass
+
+asyncio.run(boot())
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_s": t1 - t0,
+    "lifespan_s": t2 - t1,
+    "llm_sdk_loaded": "openai" in sys.modules,
+}))
+"""
+
+
+def boot_once(db_url: str) -> dict:
+    env = {**os.environ, "DATABASE_URL": db_url, "WARM_CACHES": "0", "TRACING_ENABLED": "1"}
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["process_s"] = time.perf_counter() - start
+    return result
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--max-seconds", type=float, default=None, help="fail if the median reboot is slower")
+    args = ap.parse_args()
+
+    first, again = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="apm-startup-") as tmp:
+            url = f"sqlite+aiosqlite:///{tmp}/startup.db"
+            first.append(boot_once(url))
+            again.append(boot_once(url))
+
+    def report(label: str, runs: list[dict]) -> float:
+        med = {k: statistics.median(r[k] for r in runs) for k in ("import_s", "lifespan_s", "process_s")}
+        print(
+            f"{label:<11} process {med['process_s']:6.2f}s   import main {med['import_s']:6.2f}s   "
+            f"lifespan {med['lifespan_s']:6.2f}s"
+        )
+        return med["process_s"]
+
+    report("first boot", first)
+    reboot_s = report("reboot", again)
+
+    failed = False
+    if any(r["llm_sdk_loaded"] for r in first + again):
+        print("FAIL: the OpenAI SDK was imported during startup")
+        failed = True
+    if args.max_seconds is not None and reboot_s > args.max_seconds:
+        print(f"FAIL: reboot took {reboot_s:.2f}s (limit {args.max_seconds:.2f}s)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
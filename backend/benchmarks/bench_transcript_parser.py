@@ -0,0 +1,93 @@
+"""
+Benchmark — single-pass transcript parser vs the regex extractors.
+
+Builds a synthetic corpus (default ~100MB) by repeating the real transcripts
+in assets/ with renumbered timestamps, then times:
+  - legacy:    read_text + _extract_key_insights + _extract_pm_questions
+  - streaming: transcript_parser.parse_file, one file at a time
+  - parallel:  transcript_parser.parse_files across a process pool
+
+Run from backend/:
+    python -m benchmarks.bench_transcript_parser [--mb 100] [--files 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from services.interview_service import ASSETS_DIR, _extract_key_insights, _extract_pm_questions
+from services.transcript_parser import parse_file, parse_files
+
+
+def build_corpus(target_mb: int, n_files: int, out_dir: Path) -> list[Path]:
+    """Write n_files transcripts totalling roughly target_mb megabytes."""
+    seed = "\n".join(p.read_text(encoding="utf-8") for p in sorted(ASSETS_DIR.glob("transcript*.txt")))
+    per_file = (target_mb * 1024 * 1024) // n_files
+    reps = max(1, per_file // len(seed.encode("utf-8")))
+    body = "\n".join(seed for _ in range(reps))
+    paths = []
+    for i in range(n_files):
+        path = out_dir / f"transcript{i}.txt"
+        path.write_text(body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def _timed(label: str, fn, total_bytes: int, trace_memory: bool = True) -> float:
+    """Time fn, then (optionally) re-run it under tracemalloc for peak memory."""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak_s = "n/a"
+    if trace_memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_s = f"{peak / 1024 / 1024:.1f} MB"
+    mb = total_bytes / (1024 * 1024)
+    print(f"{label:<10} {elapsed:8.2f}s  {mb / elapsed:8.1f} MB/s  peak {peak_s}")
+    return elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=int, default=100, help="corpus size in MB")
+    ap.add_argument("--files", type=int, default=200, help="number of transcript files")
+    ap.add_argument("--workers", type=int, default=None, help="process pool size")
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="apm-bench-"))
+    try:
+        paths = build_corpus(args.mb, args.files, tmp)
+        total = sum(p.stat().st_size for p in paths)
+        print(f"corpus: {len(paths)} files, {total / 1024 / 1024:.1f} MB\n")
+
+        def legacy():
+            for p in paths:
+                text = p.read_text(encoding="utf-8")
+                _extract_key_insights(text)
+                _extract_pm_questions(text)
+
+        def streaming():
+            for p in paths:
+                parse_file(p)
+
+        base = _timed("legacy", legacy, total)
+        stream = _timed("streaming", streaming, total)
+        # tracemalloc can't see the worker processes, so skip it there
+        par = _timed(
+            "parallel", lambda: parse_files(paths, max_workers=args.workers), total, trace_memory=False
+        )
+        print(f"\nspeedup: streaming {base / stream:.2f}x, parallel {base / par:.2f}x")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
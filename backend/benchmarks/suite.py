@@ -0,0 +1,374 @@
+"""
+Benchmark suite — the CPU-bound hot paths, with a saved baseline.
+
+Cases (sizes via --sizes, default 1k / 100k / 1M users):
+  - summarize_users[n]   orchestrator._summarize_users over n user dicts
+  - cluster_users[n]     clustering.cluster_users (encode + k-modes), uncached
+  - fit_scores[n]        fit_scoring.score_users against a primary + secondary ICP
+  - load_users[n]        brief_service._load_users against SQLite with n rows
+  - load_stats[n]        brief_service._load_stats against the same DB
+  - compose_brief        orchestrator._compose_brief with large agent outputs
+  - extract_insights     interview_service._extract_key_insights
+  - extract_questions    interview_service._extract_pm_questions
+  - parse_transcript     transcript_parser.parse_text (the single-pass replacement)
+  - sse_event            core.serialization.sse_event on a large `complete` event
+  - brief_to_dict        routes.briefs._brief_to_dict on a large brief
+
+Each case is timed (ops/sec, mean, median) and then run once more under
+tracemalloc for peak memory, so tracing never skews the timings. Results are
+written as JSON; with --baseline they are compared and the run exits 1 if
+any case lost more than --threshold of its throughput. Everything is local:
+no network, no API key.
+
+Run from backend/:
+    python -m benchmarks.suite [--sizes 1000,100000] [--only load_]
+    python -m benchmarks.suite --save-baseline           # record a baseline
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from agents.clustering import CLUSTER_ATTRIBUTES, cluster_users
+from agents.clustering import _cache as _cluster_cache
+from agents.fit_scoring import FIT_ATTRIBUTES, icp_segments, score_users
+from agents.orchestrator import _compose_brief, _summarize_users
+from benchmarks.bench_serialization import brief_event
+from core.serialization import sse_event
+from db.database import Base
+from db.models import Brief
+from db.seed import COMPANIES, ROLES, SIZES, SOURCES
+from routes.briefs import _brief_to_dict
+from services.brief_service import _load_stats, _load_users
+from services.interview_service import ASSETS_DIR, _extract_key_insights, _extract_pm_questions
+from services.transcript_parser import parse_text
+
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+# ── Fixtures ──
+
+def _label(n: int) -> str:
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}M"
+    if n >= 1000 and n % 1000 == 0:
+        return f"{n // 1000}k"
+    return str(n)
+
+
+def _user_rows(n: int, seed: int = 42):
+    """Deterministic user rows shaped like db.seed output (1/3 signed up)."""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        company, industry = COMPANIES[i % len(COMPANIES)]
+        signed = i % 3 == 0
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "email": f"user{i}@example.com",
+            "name": f"User {i}",
+            "company": company,
+            "company_size": SIZES[i % len(SIZES)],
+            "role": ROLES[i % len(ROLES)],
+            "industry": industry,
+            "source": SOURCES[i % len(SOURCES)],
+            "status": "signed_up" if signed else "not_engaged",
+            "signed_up_at": now - timedelta(seconds=rng.randint(0, 90 * 86400)) if signed else None,
+            "last_active": now - timedelta(seconds=rng.randint(0, 7 * 86400)) if signed else None,
+            "created_at": now,
+        }
+
+
+def _sqlite_ts(v: datetime | None) -> str | None:
+    # Same text format SQLAlchemy's SQLite DateTime type writes
+    return v.strftime("%Y-%m-%d %H:%M:%S.%f") if v else None
+
+
+def build_user_db(path: Path, n: int) -> None:
+    """Create the schema and bulk-load n users with plain sqlite3 executemany."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    cols = ("id", "email", "name", "company", "company_size", "role", "industry",
+            "source", "status", "signed_up_at", "last_active", "created_at")
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    sql = f"INSERT INTO users ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})"
+    batch = []
+    for row in _user_rows(n):
+        for k in ("signed_up_at", "last_active", "created_at"):
+            row[k] = _sqlite_ts(row[k])
+        batch.append(tuple(row[c] for c in cols))
+        if len(batch) >= 50_000:
+            conn.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(sql, batch)
+    conn.commit()
+    conn.close()
+
+
+def large_agent_outputs(n_items: int = 500) -> tuple[dict, dict, dict]:
+    text = "Mid-market SaaS PMs convert 2x faster when onboarding surfaces cohort views early. "
+    icp = {
+        "icp_summary": text * 5,
+        "primary_segment": {"company_size": "51-200", "role": "PM", "industry": "SaaS"},
+        "secondary_segments": [{"company_size": s, "role": r, "industry": "SaaS"} for s in SIZES for r in ROLES],
+        "signals": [text] * 50,
+    }
+    segmentation = {
+        "engagement_summary": text * 5,
+        "conversion_rate": 0.33,
+        "drop_off_points": [{"stage": f"stage {i}", "details": text} for i in range(50)],
+        "at_risk_segments": [{"segment": f"segment {i}", "reason": text} for i in range(50)],
+        "engagement_patterns": [text] * 50,
+        "recommended_actions": [
+            {"action": f"{text}#{i}", "type": "launch_campaign", "target_segment": "PM", "priority": "high", "details": text}
+            for i in range(n_items)
+        ],
+    }
+    messaging = {
+        "positioning_statement": text * 3,
+        "value_propositions": [{"segment": f"s{i}", "proposition": text * 2} for i in range(n_items // 5)],
+        "competitive_analysis": {"gaps": [text] * 20, "strengths": [text] * 20},
+        "growth_hypotheses": [{"hypothesis": text, "impact": "high"} for _ in range(n_items // 5)],
+        "email_hooks": [
+            {"subject_line": f"Hook {i}", "target_segment": "PM", "preview_text": text} for i in range(n_items)
+        ],
+        "product_recommendations": [{"recommendation": text, "priority": "high"} for _ in range(n_items // 5)],
+    }
+    return icp, segmentation, messaging
+
+
+def large_transcript(copies: int = 20) -> str:
+    seed = "\n".join(p.read_text(encoding="utf-8") for p in sorted(ASSETS_DIR.glob("transcript*.txt")))
+    return "\n".join(seed for _ in range(copies))
+
+
+# ── Harness ──
+
+class Case:
+    """
+    setup() builds the fixture and returns the op to time; it runs only when
+    the case is selected, and the fixture is dropped once the case is done.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        setup: Callable[[], Callable[[], object]],
+        run: Callable[[Callable], object] | None = None,
+    ):
+        self.name = name
+        self.setup = setup
+        # How to execute one op: plain call, or e.g. loop.run_until_complete for coroutines
+        self.run = run or (lambda f: f())
+
+
+def measure(case: Case, min_time: float, min_runs: int, max_runs: int, memory: bool) -> dict:
+    fn = case.setup()
+    case.run(fn)  # warm-up: caches, lazy imports, SQLite page cache
+    times: list[float] = []
+    total = 0.0
+    while len(times) < max_runs and (len(times) < min_runs or total < min_time):
+        start = time.perf_counter()
+        case.run(fn)
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        total += elapsed
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        case.run(fn)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(len(times) / total, 4),
+        "mean_s": round(statistics.fmean(times), 6),
+        "median_s": round(statistics.median(times), 6),
+        "runs": len(times),
+        "peak_mem_bytes": peak,
+    }
+
+
+def build_cases(sizes: list[int], tmp: Path, loop: asyncio.AbstractEventLoop) -> list[Case]:
+    run_async = lambda f: loop.run_until_complete(f())  # noqa: E731
+    cases: list[Case] = []
+
+    for n in sizes:
+        def summarize_setup(n=n):
+            users = [
+                {k: v for k, v in r.items() if k not in ("signed_up_at", "last_active", "created_at")}
+                for r in _user_rows(n)
+            ]
+            return lambda: _summarize_users(users)
+
+        def cluster_setup(n=n):
+            users = [{k: r[k] for k in (*CLUSTER_ATTRIBUTES, "status")} for r in _user_rows(n)]
+            # Clear the cache so every op encodes and clusters from scratch
+            return lambda: (_cluster_cache.clear(), cluster_users(users))
+
+        def fit_setup(n=n):
+            users = [{k: r[k] for k in FIT_ATTRIBUTES} for r in _user_rows(n)]
+            segments = icp_segments({
+                "primary_segment": {"company_size": SIZES[2], "role": ROLES[0], "industry": COMPANIES[0][1]},
+                "secondary_segments": [{"company_size": f"{SIZES[1]} / {SIZES[3]}", "role": ROLES[1], "industry": ""}],
+            })
+            return lambda: score_users(users, segments)
+
+        db_path = tmp / f"users_{n}.db"
+
+        def db_setup(loader, n=n, db_path=db_path):
+            if not db_path.exists():
+                build_user_db(db_path, n)
+            session = async_sessionmaker(
+                create_async_engine(f"sqlite+aiosqlite:///{db_path}"), class_=AsyncSession
+            )
+
+            async def op():
+                async with session() as db:
+                    return await loader(db)
+
+            return op
+
+        cases.append(Case(f"summarize_users[{_label(n)}]", summarize_setup))
+        cases.append(Case(f"cluster_users[{_label(n)}]", cluster_setup))
+        cases.append(Case(f"fit_scores[{_label(n)}]", fit_setup))
+        cases.append(Case(f"load_users[{_label(n)}]", lambda s=db_setup: s(_load_users), run_async))
+        cases.append(Case(f"load_stats[{_label(n)}]", lambda s=db_setup: s(_load_stats), run_async))
+
+    def compose_setup():
+        icp, seg, msg = large_agent_outputs()
+        # _compose_brief appends to segmentation's action list, so each op gets a fresh copy
+        return lambda: _compose_brief(
+            icp, {**seg, "recommended_actions": list(seg["recommended_actions"])}, msg, "feedback"
+        )
+
+    def transcript_setup(extract):
+        transcript = large_transcript()
+        return lambda: extract(transcript)
+
+    def sse_setup():
+        event = brief_event()
+        return lambda: sse_event("complete", event)
+
+    def brief_setup():
+        event = brief_event()
+        brief = Brief(
+            id=str(uuid.uuid4()),
+            content=event["brief"],
+            summary=event["brief"]["executive_summary"],
+            confidence_score=0.8,
+            agent_outputs=event["agent_outputs"],
+            created_at=datetime.now(timezone.utc),
+        )
+        return lambda: _brief_to_dict(brief)
+
+    cases.append(Case("compose_brief", compose_setup))
+    cases.append(Case("extract_insights", lambda: transcript_setup(_extract_key_insights)))
+    cases.append(Case("extract_questions", lambda: transcript_setup(_extract_pm_questions)))
+    cases.append(Case("parse_transcript", lambda: transcript_setup(parse_text)))
+    cases.append(Case("sse_event", sse_setup))
+    cases.append(Case("brief_to_dict", brief_setup))
+    return cases
+
+
+# ── Reporting ──
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table; return the names of regressed cases."""
+    regressed = []
+    print(f"\n{'case':<28} {'baseline ops/s':>15} {'current ops/s':>15} {'change':>9}")
+    for name, cur in results["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"{name:<28} {'—':>15} {cur['ops_per_sec']:>15,.2f} {'new':>9}")
+            continue
+        change = cur["ops_per_sec"] / base["ops_per_sec"] - 1
+        flag = ""
+        if change < -threshold:
+            regressed.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {base['ops_per_sec']:>15,.2f} {cur['ops_per_sec']:>15,.2f} {change:>+8.1%}{flag}")
+    return regressed
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                    help="comma-separated user counts for the user/DB cases")
+    ap.add_argument("--only", default=None, help="run only cases whose name contains this string")
+    ap.add_argument("--min-time", type=float, default=1.0, help="seconds of timed runs per case")
+    ap.add_argument("--min-runs", type=int, default=3)
+    ap.add_argument("--max-runs", type=int, default=1000)
+    ap.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    ap.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    ap.add_argument("--baseline", type=Path, default=None, help="compare against this results file")
+    ap.add_argument("--save-baseline", action="store_true", help="also write results to results/baseline.json")
+    ap.add_argument("--threshold", type=float, default=0.15,
+                    help="fail if ops/sec drops by more than this fraction (default 0.15)")
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    loop = asyncio.new_event_loop()
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="apm-bench-") as tmp:
+        cases = build_cases(sizes, Path(tmp), loop)
+        print(f"\n{'case':<28} {'ops/s':>12} {'median':>12} {'runs':>6} {'peak mem':>12}")
+        for case in cases:
+            if args.only and args.only not in case.name:
+                continue
+            r = measure(case, args.min_time, args.min_runs, args.max_runs, not args.no_memory)
+            results["results"][case.name] = r
+            mem = f"{r['peak_mem_bytes'] / 1024 / 1024:.1f} MB" if r["peak_mem_bytes"] is not None else "—"
+            print(f"{case.name:<28} {r['ops_per_sec']:>12,.2f} {r['median_s'] * 1000:>10.2f}ms {r['runs']:>6} {mem:>12}")
+    loop.close()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nresults written to {args.output}")
+    if args.save_baseline:
+        baseline_path = RESULTS_DIR / "baseline.json"
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {baseline_path}")
+
+    if args.baseline:
+        regressed = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
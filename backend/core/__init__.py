@@ -0,0 +1,21 @@
+from .compression import CompressionMiddleware, no_compression
+from .executor import run_cpu, run_in_thread
+from .metrics import MetricsMiddleware, render_metrics
+from .profiling import ProfilingMiddleware
+from .serialization import ORJSONResponse, dumps, sse_event
+from .tracing import TracingMiddleware, tracer
+
+__all__ = [
+    "CompressionMiddleware",
+    "no_compression",
+    "ORJSONResponse",
+    "dumps",
+    "sse_event",
+    "MetricsMiddleware",
+    "render_metrics",
+    "ProfilingMiddleware",
+    "TracingMiddleware",
+    "tracer",
+    "run_cpu",
+    "run_in_thread",
+]
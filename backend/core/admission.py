@@ -0,0 +1,172 @@
+"""
+Admission control — bounded concurrency + bounded priority wait queue.
+
+Brief generation holds a DB session and a connection for tens of seconds of
+LLM time. Requests are admitted up to `max_concurrent`; the rest wait in a
+priority queue (lower number = higher priority) of at most `max_queue`.
+When the queue is full a new request either displaces the lowest-priority
+waiter (if it outranks it) or is rejected. Rejections carry a Retry-After
+estimated from the observed service time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2  # pre-generation (services/brief_scheduler.py)
+
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int,
+        queue_timeout_s: float,
+        initial_service_s: float = 30.0,
+    ):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self._in_flight = 0
+        # Heap of (priority, seq, future); cancelled/settled futures are skipped lazily
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._service_s = initial_service_s
+        self.admitted = 0
+        self.rejected: dict[str, int] = {"queue_full": 0, "displaced": 0, "queue_timeout": 0}
+
+    # ── Queue helpers ──
+
+    def _live_waiters(self) -> list[tuple[int, int, asyncio.Future]]:
+        return [w for w in self._waiters if not w[2].done()]
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._live_waiters())
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the service-time EWMA."""
+        waves = (self.queue_depth + 1) / max(self.max_concurrent, 1)
+        return max(1, math.ceil(self._service_s * waves))
+
+    def _reject(self, status_code: int, reason: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(status_code, reason, self.retry_after())
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # hand the slot straight to the waiter
+                return
+        self._in_flight -= 1
+
+    # ── Public API ──
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_BATCH) -> AsyncIterator[None]:
+        """Hold one concurrency slot for the duration of the block."""
+        if self._in_flight < self.max_concurrent and not self._live_waiters():
+            self._in_flight += 1
+        else:
+            live = self._live_waiters()
+            if len(live) >= self.max_queue:
+                worst = max(live)
+                if priority >= worst[0]:
+                    raise self._reject(429, "queue_full")
+                # Shed the lowest-priority, most recent waiter in favour of this one
+                worst[2].set_exception(self._reject(503, "displaced"))
+            fut = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+            try:
+                await asyncio.wait_for(asyncio.shield(fut), timeout=self.queue_timeout_s)
+            except asyncio.TimeoutError:
+                if fut.done() and not fut.exception():
+                    self._release()  # slot was handed over just as we timed out
+                fut.cancel()
+                raise self._reject(503, "queue_timeout")
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled() and not fut.exception():
+                    self._release()
+                fut.cancel()
+                raise
+
+        self.admitted += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self._service_s += _EWMA_ALPHA * (elapsed - self._service_s)
+            self._release()
+
+    def stats(self) -> dict:
+        live = self._live_waiters()
+        by_priority: dict[int, int] = {}
+        for p, _, _ in live:
+            by_priority[p] = by_priority.get(p, 0) + 1
+        return {
+            "name": self.name,
+            "in_flight": self._in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": len(live),
+            "queue_depth_by_priority": by_priority,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_service_s": round(self._service_s, 2),
+            "retry_after_s": self.retry_after(),
+        }
+
+
+brief_admission = AdmissionController(
+    "brief_generation",
+    max_concurrent=int(os.getenv("BRIEF_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("BRIEF_MAX_QUEUE", "16")),
+    queue_timeout_s=float(os.getenv("BRIEF_QUEUE_TIMEOUT_S", "30")),
+)
+
+
+def admit(priority: int, controller: AdmissionController = brief_admission):
+    """
+    FastAPI dependency factory. Declare it before `get_db` so a request
+    waits for a slot before it checks out a DB connection. The slot is held
+    until the response has been sent, StreamingResponse bodies included
+    (FastAPI >= 0.118; earlier versions exit yield dependencies first).
+    """
+
+    async def dependency():
+        try:
+            async with controller.slot(priority):
+                yield
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=f"Brief generation is at capacity ({e.reason}); retry later",
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+    return dependency
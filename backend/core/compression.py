@@ -0,0 +1,152 @@
+"""
+Response compression — brotli / gzip negotiated from Accept-Encoding.
+
+Bodies are buffered until they reach MIN_SIZE; smaller responses go out
+uncompressed, larger ones are compressed incrementally as they stream.
+Event streams, Parquet files and routes decorated with @no_compression are
+passed through untouched so SSE frames are never held back by the
+compressor.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Callable
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast setting; higher levels cost more CPU than they save on the wire
+
+_SKIP_CONTENT_TYPES = ("text/event-stream", "application/vnd.apache.parquet")  # Parquet is already compressed
+
+
+def no_compression(endpoint: Callable) -> Callable:
+    """Route decorator: never compress this endpoint's responses."""
+    endpoint._no_compression = True
+    return endpoint
+
+
+def _choose_encoding(accept: str) -> str | None:
+    offered = {}
+    for part in accept.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip().lower()] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._process, self._flush = self._c.process, self._c.finish
+        else:
+            self._c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process, self._flush = self._c.compress, self._c.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._process(data)
+
+    def finish(self) -> bytes:
+        return self._flush()
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware so streaming responses keep streaming."""
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        encoding = _choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message: dict | None = None
+        buffer: list[bytes] = []
+        buffered = 0
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_compressed_start():
+            hdrs = [
+                (k, v) for k, v in start_message["headers"]
+                if k.lower() not in (b"content-length", b"content-encoding")
+            ]
+            hdrs.append((b"content-encoding", encoding.encode()))
+            hdrs.append((b"vary", b"Accept-Encoding"))
+            await send({**start_message, "headers": hdrs})
+
+        async def wrapped_send(message):
+            nonlocal start_message, buffered, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                resp_headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = resp_headers.get(b"content-type", b"").decode("latin-1")
+                endpoint = scope.get("endpoint")
+                if (
+                    b"content-encoding" in resp_headers
+                    or content_type.startswith(_SKIP_CONTENT_TYPES)
+                    or getattr(endpoint, "_no_compression", False)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+
+            if compressor is not None:
+                out = compressor.compress(body)
+                if not more:
+                    out += compressor.finish()
+                if out or not more:
+                    await send({"type": "http.response.body", "body": out, "more_body": more})
+                return
+
+            buffer.append(body)
+            buffered += len(body)
+            if buffered < self.minimum_size:
+                if more:
+                    return
+                # Whole body is small — send it as-is
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b"".join(buffer), "more_body": False})
+                return
+
+            compressor = _Compressor(encoding)
+            await send_compressed_start()
+            out = compressor.compress(b"".join(buffer))
+            buffer.clear()
+            if not more:
+                out += compressor.finish()
+            await send({"type": "http.response.body", "body": out, "more_body": more})
+
+        await self.app(scope, receive, wrapped_send)
+
@@ -0,0 +1,86 @@
+"""
+CPU offload — keeps synchronous, CPU-bound work off the event loop.
+
+`run_cpu(fn, *args, size=..., thread_at=..., process_at=...)` picks where
+to run by the caller's own measure of input size:
+
+  size <  thread_at    inline — a pool hop would cost more than the work
+  size <  process_at   shared thread pool — the loop keeps getting GIL
+                       slices, so other requests and streams stay live
+  size >= process_at   shared process pool — true parallelism; only for
+                       work whose arguments are cheap to pickle (e.g. text)
+
+Both pools are created on first use and are per worker process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .metrics import CPU_OFFLOADS
+
+T = TypeVar("T")
+
+THREAD_WORKERS = int(os.getenv("CPU_THREAD_WORKERS", "4"))
+PROCESS_WORKERS = int(os.getenv("CPU_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _threads() -> ThreadPoolExecutor:
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix="cpu")
+    return _thread_pool
+
+
+def _processes() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the parent has an event loop, DB connections and
+        # exporter threads that must not be duplicated into the children
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _process_pool
+
+
+async def run_cpu(
+    fn: Callable[..., T],
+    *args: Any,
+    size: int,
+    thread_at: int,
+    process_at: int | None = None,
+) -> T:
+    """Run fn(*args) inline, in the thread pool or in the process pool by size."""
+    loop = asyncio.get_running_loop()
+    if size < thread_at:
+        CPU_OFFLOADS.labels("inline").inc()
+        return fn(*args)
+    if process_at is not None and size >= process_at and PROCESS_WORKERS > 0:
+        CPU_OFFLOADS.labels("process").inc()
+        return await loop.run_in_executor(_processes(), functools.partial(fn, *args))
+    CPU_OFFLOADS.labels("thread").inc()
+    return await loop.run_in_executor(_threads(), functools.partial(fn, *args))
+
+
+async def run_in_thread(fn: Callable[..., T], *args: Any) -> T:
+    """Always off-loop, on the shared thread pool (for work with no cheap size measure)."""
+    CPU_OFFLOADS.labels("thread").inc()
+    return await asyncio.get_running_loop().run_in_executor(_threads(), functools.partial(fn, *args))
+
+
+def shutdown() -> None:
+    global _thread_pool, _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+    if _thread_pool is not None:
+        _thread_pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = None
@@ -0,0 +1,133 @@
+"""
+Event-loop lag monitor — how late the loop runs, and what blocked it.
+
+A heartbeat task sleeps LOOP_LAG_INTERVAL_MS at a time and records how far
+past schedule it woke up (apm_event_loop_lag_seconds). A watchdog thread
+checks the heartbeat; once it is overdue by LOOP_STALL_THRESHOLD_MS it
+grabs the loop thread's stack — i.e. the code blocking the loop, while it
+is still blocking. When the heartbeat resumes the stall is recorded with
+that call site. Recent stalls are served from /api/ops/loop-lag.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from .metrics import LOOP_LAG, LOOP_STALLS
+from .profiling import frame_label, is_app_frame
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "1") not in ("0", "false", "False")
+LOOP_LAG_INTERVAL_MS = float(os.getenv("LOOP_LAG_INTERVAL_MS", "50"))
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+
+_MAX_STACK = 15
+
+
+def _describe(frame) -> dict:
+    """Innermost-first stack labels plus the innermost frame in our own code."""
+    stack, call_site = [], None
+    while frame is not None:
+        label = frame_label(frame)
+        if call_site is None and is_app_frame(frame) and not frame.f_code.co_filename.endswith("loop_monitor.py"):
+            call_site = label
+        stack.append(label)
+        frame = frame.f_back
+    return {"call_site": call_site or (stack[0] if stack else None), "stack": stack[:_MAX_STACK]}
+
+
+class LoopMonitor:
+    def __init__(
+        self,
+        interval_ms: float = LOOP_LAG_INTERVAL_MS,
+        threshold_ms: float = LOOP_STALL_THRESHOLD_MS,
+        keep: int = 100,
+    ):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.stalls: deque[dict] = deque(maxlen=keep)
+        self.stalls_total = 0
+        self.max_lag = 0.0
+        self._lags: deque[float] = deque(maxlen=max(1, int(60 / self.interval)))  # ~1 minute
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._pending: dict | None = None
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    # ── loop side ──
+
+    async def _heartbeat(self) -> None:
+        while True:
+            due = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+            lag = max(0.0, now - due)
+            with self._lock:
+                self._last_beat = now
+                pending, self._pending = self._pending, None
+            LOOP_LAG.observe(lag)
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.threshold:
+                LOOP_STALLS.inc()
+                self.stalls_total += 1
+                self.stalls.append({
+                    "at": datetime.fromtimestamp(time.time() - lag, timezone.utc).isoformat(),
+                    "duration_ms": round(lag * 1000, 1),
+                    # None when the stall ended before the watchdog looked
+                    "call_site": pending["call_site"] if pending else None,
+                    "stack": pending["stack"] if pending else [],
+                })
+
+    # ── watchdog thread ──
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                overdue = time.perf_counter() - self._last_beat - self.interval
+                if overdue < self.threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                self._pending = _describe(frame)
+
+    def start(self) -> "LoopMonitor":
+        """Call from the event loop being monitored."""
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._watchdog.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self, limit: int = 20) -> dict:
+        lags = sorted(self._lags)
+
+        def pct(q: float) -> float:
+            return round(lags[min(len(lags) - 1, int(q * len(lags)))] * 1000, 2) if lags else 0.0
+
+        return {
+            "running": self._task is not None,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "lag_ms": {"p50": pct(0.5), "p99": pct(0.99), "max": round(self.max_lag * 1000, 2)},
+            "stalls_total": self.stalls_total,
+            "recent_stalls": list(self.stalls)[-limit:][::-1],
+        }
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,189 @@
+"""
+Operational metrics — Prometheus histograms, counters and gauges.
+
+Separate from /api/metrics (business aggregates): these describe the
+service itself and are scraped from /metrics in the text exposition format.
+With several workers, set PROMETHEUS_MULTIPROC_DIR so every process writes
+its samples there and the scrape aggregates them.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from .tracing import route_template
+
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+_LLM_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0)
+
+HTTP_LATENCY = Histogram(
+    "apm_http_request_duration_seconds",
+    "HTTP request latency by route (streams: until the last frame is sent)",
+    ["method", "route", "status"],
+    buckets=_HTTP_BUCKETS,
+)
+AGENT_LATENCY = Histogram(
+    "apm_agent_duration_seconds", "BaseAgent.run wall-clock time", ["agent"], buckets=_LLM_BUCKETS
+)
+ORCHESTRATION_LATENCY = Histogram(
+    "apm_orchestration_duration_seconds",
+    "End-to-end orchestrator run time",
+    ["mode"],
+    buckets=_LLM_BUCKETS + (180.0, 300.0),
+)
+DB_QUERY_LATENCY = Histogram(
+    "apm_db_query_duration_seconds", "SQL statement execution time", ["operation", "pool"], buckets=_FAST_BUCKETS
+)
+DB_POOL_WAIT = Histogram(
+    "apm_db_pool_checkout_seconds",
+    "Time to obtain a DB connection from the pool (includes connect on a miss)",
+    ["pool"],
+    buckets=_FAST_BUCKETS + (5.0, 10.0, 30.0),
+)
+
+LLM_ERRORS = Counter("apm_llm_errors_total", "LLM calls that raised", ["agent"])
+LLM_RETRIES = Counter("apm_llm_retries_total", "HTTP retries issued by the LLM client", ["agent"])
+LLM_JSON_FAILURES = Counter(
+    "apm_llm_json_parse_failures_total", "LLM responses that were not valid JSON (raw fallback)", ["agent"]
+)
+
+LLM_VALIDATION_FAILURES = Counter(
+    "apm_llm_validation_failures_total",
+    "Agent responses that failed their output schema, by top-level field",
+    ["agent", "field"],
+)
+LLM_REPAIRS = Counter(
+    "apm_llm_repairs_total", "Schema repair calls by outcome (fixed, invalid, error)", ["agent", "outcome"]
+)
+LLM_REPAIR_LATENCY = Histogram(
+    "apm_llm_repair_duration_seconds", "Total repair time per agent run that needed one", ["agent"],
+    buckets=_LLM_BUCKETS,
+)
+LLM_ROUTES = Counter(
+    "apm_llm_routes_total", "Agent calls by routed model and reason (configured, slo_fallback, probe, batch)",
+    ["agent", "model", "reason"],
+)
+EXPORT_ROWS = Counter("apm_export_rows_total", "Rows streamed by /api/export", ["dataset", "format"])
+
+CPU_OFFLOADS = Counter("apm_cpu_offloads_total", "run_cpu calls by where they ran", ["pool"])
+LOOP_LAG = Histogram(
+    "apm_event_loop_lag_seconds",
+    "Delay of the loop-monitor heartbeat past its scheduled time",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = Counter("apm_event_loop_stalls_total", "Heartbeats later than LOOP_STALL_THRESHOLD_MS")
+
+SSE_STREAMS = Gauge("apm_sse_streams_active", "Event streams currently open", multiprocess_mode="livesum")
+ORCHESTRATIONS_IN_FLIGHT = Gauge(
+    "apm_orchestrations_in_flight", "Orchestrator runs in progress", ["mode"], multiprocess_mode="livesum"
+)
+
+
+@contextmanager
+def track_orchestration(mode: str) -> Iterator[None]:
+    """In-flight gauge + end-to-end latency for one orchestrator run."""
+    gauge = ORCHESTRATIONS_IN_FLIGHT.labels(mode)
+    gauge.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        gauge.dec()
+        ORCHESTRATION_LATENCY.labels(mode).observe(time.perf_counter() - start)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Exposition body and content type for the scrape endpoint."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# ── SQLAlchemy ──
+
+def instrument_engine_metrics(engine, pool: str = "writer") -> None:
+    """Query latency via cursor execute events; pool wait by timing raw_connection(). `pool` labels both."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._apm_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_apm_started", None)
+        if started is not None:
+            op = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+            DB_QUERY_LATENCY.labels(op, pool).observe(time.perf_counter() - started)
+
+    # Connection() calls engine.raw_connection() for every checkout; wrapping
+    # it on the instance survives pool re-creation after dispose().
+    raw_connection = sync_engine.raw_connection
+
+    def timed_raw_connection():
+        start = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            DB_POOL_WAIT.labels(pool).observe(time.perf_counter() - start)
+
+    sync_engine.raw_connection = timed_raw_connection
+
+
+# ── HTTP ──
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency histogram and open-stream gauge."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status_code = 500
+        streaming = False
+
+        async def measured_send(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                streaming = any(
+                    k.lower() == b"content-type" and v.startswith(b"text/event-stream")
+                    for k, v in message.get("headers", [])
+                )
+                if streaming:
+                    SSE_STREAMS.inc()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, measured_send)
+        finally:
+            if streaming:
+                SSE_STREAMS.dec()
+            route = route_template(scope) or "unmatched"
+            HTTP_LATENCY.labels(scope["method"], route, str(status_code)).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,200 @@
+"""
+On-demand profiling — a sampling profiler with collapsed-stack output.
+
+A background thread samples the event-loop thread's stack (or, for a
+process profile, every thread's) every PROFILE_INTERVAL_MS and counts
+identical stacks. Output is one "frame;frame;frame count" line per stack,
+ready for flamegraph.pl or speedscope; in all-threads mode each stack
+starts with its thread's name. Samples of a loop idle in select(), or of
+a pool thread waiting for work, are counted separately rather than drawn.
+
+Disabled unless PROFILING_ADMIN_TOKEN is set; callers must send it as
+X-Admin-Token. A single request is profiled with `X-Profile: 1` or
+`?profile=1`; the file name comes back in X-Profile-File.
+"""
+
+from __future__ import annotations
+
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs
+
+ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", "./profiles"))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+MAX_PROFILE_SECONDS = 60
+
+_IDLE_FUNCS = {
+    ("selectors.py", "select"),
+    ("base_events.py", "_run_once"),
+    ("threading.py", "wait"),      # Event / Condition waits in helper threads
+    ("thread.py", "_worker"),      # ThreadPoolExecutor worker blocked on its queue
+    ("queue.py", "get"),
+}
+_SRC_ROOT = str(Path(__file__).resolve().parent.parent) + os.sep
+
+
+def is_admin(token: str | None) -> bool:
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+def is_app_frame(frame) -> bool:
+    return frame.f_code.co_filename.startswith(_SRC_ROOT)
+
+
+def frame_label(frame) -> str:
+    path = frame.f_code.co_filename
+    path = path[len(_SRC_ROOT):] if path.startswith(_SRC_ROOT) else os.path.basename(path)
+    return f"{frame.f_code.co_name} ({path}:{frame.f_code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples one thread's stack, or all threads', from a daemon thread until stopped."""
+
+    def __init__(
+        self, thread_id: int | None = None, interval_ms: float = PROFILE_INTERVAL_MS, all_threads: bool = False
+    ):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.all_threads = all_threads
+        self.interval = interval_ms / 1000
+        self.stacks: Counter[str] = Counter()
+        self.idle_samples = 0
+        self.started_at = 0.0
+        self.duration_s = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        frames = sys._current_frames()
+        if not self.all_threads:
+            frame = frames.get(self.thread_id)
+            if frame is not None:
+                self._count(frame, None)
+            return
+        names = {t.ident: t.name for t in threading.enumerate()}
+        me = threading.get_ident()
+        for ident, frame in frames.items():
+            if ident != me:
+                self._count(frame, names.get(ident, f"thread-{ident}"))
+
+    def _count(self, frame, thread_name: str | None) -> None:
+        code = frame.f_code
+        if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FUNCS:
+            self.idle_samples += 1
+            return
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        if thread_name is not None:
+            labels.append(f"[{thread_name}]")
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration_s = time.perf_counter() - self.started_at
+        return self
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+    def write(self, path: Path) -> Path:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.collapsed())
+        return path
+
+    def summary(self) -> dict:
+        return {
+            "duration_s": round(self.duration_s, 3),
+            "interval_ms": self.interval * 1000,
+            "all_threads": self.all_threads,
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "unique_stacks": len(self.stacks),
+        }
+
+
+def profile_path(label: str) -> Path:
+    """Timestamped file in PROFILE_DIR for a profile labelled e.g. 'GET-/api/users'."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in label).strip("_")[:60]
+    return PROFILE_DIR / f"{stamp}-{safe or 'profile'}.collapsed"
+
+
+def list_profiles() -> list[dict]:
+    if not PROFILE_DIR.is_dir():
+        return []
+    files = sorted(PROFILE_DIR.glob("*.collapsed"), reverse=True)
+    return [{"name": f.name, "bytes": f.stat().st_size} for f in files]
+
+
+def read_profile(name: str) -> str:
+    """Contents of a stored profile; name must be a bare file name."""
+    if Path(name).name != name or not name.endswith(".collapsed"):
+        raise ValueError("Invalid profile name")
+    path = PROFILE_DIR / name
+    if not path.is_file():
+        raise FileNotFoundError(name)
+    return path.read_text()
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware: profiles a single request when an admin asks for it.
+    Everything else passes straight through.
+
+    The sampler sees the whole event-loop thread, so requests running
+    concurrently with the profiled one show up in its stacks too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMIN_TOKEN:
+            return await self.app(scope, receive, send)
+
+        headers = {k.lower(): v for k, v in scope.get("headers") or []}
+        requested = headers.get(b"x-profile", b"").decode("latin-1") in ("1", "true") or (
+            parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [""])[0] in ("1", "true")
+        )
+        if not requested or not is_admin(headers.get(b"x-admin-token", b"").decode("latin-1")):
+            return await self.app(scope, receive, send)
+
+        path = profile_path(f"{scope['method']}-{scope['path']}")
+
+        async def profiled_send(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-profile-file", path.name.encode())],
+                }
+            await send(message)
+
+        profiler = SamplingProfiler().start()
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            profiler.stop().write(path)
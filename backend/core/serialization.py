@@ -0,0 +1,37 @@
+"""
+JSON serialization — orjson for responses and SSE events.
+
+orjson serializes the dicts we return several times faster than stdlib json
+and handles datetimes natively. `default=str` keeps the old json.dumps
+fallback for anything else; OPT_NON_STR_KEYS matches json.dumps for the
+None / int keys that GROUP BY results can produce.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    return orjson.dumps(obj, default=str, option=_OPTIONS)
+
+
+def sse_event(event_type: str, data: Any) -> bytes:
+    """Encode one Server-Sent Event frame."""
+    return b"event: " + event_type.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    Default response class. Returning an instance directly from a route
+    also skips FastAPI's jsonable_encoder pass over the payload.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
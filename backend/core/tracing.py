@@ -0,0 +1,255 @@
+"""
+Tracing — OpenTelemetry spans kept in an in-process ring buffer.
+
+Spans cover the HTTP request, orchestrator phases, each agent call and each
+SQL statement. Finished spans land in a bounded deque served by
+/api/debug/traces, so no collector is needed. When OTEL_EXPORTER_OTLP_ENDPOINT
+is set and the OTLP exporter is installed, spans are shipped there as well.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.trace import Status, StatusCode
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "1") not in ("0", "false", "False")
+TRACE_BUFFER_SPANS = int(os.getenv("TRACE_BUFFER_SPANS", "5000"))
+_MAX_STATEMENT_CHARS = 500
+
+
+class RingBufferExporter(SpanExporter):
+    """Keeps the most recent finished spans in memory."""
+
+    def __init__(self, maxlen: int = TRACE_BUFFER_SPANS):
+        self._spans: deque[ReadableSpan] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        with self._lock:
+            self._spans.extend(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def traces(self, limit: int = 20, trace_id: str | None = None) -> list[dict]:
+        """Recent traces, newest first, each with its spans in start order."""
+        with self._lock:
+            spans = list(self._spans)
+        grouped: dict[str, list[ReadableSpan]] = {}
+        for s in spans:
+            tid = format(s.context.trace_id, "032x")
+            if trace_id is None or tid == trace_id:
+                grouped.setdefault(tid, []).append(s)
+
+        out = []
+        for tid, members in grouped.items():
+            members.sort(key=lambda s: s.start_time)
+            root = next((s for s in members if s.parent is None), members[0])
+            out.append({
+                "trace_id": tid,
+                "name": root.name,
+                "start": root.start_time / 1e9,
+                "duration_ms": _duration_ms(root),
+                "spans": [_span_to_dict(s) for s in members],
+            })
+        out.sort(key=lambda t: t["start"], reverse=True)
+        return out[:limit]
+
+
+def _duration_ms(s: ReadableSpan) -> float | None:
+    if s.end_time is None:
+        return None
+    return round((s.end_time - s.start_time) / 1e6, 3)
+
+
+def _span_to_dict(s: ReadableSpan) -> dict:
+    return {
+        "name": s.name,
+        "span_id": format(s.context.span_id, "016x"),
+        "parent_id": format(s.parent.span_id, "016x") if s.parent else None,
+        "start": s.start_time / 1e9,
+        "duration_ms": _duration_ms(s),
+        "status": s.status.status_code.name,
+        "attributes": dict(s.attributes or {}),
+    }
+
+
+# ── Provider setup ──
+
+exporter = RingBufferExporter()
+
+if TRACING_ENABLED:
+    _provider = TracerProvider(resource=Resource.create({"service.name": "apm-backend"}))
+    _provider.add_span_processor(SimpleSpanProcessor(exporter))
+    if os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("OTEL_EXPORTER_OTLP_ENDPOINT set but opentelemetry-exporter-otlp is not installed")
+        else:
+            _provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(_provider)
+
+tracer = trace.get_tracer("apm")
+
+
+def current_trace_id() -> str | None:
+    ctx = trace.get_current_span().get_span_context()
+    return format(ctx.trace_id, "032x") if ctx.is_valid else None
+
+
+# ── SQLAlchemy ──
+
+def instrument_engine(engine, pool: str = "writer") -> None:
+    """One span per SQL statement, via cursor execute events on the sync engine; `pool` tags the spans."""
+    if not TRACING_ENABLED:
+        return
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        op = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = tracer.start_span(
+            f"db {op}",
+            kind=trace.SpanKind.CLIENT,
+            attributes={
+                "db.system": system,
+                "db.pool": pool,
+                "db.statement": statement[:_MAX_STATEMENT_CHARS],
+                "db.executemany": executemany,
+            },
+        )
+        context._apm_span = span
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_apm_span", None)
+        if span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(exception_context):
+        span = getattr(exception_context.execution_context, "_apm_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.set_status(Status(StatusCode.ERROR))
+            span.end()
+
+
+# ── HTTP ──
+
+def route_template(scope) -> str | None:
+    """
+    Full path template of the matched route, e.g. /api/interviews/{interview_id}.
+    Some FastAPI versions put the router-relative route in scope, so the
+    mount prefix is recovered from the request path.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        return None
+    request_path = scope["path"]
+    regex = getattr(route, "path_regex", None)
+    if regex is None or regex.match(request_path):
+        return path
+    for i, ch in enumerate(request_path):
+        if ch == "/" and i and regex.match(request_path[i:]):
+            return request_path[:i] + path
+    return path
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware: one server span per request, named after the
+    matched route once routing has run. If the framework has already opened
+    a server span (FastAPI's built-in telemetry), that span is annotated
+    instead of nesting a duplicate. For event streams it also records how
+    many frames were written and the time spent in send().
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not TRACING_ENABLED:
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        outer = trace.get_current_span()
+        owned = not outer.is_recording()
+        span_cm = (
+            tracer.start_as_current_span(
+                f"HTTP {method}",
+                kind=trace.SpanKind.SERVER,
+                attributes={"http.method": method, "http.target": scope["path"]},
+            )
+            if owned
+            else trace.use_span(outer)
+        )
+
+        status_code = 500
+        streaming = False
+        writes = 0
+        write_s = 0.0
+
+        with span_cm as span:
+            trace_id = format(span.get_span_context().trace_id, "032x").encode()
+
+            async def traced_send(message):
+                nonlocal status_code, streaming, writes, write_s
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = list(message.get("headers", []))
+                    streaming = any(
+                        k.lower() == b"content-type" and v.startswith(b"text/event-stream")
+                        for k, v in headers
+                    )
+                    headers.append((b"x-trace-id", trace_id))
+                    message = {**message, "headers": headers}
+                elif streaming and message["type"] == "http.response.body":
+                    if not message.get("more_body", False):
+                        # Record before the final frame: a framework-owned span ends with it
+                        span.set_attribute("sse.writes", writes)
+                        span.set_attribute("sse.write_ms", round(write_s * 1000, 3))
+                    t0 = time.perf_counter()
+                    await send(message)
+                    write_s += time.perf_counter() - t0
+                    writes += 1
+                    return
+                await send(message)
+
+            try:
+                await self.app(scope, receive, traced_send)
+            finally:
+                if owned:
+                    route = route_template(scope)
+                    if route is not None:
+                        span.update_name(f"HTTP {method} {route}")
+                        span.set_attribute("http.route", route)
+                    span.set_attribute("http.status_code", status_code)
+                    if status_code >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
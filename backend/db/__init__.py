@@ -1,5 +1,19 @@
-from .database import Base, engine, async_session, get_db, init_db
-from .models import User, Brief
+from .database import (
+    Base, engine, read_engine, async_session, async_read_session, get_db, read_db, read_session, read_connection,
+    mark_written, routing_stats, init_db, ReadYourWritesMiddleware,
+)
+from .models import (
+    User, Brief, Interview, InterviewInsight, InterviewQuestion, EngagementDaily, EngagementDirtyDay,
+    DataVersion, FitModel,
+)
+from . import events  # noqa: F401 — registers ORM flush listeners
+from .events import on_data_change
 from .seed import seed_mock_data
 
-__all__ = ["Base", "engine", "async_session", "get_db", "init_db", "User", "Brief", "seed_mock_data"]
+__all__ = [
+    "Base", "engine", "read_engine", "async_session", "async_read_session", "get_db", "read_db", "read_session",
+    "read_connection", "mark_written", "routing_stats", "init_db", "ReadYourWritesMiddleware",
+    "User", "Brief", "Interview", "InterviewInsight", "InterviewQuestion",
+    "EngagementDaily", "EngagementDirtyDay", "DataVersion", "FitModel",
+    "on_data_change", "seed_mock_data",
+]
@@ -1,19 +1,63 @@
 """
-Database engine & session factory — async SQLite via aiosqlite.
+Database engines & session factories — async SQLite via aiosqlite.
+
+Two pools: the writer (DATABASE_URL) takes persistence and anything that
+must see its own writes; the reader (DATABASE_READ_URL, default the same
+database) takes the heavy reads — the user list, metrics, the stats and
+users a brief starts from. With a replica configured, reads of a table this
+worker wrote within DATABASE_REPLICA_LAG_S go to the writer instead
+(mark_written / read_session), so a brief just created is visible to the
+next GET even before the replica has caught up.
+
+The next GET may land on another worker, which has not seen the write.
+ReadYourWritesMiddleware therefore hands a client whose request wrote
+the commit time (X-DB-Write-At header and cookie); a request carrying a
+token younger than DATABASE_REPLICA_LAG_S reads from the writer on any
+worker.
 """
 
+import hashlib
+import logging
 import os
+import math
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from http.cookies import CookieError, SimpleCookie
+from typing import AsyncIterator
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-_raw_url = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./apm_intel.db")
-# Use async driver for PostgreSQL (create_async_engine requires it)
-if _raw_url.startswith("postgresql://") and "+asyncpg" not in _raw_url:
-    _raw_url = _raw_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-DATABASE_URL = _raw_url
+from core.metrics import instrument_engine_metrics
+from core.tracing import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _async_url(url: str) -> str:
+    # Use async driver for PostgreSQL (create_async_engine requires it)
+    if url.startswith("postgresql://") and "+asyncpg" not in url:
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL = _async_url(os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./apm_intel.db"))
+DATABASE_READ_URL = _async_url(os.getenv("DATABASE_READ_URL") or DATABASE_URL)
+REPLICA_LAG_S = float(os.getenv("DATABASE_REPLICA_LAG_S", "5"))
+if REPLICA_LAG_S < 0:
+    raise ValueError(f"DATABASE_REPLICA_LAG_S must be >= 0, got {REPLICA_LAG_S}")
+HAS_REPLICA = DATABASE_READ_URL != DATABASE_URL
 
 engine = create_async_engine(DATABASE_URL, echo=False)
+# Its own pool even without a replica, so list and stats reads never queue behind writes
+read_engine = create_async_engine(DATABASE_READ_URL, echo=False)
+for _engine, _pool in ((engine, "writer"), (read_engine, "reader")):
+    instrument_engine(_engine, pool=_pool)
+    instrument_engine_metrics(_engine, pool=_pool)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -21,12 +65,213 @@ class Base(DeclarativeBase):
 
 
 async def get_db():
-    """FastAPI dependency — yields an async session."""
+    """FastAPI dependency — yields an async session on the writer."""
     async with async_session() as session:
         yield session
 
 
-async def init_db():
-    """Create all tables (idempotent)."""
+# ── Read routing ──
+
+# table name → time.monotonic() of this worker's last commit that wrote it
+_last_write: dict[str, float] = {}
+
+WRITE_AT_HEADER = "X-DB-Write-At"
+WRITE_AT_COOKIE = "db_write_at"
+
+# Per request (set by ReadYourWritesMiddleware): {"client_write_at": time.time() | None, "wrote_at": …}
+_request_writes: ContextVar[dict | None] = ContextVar("request_writes", default=None)
+
+
+def mark_written(*tables: str) -> None:
+    """Record a committed write, so reads of `tables` stay on the writer for the replica lag window."""
+    now = time.monotonic()
+    for table in tables:
+        _last_write[table] = now
+    state = _request_writes.get()
+    if state is not None:
+        state["wrote_at"] = time.time()
+
+
+def reads_from_writer(*tables: str) -> bool:
+    """True when a read of `tables` might miss a recent write — this worker's, or the client's — on the replica."""
+    if not HAS_REPLICA:
+        return False
+    state = _request_writes.get()
+    if state is not None and (state["client_write_at"] or 0) > time.time() - REPLICA_LAG_S:
+        return True
+    horizon = time.monotonic() - REPLICA_LAG_S
+    return any(_last_write.get(t, float("-inf")) > horizon for t in tables)
+
+
+def read_session(*tables: str) -> AsyncSession:
+    """Session for a read of `tables`: the reader pool, or the writer while the replica may lag."""
+    return (async_session if reads_from_writer(*tables) else async_read_session)()
+
+
+def read_db(*tables: str):
+    """FastAPI dependency factory — `Depends(read_db("users"))` yields a read_session()."""
+    async def dependency() -> AsyncIterator[AsyncSession]:
+        async with read_session(*tables) as session:
+            yield session
+    return dependency
+
+
+@asynccontextmanager
+async def read_connection(*tables: str):
+    """Core connection counterpart of read_session() for chunked reads."""
+    async with (engine if reads_from_writer(*tables) else read_engine).connect() as conn:
+        yield conn
+
+
+def _client_write_at(headers: dict[bytes, bytes]) -> float | None:
+    raw = headers.get(WRITE_AT_HEADER.lower().encode(), b"").decode("latin-1")
+    if not raw and b"cookie" in headers:
+        try:
+            morsel = SimpleCookie(headers[b"cookie"].decode("latin-1")).get(WRITE_AT_COOKIE)
+        except CookieError:
+            morsel = None
+        raw = morsel.value if morsel else ""
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    # A token from the future would pin the client to the writer; cap it at now
+    return min(value, time.time()) if math.isfinite(value) else None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware carrying the last-write token between a client's
+    requests. A response to a request that committed before its headers
+    went out gets X-DB-Write-At and a cookie that expires with the lag
+    window. A no-op without a replica.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not HAS_REPLICA:
+            return await self.app(scope, receive, send)
+
+        state = {"client_write_at": _client_write_at(dict(scope.get("headers") or [])), "wrote_at": None}
+        token = _request_writes.set(state)
+
+        async def send_token(message):
+            if message["type"] == "http.response.start" and state["wrote_at"] is not None:
+                value = f"{state['wrote_at']:.3f}"
+                cookie = f"{WRITE_AT_COOKIE}={value}; Max-Age={math.ceil(REPLICA_LAG_S)}; Path=/; HttpOnly; SameSite=Lax"
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (WRITE_AT_HEADER.lower().encode(), value.encode()),
+                        (b"set-cookie", cookie.encode()),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_token)
+        finally:
+            _request_writes.reset(token)
+
+
+def routing_stats() -> dict:
+    """Pools and read routing state of this worker, for /ops/db."""
+    now = time.monotonic()
+    return {
+        "replica": HAS_REPLICA,
+        "replica_lag_s": REPLICA_LAG_S,
+        "pools": {
+            "writer": {"url": engine.url.render_as_string(hide_password=True), "status": engine.pool.status()},
+            "reader": {"url": read_engine.url.render_as_string(hide_password=True), "status": read_engine.pool.status()},
+        },
+        "recent_writes": {
+            t: {"age_s": round(now - at, 2), "reads_from_writer": reads_from_writer(t)}
+            for t, at in sorted(_last_write.items())
+        },
+    }
+
+
+# Full-text index over interview transcripts + friction points.
+# SQLite: an FTS5 table whose rowid is the interview id (kept in sync by
+# the interview service). PostgreSQL: a GIN index over a tsvector expression.
+_SEARCH_INDEX_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS interviews_fts USING fts5("
+        "title, transcript, friction, tokenize='porter unicode61')",
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS ix_interviews_search ON interviews USING GIN ("
+        "to_tsvector('english', coalesce(title, '') || ' ' || transcript || ' ' || coalesce(friction_text, '')))",
+    ],
+}
+
+
+def schema_fingerprint() -> str:
+    """Hash of every table's columns, types and indexes plus the search DDL."""
+    h = hashlib.sha1()
+    for table in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        h.update(table.name.encode())
+        for col in table.columns:
+            h.update(f"|{col.name}:{col.type}:{col.nullable}:{col.primary_key}".encode())
+        for ix in sorted(table.indexes, key=lambda i: i.name or ""):
+            h.update(f"|ix:{ix.name}:{','.join(c.name for c in ix.columns)}".encode())
+    for ddl in _SEARCH_INDEX_DDL.get(engine.dialect.name, []):
+        h.update(ddl.encode())
+    return h.hexdigest()[:16]
+
+
+async def _stored_fingerprint() -> str | None:
+    async with engine.connect() as conn:
+        try:
+            return (await conn.execute(text("SELECT version FROM schema_version"))).scalar()
+        except DBAPIError:
+            return None  # first boot: no version table yet
+
+
+def _add_missing_columns(sync_conn) -> list[str]:
+    """
+    ALTER TABLE … ADD COLUMN for nullable model columns an existing table
+    lacks, then create any missing indexes. Additive changes only.
+    """
+    inspector = inspect(sync_conn)
+    added = []
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for col in table.columns:
+            if col.name in existing or not col.nullable:
+                continue
+            col_type = col.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {col.name} {col_type}"))
+            added.append(f"{table.name}.{col.name}")
+        for ix in table.indexes:
+            ix.create(sync_conn, checkfirst=True)
+    return added
+
+
+async def init_db() -> bool:
+    """
+    Create tables and the interview search index, unless the schema
+    fingerprint stored by a previous boot still matches the models — then
+    startup costs a single SELECT. Returns True if DDL ran.
+
+    Adds missing tables, indexes and nullable columns; other column changes
+    on existing tables still need a migration.
+    """
+    fingerprint = schema_fingerprint()
+    if await _stored_fingerprint() == fingerprint:
+        return False
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        added = await conn.run_sync(_add_missing_columns)
+        if added:
+            logger.info("Added columns: %s", ", ".join(added))
+        for ddl in _SEARCH_INDEX_DDL.get(engine.dialect.name, []):
+            await conn.execute(text(ddl))
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version VARCHAR(64) NOT NULL)"))
+        await conn.execute(text("DELETE FROM schema_version"))
+        await conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": fingerprint})
+    logger.info("Schema initialised (fingerprint %s)", fingerprint)
+    return True
@@ -0,0 +1,159 @@
+"""
+ORM event listeners.
+
+Any flush that inserts, updates or deletes a User marks the days touched by
+its signed_up_at / last_active (old and new values) as dirty, in the same
+transaction. The engagement rollups recompute only those days.
+
+New users start with fit_score NULL. A User whose company_size, role or
+industry changes gets NULL in the same flush, as does every row an ORM bulk
+UPDATE of users touches; services/lead_service.py rescores only NULL rows.
+
+Any transaction that changes users or interviews (flushed objects or ORM
+bulk UPDATE / DELETE) bumps the data_version row once, and after it commits
+the changed tables are marked written (read routing keeps this worker's
+reads of them on the writer while a replica may lag) and the callbacks
+registered with on_data_change() run.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timezone
+from itertools import chain
+from typing import Callable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .database import mark_written
+from .models import DataVersion, EngagementDirtyDay, Interview, InterviewInsight, InterviewQuestion, User
+
+logger = logging.getLogger(__name__)
+
+_TRACKED = ("signed_up_at", "last_active")
+_FIT_INPUTS = ("company_size", "role", "industry")  # agents/fit_scoring.FIT_ATTRIBUTES
+_PENDING_KEY = "engagement_dirty_days"
+
+_DATA_MODELS = (User, Interview, InterviewInsight, InterviewQuestion)
+_INTERVIEW_MODELS = (Interview, InterviewInsight, InterviewQuestion)
+_DATA_CHANGED_KEY = "data_changed"      # {"users", "interviews"}; set by a flush / bulk statement
+_VERSION_BUMPED_KEY = "data_version_bumped"  # bumped in this transaction; notify on commit
+
+_data_change_callbacks: list[Callable[[], None]] = []
+
+
+def on_data_change(callback: Callable[[], None]) -> Callable[[], None]:
+    """Register a callback run after every commit that bumped data_version."""
+    _data_change_callbacks.append(callback)
+    return callback
+
+
+def _day(value: datetime | None) -> date | None:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_dirty_days(session: Session, flush_context, instances) -> None:
+    for obj in chain(session.new, session.deleted, session.dirty):
+        if isinstance(obj, _DATA_MODELS) and (obj not in session.dirty or session.is_modified(obj)):
+            _note_change(session, type(obj))
+
+    days: set[date] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.new:
+        if isinstance(obj, User):
+            days.update(_day(getattr(obj, a)) for a in _TRACKED)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            days.update(_day(getattr(obj, a)) for a in _TRACKED)
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            for a in _TRACKED:
+                hist = state.attrs[a].history
+                if hist.has_changes():
+                    days.update(_day(v) for v in (*hist.added, *hist.deleted))
+            if any(state.attrs[a].history.has_changes() for a in _FIT_INPUTS):
+                obj.fit_score = None
+    days.discard(None)
+
+
+def _note_change(session: Session, model: type) -> None:
+    kind = "interviews" if issubclass(model, _INTERVIEW_MODELS) else "users"
+    session.info.setdefault(_DATA_CHANGED_KEY, set()).add(kind)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_bulk_changes(orm_execute_state) -> None:
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, _DATA_MODELS):
+            _note_change(orm_execute_state.session, mapper.class_)
+        if orm_execute_state.is_update and mapper is not None and mapper.class_ is User:
+            orm_execute_state.statement = orm_execute_state.statement.values(fit_score=None)
+
+
+def _bump_data_version(session: Session) -> None:
+    """Once per transaction; a later interview change in it still marks interviews_version."""
+    kinds = session.info.pop(_DATA_CHANGED_KEY, None)
+    bumped = session.info.get(_VERSION_BUMPED_KEY)
+    if not kinds or (bumped and (bumped == "interviews" or "interviews" not in kinds)):
+        return
+    conn = session.connection()
+    table = DataVersion.__table__
+    now = datetime.now(timezone.utc)
+    if bumped:
+        conn.execute(table.update().where(table.c.id == 1).values(interviews_version=table.c.version))
+    else:
+        insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+        values = {"version": table.c.version + 1, "changed_at": now}
+        if "interviews" in kinds:
+            values["interviews_version"] = table.c.version + 1
+        stmt = insert(table).values(
+            id=1, version=1, changed_at=now, interviews_version=1 if "interviews" in kinds else None
+        ).on_conflict_do_update(index_elements=["id"], set_=values)
+        conn.execute(stmt)
+    session.info[_VERSION_BUMPED_KEY] = "interviews" if "interviews" in kinds else "users"
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session) -> None:
+    _bump_data_version(session)  # bulk statements with no flush after them
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_data_change(session: Session) -> None:
+    bumped = session.info.pop(_VERSION_BUMPED_KEY, False)
+    if not bumped:
+        return
+    # "interviews" may have changed users in the same transaction as well
+    mark_written("users", "data_version", *(("interviews",) if bumped == "interviews" else ()))
+    for callback in _data_change_callbacks:
+        try:
+            callback()
+        except Exception:
+            logger.exception("data-change callback failed")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_data_change(session: Session, previous_transaction) -> None:
+    session.info.pop(_DATA_CHANGED_KEY, None)
+    session.info.pop(_VERSION_BUMPED_KEY, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _write_dirty_days(session: Session, flush_context) -> None:
+    _bump_data_version(session)
+    days = session.info.pop(_PENDING_KEY, None)
+    if not days:
+        return
+    conn = session.connection()
+    insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(EngagementDirtyDay.__table__).on_conflict_do_nothing(index_elements=["day"])
+    conn.execute(stmt, [{"day": d} for d in days])
@@ -0,0 +1,105 @@
+"""
+Local replica — a second SQLite file that trails the primary, for running
+the read/write split (db/database.py) without a database server.
+
+With DATABASE_URL and DATABASE_READ_URL both SQLite files and
+LOCAL_REPLICA_SYNC_S > 0, the primary is copied onto the replica with
+SQLite's online backup API at startup and then every LOCAL_REPLICA_SYNC_S
+seconds, so reader-pool reads trail writes by up to that long, as they
+would behind streaming replication. Keep DATABASE_REPLICA_LAG_S at least
+as long, or read-your-writes routing gives up before the copy lands.
+
+Development and tests only: every worker runs its own copy loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from sqlalchemy.engine import make_url
+
+from .database import DATABASE_READ_URL, DATABASE_URL, REPLICA_LAG_S
+
+logger = logging.getLogger(__name__)
+
+LOCAL_REPLICA_SYNC_S = float(os.getenv("LOCAL_REPLICA_SYNC_S", "0"))
+if LOCAL_REPLICA_SYNC_S < 0:
+    raise ValueError(f"LOCAL_REPLICA_SYNC_S must be >= 0, got {LOCAL_REPLICA_SYNC_S}")
+
+
+def _sqlite_file(url: str) -> str | None:
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite" or parsed.database in (None, "", ":memory:"):
+        return None
+    return parsed.database
+
+
+class LocalReplica:
+    def __init__(self, primary: str | None, replica: str | None, interval_s: float):
+        self.primary = primary
+        self.replica = replica
+        self.interval_s = interval_s
+        self.syncs = 0
+        self.last_sync_at: float | None = None  # time.time()
+        self.last_sync_s: float | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.interval_s and self.primary and self.replica and self.primary != self.replica)
+
+    def sync(self) -> None:
+        """Copy the primary onto the replica (blocking; readers of the replica wait for the copy)."""
+        started = time.perf_counter()
+        src = sqlite3.connect(self.primary)
+        dst = sqlite3.connect(self.replica, timeout=30)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
+        self.syncs += 1
+        self.last_sync_at = time.time()
+        self.last_sync_s = round(time.perf_counter() - started, 4)
+
+    async def start(self) -> "LocalReplica":
+        """Initial copy (the replica starts with the schema and data), then the periodic loop."""
+        if REPLICA_LAG_S < self.interval_s:
+            logger.warning(
+                "DATABASE_REPLICA_LAG_S (%.1fs) < LOCAL_REPLICA_SYNC_S (%.1fs): reads may miss recent writes",
+                REPLICA_LAG_S, self.interval_s,
+            )
+        await asyncio.to_thread(self.sync)
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Local replica %s ← %s every %.1fs", self.replica, self.primary, self.interval_s)
+        return self
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception:
+                logger.exception("Local replica sync failed")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval_s": self.interval_s,
+            "syncs": self.syncs,
+            "last_sync_age_s": round(time.time() - self.last_sync_at, 2) if self.last_sync_at else None,
+            "last_sync_s": self.last_sync_s,
+        }
+
+
+local_replica = LocalReplica(_sqlite_file(DATABASE_URL), _sqlite_file(DATABASE_READ_URL), LOCAL_REPLICA_SYNC_S)
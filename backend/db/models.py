@@ -3,9 +3,9 @@ SQLAlchemy ORM models.
 """
 
 import uuid
-from datetime import datetime, timezone
-from sqlalchemy import String, Float, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import Mapped, mapped_column
+from datetime import date, datetime, timezone
+from sqlalchemy import String, Float, Integer, Text, Date, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
 
@@ -30,10 +30,13 @@ class User(Base):
     industry: Mapped[str] = mapped_column(String(64), nullable=True)
     source: Mapped[str] = mapped_column(String(16), nullable=False)            # salesforce | hubspot
     status: Mapped[str] = mapped_column(String(16), nullable=False)            # signed_up | not_engaged
-    signed_up_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
-    last_active: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    signed_up_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    last_active: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    fit_score: Mapped[float | None] = mapped_column(Float, nullable=True, index=True)  # ICP fit 0–1; NULL = not scored yet
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
 
+    __table_args__ = (Index("ix_users_status_fit_score", "status", "fit_score"),)  # top-k leads
+
 
 class Brief(Base):
     __tablename__ = "briefs"
@@ -43,8 +46,108 @@ class Brief(Base):
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     confidence_score: Mapped[float] = mapped_column(Float, default=0.0)
     agent_outputs: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    stats_snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)  # _load_stats() at generation
+    data_version: Mapped[int | None] = mapped_column(Integer, nullable=True)  # DataVersion.version it reflects
+    scope: Mapped[str | None] = mapped_column(String(160), nullable=True, index=True)  # "industry=SaaS"; NULL = all users
     feedback: Mapped[str | None] = mapped_column(Text, nullable=True)
     parent_brief_id: Mapped[str | None] = mapped_column(
         String(36), ForeignKey("briefs.id"), nullable=True
     )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+
+
+class Interview(Base):
+    __tablename__ = "interviews"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    participant: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    role: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    company_type: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    date: Mapped[str | None] = mapped_column(String(16), nullable=True)          # YYYY-MM-DD
+    duration: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    video_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    focus: Mapped[str | None] = mapped_column(Text, nullable=True)
+    transcript: Mapped[str] = mapped_column(Text, nullable=False)
+    friction_text: Mapped[str] = mapped_column(Text, default="")               # denormalized for full-text search
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+
+    insights: Mapped[list["InterviewInsight"]] = relationship(
+        back_populates="interview", cascade="all, delete-orphan", order_by="InterviewInsight.position"
+    )
+    questions: Mapped[list["InterviewQuestion"]] = relationship(
+        back_populates="interview", cascade="all, delete-orphan", order_by="InterviewQuestion.position"
+    )
+
+
+class InterviewInsight(Base):
+    __tablename__ = "interview_insights"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    interview_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("interviews.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    type: Mapped[str] = mapped_column(String(16), nullable=False)             # friction | bottom_line
+    area: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    action: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    interview: Mapped[Interview] = relationship(back_populates="insights")
+
+
+class InterviewQuestion(Base):
+    __tablename__ = "interview_questions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    interview_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("interviews.id", ondelete="CASCADE"), index=True, nullable=False
+    )
+    position: Mapped[int] = mapped_column(Integer, default=0)
+    question: Mapped[str] = mapped_column(Text, nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+
+    interview: Mapped[Interview] = relationship(back_populates="questions")
+
+
+class EngagementDaily(Base):
+    """Per-day rollup of signups and last-activity counts (see services.engagement_service)."""
+    __tablename__ = "engagement_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    signups: Mapped[int] = mapped_column(Integer, default=0)
+    active: Mapped[int] = mapped_column(Integer, default=0)                   # users whose last_active is this day
+
+
+class EngagementDirtyDay(Base):
+    """Days whose rollup must be recomputed — written on every User flush."""
+    __tablename__ = "engagement_dirty_days"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+
+
+class DataVersion(Base):
+    """Single row (id=1), bumped by every transaction that changes users or interviews."""
+    __tablename__ = "data_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
+    interviews_version: Mapped[int | None] = mapped_column(Integer, nullable=True)  # version of the last interview change
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+    # Brief pre-generation claim across workers: version being (or last) pre-generated, and when
+    pregen_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pregen_claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class FitModel(Base):
+    """Single row (id=1): the brief whose ICP the stored User.fit_score values come from."""
+    __tablename__ = "fit_model"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    brief_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    segments: Mapped[list | None] = mapped_column(JSON, nullable=True)      # [[weight, segment], …] scored against
+    users_scored: Mapped[int] = mapped_column(Integer, default=0)          # rows written by the last refresh
+    scored_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_now)
+    # Refresh claim across workers: token of the refresh in progress and its last heartbeat
+    refresh_claimed_by: Mapped[str | None] = mapped_column(String(36), nullable=True)
+    refresh_claimed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,35 +1,128 @@
 """
 APM System — FastAPI entrypoint.
 Single-service backend: API + multi-agent orchestration + SQLite.
+
+  python main.py         development: one worker, auto-reload
+  python main.py --prod  production: WEB_CONCURRENCY workers, no reload; schema
+                         check and data sync run once before the workers start
 """
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import importlib
+import logging
 import os
+import sys
+import tempfile
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 
 load_dotenv()  # noqa: E402 — must run before other imports reference env vars
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from db import init_db
-from routes import crm_router, metrics_router, briefs_router, interviews_router
+from core import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ORJSONResponse,
+    ProfilingMiddleware,
+    TracingMiddleware,
+    render_metrics,
+)
+from core import executor
+from core.loop_monitor import LOOP_MONITOR_ENABLED, loop_monitor
+from db import ReadYourWritesMiddleware, async_session, engine, init_db
+from db.local_replica import local_replica
+from routes import crm_router, metrics_router, briefs_router, interviews_router, ops_router, leads_router, exports_router
+from services.brief_scheduler import PREGEN_ENABLED, brief_scheduler
+from services.batch_service import batch_runner
+from services.engagement_service import backfill_engagement_rollups
+from services.interview_ranker import get_index as get_ranker_index
+from services.lead_service import lead_scorer
+from services.interview_service import (
+    get_friction_clusters,
+    refresh_db_corpus,
+    sync_bundled_interviews,
+    warm_interview_index,
+)
+
+logger = logging.getLogger(__name__)
+
+WARM_CACHES = os.getenv("WARM_CACHES", "1") not in ("0", "false", "False")
+
+# Set by the --prod parent once prepare_data() has run; workers inherit it and skip the step
+DATA_PREPARED_ENV = "APM_DATA_PREPARED"
+
+
+async def prepare_data() -> None:
+    """Schema check, bundled interview sync, rollup backfill — cheap once done."""
+    await init_db()
+    async with async_session() as db:
+        await sync_bundled_interviews(db)
+        await backfill_engagement_rollups(db)
+
+
+async def warm_caches() -> None:
+    """Pre-build in-memory caches so the first brief doesn't pay for them."""
+    await warm_interview_index()
+    async with async_session() as db:
+        await refresh_db_corpus(db)
+    await asyncio.to_thread(get_ranker_index)
+    await asyncio.to_thread(get_friction_clusters)
+    await asyncio.to_thread(importlib.import_module, "openai")  # deferred in agents.base
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: create tables if they don't exist."""
-    await init_db()
+    """Startup: schema check and data sync (unless the parent did it); cache warm-up runs in the background."""
+    started = time.perf_counter()
+    prepared_by_parent = os.getenv(DATA_PREPARED_ENV) == "1"
+    if not prepared_by_parent:
+        await prepare_data()
+    if local_replica.enabled:
+        await local_replica.start()
+    warmup = asyncio.create_task(warm_caches()) if WARM_CACHES else None
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    if PREGEN_ENABLED:
+        brief_scheduler.start()
+    lead_scorer.start()
+    app.state.startup = {
+        "import_s": round(started - _IMPORT_STARTED, 3),
+        "lifespan_s": round(time.perf_counter() - started, 3),
+        "warm_caches": WARM_CACHES,
+        "prepared_by_parent": prepared_by_parent,
+    }
+    logger.info("Startup: import %.2fs, lifespan %.2fs", app.state.startup["import_s"], app.state.startup["lifespan_s"])
     yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    await brief_scheduler.stop()
+    await batch_runner.stop()
+    await lead_scorer.stop()
+    await local_replica.stop()
+    loop_monitor.stop()
+    executor.shutdown()
 
 
 app = FastAPI(
     title="APM",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Last-write token so reads after a write stay on the writer on any worker; a no-op without a replica
+app.add_middleware(ReadYourWritesMiddleware)
+
+# brotli/gzip for large responses; SSE and @no_compression routes pass through
+app.add_middleware(CompressionMiddleware)
+
 # CORS — allow Vite dev server
 app.add_middleware(
     CORSMiddleware,
@@ -37,23 +130,56 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id", "X-Export-Id", "X-DB-Write-At", "Content-Disposition"],
 )
 
+# Opt-in per-request profiling (X-Profile: 1 + X-Admin-Token); a no-op unless configured
+app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so latency and the request span cover every other middleware
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
+
 # Health check
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
 
+# Prometheus scrape target — operational telemetry, unlike the business /api/metrics
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+
 # Mount routes
 app.include_router(crm_router, prefix="/api", tags=["CRM"])
 app.include_router(metrics_router, prefix="/api", tags=["Metrics"])
 app.include_router(briefs_router, prefix="/api", tags=["Briefs"])
 app.include_router(interviews_router, prefix="/api", tags=["Interviews"])
+app.include_router(ops_router, prefix="/api", tags=["Ops"])
+app.include_router(leads_router, prefix="/api", tags=["Leads"])
+app.include_router(exports_router, prefix="/api", tags=["Exports"])
+
+
+async def _prepare_once() -> None:
+    await prepare_data()
+    await engine.dispose()  # workers open their own connections
+    os.environ[DATA_PREPARED_ENV] = "1"
 
 
 if __name__ == "__main__":
     import uvicorn
 
     port = int(os.getenv("PORT", "8000"))
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    if "--prod" in sys.argv or os.getenv("APP_ENV") == "production":
+        workers = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+        if workers > 1:
+            # Each worker writes its samples here; /metrics aggregates them
+            os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="apm-metrics-"))
+        # Run DDL / data sync once here rather than racing in every worker
+        asyncio.run(_prepare_once())
+        uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers, reload=False, proxy_headers=True)
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
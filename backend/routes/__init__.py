@@ -2,5 +2,8 @@ from .crm import router as crm_router
 from .metrics import router as metrics_router
 from .briefs import router as briefs_router
 from .interviews import router as interviews_router
+from .ops import router as ops_router
+from .leads import router as leads_router
+from .exports import router as exports_router
 
-__all__ = ["crm_router", "metrics_router", "briefs_router", "interviews_router"]
+__all__ = ["crm_router", "metrics_router", "briefs_router", "interviews_router", "ops_router", "leads_router", "exports_router"]
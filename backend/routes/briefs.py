@@ -1,22 +1,36 @@
 """
-POST /generate-brief         — run multi-agent pipeline (batch).
+POST /generate-brief         — run multi-agent pipeline (batch); reuses the
+                               latest brief when the data has barely changed
+                               unless ?force=true.
 POST /generate-brief-stream  — run pipeline with SSE streaming.
 POST /feedback               — regenerate with user feedback.
-GET  /brief                  — latest brief.
+GET  /brief                  — latest brief, with the data version it reflects
+                               (kept current by services/brief_scheduler.py);
+                               ?scope=industry=SaaS for a segment brief.
+POST /batch-briefs           — one brief per segment through the batch
+                               backend (services/batch_service.py); 202.
+GET  /batch-briefs[/{id}]    — bulk run state, brief ids and stage report.
 GET  /users                  — list all users.
+
+The three generation routes go through admission control (core/admission.py)
+before a DB session is opened. GET routes read through db.read_db.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from core import ORJSONResponse, no_compression
+from core.admission import PRIORITY_BATCH, PRIORITY_INTERACTIVE, admit
+from db import get_db, read_db
+from services.batch_service import batch_runner
 from services.brief_service import (
     generate_brief,
     generate_brief_stream,
     regenerate_brief_with_feedback,
     get_latest_brief,
+    get_data_version,
     get_users,
 )
 
@@ -37,18 +51,25 @@ def _brief_to_dict(b) -> dict:
         "agent_outputs": b.agent_outputs,
         "feedback": b.feedback,
         "parent_brief_id": b.parent_brief_id,
+        "data_version": b.data_version,
+        "scope": b.scope,
         "created_at": b.created_at.isoformat() if b.created_at else None,
     }
 
 
 @router.post("/generate-brief")
-async def generate(db: AsyncSession = Depends(get_db)):
-    brief = await generate_brief(db)
-    return _brief_to_dict(brief)
+async def generate(
+    force: bool = Query(False, description="Regenerate even if the data has barely drifted"),
+    _slot=Depends(admit(PRIORITY_BATCH)),
+    db: AsyncSession = Depends(get_db),
+):
+    brief, reuse = await generate_brief(db, force=force)
+    return ORJSONResponse({**_brief_to_dict(brief), **reuse})
 
 
 @router.post("/generate-brief-stream")
-async def generate_stream(db: AsyncSession = Depends(get_db)):
+@no_compression
+async def generate_stream(_slot=Depends(admit(PRIORITY_INTERACTIVE)), db: AsyncSession = Depends(get_db)):
     """SSE endpoint — streams agent progress events then final brief."""
     return StreamingResponse(
         generate_brief_stream(db),
@@ -62,24 +83,62 @@ async def generate_stream(db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/feedback")
-async def feedback(body: FeedbackRequest, db: AsyncSession = Depends(get_db)):
+async def feedback(
+    body: FeedbackRequest,
+    _slot=Depends(admit(PRIORITY_INTERACTIVE)),
+    db: AsyncSession = Depends(get_db),
+):
     try:
         brief = await regenerate_brief_with_feedback(db, body.brief_id, body.feedback)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
-    return _brief_to_dict(brief)
+    return ORJSONResponse(_brief_to_dict(brief))
 
 
 @router.get("/brief")
-async def latest_brief(db: AsyncSession = Depends(get_db)):
-    brief = await get_latest_brief(db)
+async def latest_brief(
+    scope: str | None = Query(None, description="Segment brief from a batch run, e.g. industry=SaaS"),
+    db: AsyncSession = Depends(read_db("briefs", "data_version")),
+):
+    brief = await get_latest_brief(db, scope=scope)
     if not brief:
         raise HTTPException(status_code=404, detail="No brief generated yet")
-    return _brief_to_dict(brief)
+    current = await get_data_version(db)
+    return ORJSONResponse({
+        **_brief_to_dict(brief),
+        "current_data_version": current,
+        "stale": (brief.data_version or 0) < current,
+    })
+
+
+@router.post("/batch-briefs", status_code=202)
+async def start_batch_briefs(
+    dimension: str = Query(..., description="Split users by industry, company_size, role, source or company"),
+    include_overall: bool = Query(False, description="Also regenerate the all-users brief in the same batches"),
+    provider: str | None = Query(None, description="Batch provider (default BATCH_PROVIDER)"),
+):
+    try:
+        run = batch_runner.start(dimension, include_overall=include_overall, provider=provider)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse(run, status_code=202)
+
+
+@router.get("/batch-briefs")
+async def list_batch_briefs():
+    return ORJSONResponse({"runs": batch_runner.list()})
+
+
+@router.get("/batch-briefs/{run_id}")
+async def get_batch_briefs(run_id: str):
+    run = batch_runner.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Batch run {run_id} not found in this worker")
+    return ORJSONResponse(run)
 
 
 @router.get("/users")
-async def users_list(db: AsyncSession = Depends(get_db)):
+async def users_list(db: AsyncSession = Depends(read_db("users"))):
     """Return all users for the user list component."""
     users = await get_users(db)
-    return {"users": users, "count": len(users)}
+    return ORJSONResponse({"users": users, "count": len(users)})
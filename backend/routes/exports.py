@@ -0,0 +1,46 @@
+"""
+GET /export/{dataset}?format=csv|parquet — stream users, brief actions or
+                                           product recommendations as a file.
+
+Exports stream in keyset pages with bounded memory; the X-Export-Id
+response header identifies the run in /ops/exports.
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from db import read_session
+from db.models import Brief
+from services.export_service import DATASETS, FORMATS, export_tracker, parquet_available, stream_export
+
+router = APIRouter()
+
+
+@router.get("/export/{dataset}")
+async def export(
+    dataset: str = Path(..., pattern="^(" + "|".join(DATASETS) + ")$"),
+    fmt: str = Query("csv", alias="format", pattern="^(" + "|".join(FORMATS) + ")$"),
+    brief_id: str | None = Query(None, description="Actions of this brief only (brief datasets)"),
+):
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export needs pyarrow installed")
+    if brief_id is not None:
+        if dataset == "users":
+            raise HTTPException(status_code=400, detail="brief_id applies to brief datasets only")
+        async with read_session("briefs") as db:
+            if (await db.execute(select(Brief.id).where(Brief.id == brief_id))).scalar() is None:
+                raise HTTPException(status_code=404, detail=f"Brief {brief_id} not found")
+
+    run = export_tracker.begin(dataset, fmt, brief_id)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        stream_export(run),
+        media_type=FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{dataset}-{stamp}.{fmt}"',
+            "X-Export-Id": run["export_id"],
+        },
+    )
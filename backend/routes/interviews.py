@@ -1,16 +1,66 @@
 """
 GET  /interviews          — list all interviews with metadata + insights
+POST /interviews          — ingest a transcript into the DB corpus
+GET  /interviews/search   — ranked full-text search over the DB corpus
+GET  /interviews/friction-clusters — near-duplicate friction points, collapsed
 GET  /interviews/:id      — full interview with transcript
-GET  /engagement-data     — mock time-series engagement data
+GET  /engagement-data     — signup / activity time series + static funnel data
 """
 
-from fastapi import APIRouter, HTTPException
+from datetime import date
 
-from services.interview_service import get_all_interviews, get_interview
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db import get_db, read_db
+from services.engagement_service import GRANULARITIES, get_engagement_series
+from services.interview_service import (
+    SEARCH_MAX_PAGE_SIZE,
+    corpus_version,
+    get_all_interviews,
+    get_friction_clusters,
+    get_interview,
+    ingest_interview,
+    search_interviews,
+)
 
 router = APIRouter()
 
 
+class IngestInterviewRequest(BaseModel):
+    title: str
+    transcript: str
+    participant: str | None = None
+    role: str | None = None
+    company_type: str | None = None
+    date: str | None = None
+    duration: str | None = None
+    video_id: str | None = None
+    focus: str | None = None
+    id: int | None = None  # replace an existing interview
+
+
+def _stored_interview_to_dict(iv) -> dict:
+    return {
+        "id": iv.id,
+        "title": iv.title,
+        "participant": iv.participant,
+        "role": iv.role,
+        "company_type": iv.company_type,
+        "date": iv.date,
+        "duration": iv.duration,
+        "video_id": iv.video_id,
+        "focus": iv.focus,
+        "key_insights": [
+            {"type": i.type, "area": i.area, "description": i.description, "action": i.action}
+            for i in iv.insights
+        ],
+        "pm_questions": [{"question": q.question, "answer": q.answer} for q in iv.questions],
+        "created_at": iv.created_at.isoformat() if iv.created_at else None,
+    }
+
+
 @router.get("/interviews")
 async def list_interviews():
     """Return all interview metadata with key insights."""
@@ -18,6 +68,37 @@ async def list_interviews():
     return {"interviews": interviews, "count": len(interviews)}
 
 
+@router.post("/interviews", status_code=201)
+async def ingest(body: IngestInterviewRequest, db: AsyncSession = Depends(get_db)):
+    """Store a transcript and its extracted insights in the corpus."""
+    data = body.model_dump(exclude={"id"})
+    interview = await ingest_interview(db, data, interview_id=body.id)
+    return _stored_interview_to_dict(interview)
+
+
+@router.get("/interviews/search")
+async def search(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(read_db("interviews")),
+):
+    """Ranked, snippet-highlighted full-text search across ingested interviews."""
+    return await search_interviews(db, q, page=page, page_size=page_size)
+
+
+@router.get("/interviews/friction-clusters")
+async def friction_clusters():
+    """Friction points grouped into near-duplicate clusters across interviews."""
+    clusters = get_friction_clusters()
+    return {
+        "clusters": clusters,
+        "count": len(clusters),
+        "total_mentions": sum(c["mention_count"] for c in clusters),
+        "corpus_version": f"{hash(corpus_version()) & 0xFFFFFFFF:08x}",
+    }
+
+
 @router.get("/interviews/{interview_id}")
 async def interview_detail(interview_id: int):
     """Return full interview including transcript."""
@@ -28,31 +109,20 @@ async def interview_detail(interview_id: int):
 
 
 @router.get("/engagement-data")
-async def engagement_data():
-    """Return mock time-series engagement data for visualizations."""
-    import random
-    random.seed(42)
-
-    # Weekly engagement data for last 12 weeks
-    weeks = []
-    base_dau = 1800
-    base_wau = 5200
-    base_signups = 45
-    base_churn = 12
-
-    for i in range(12):
-        week_num = i + 1
-        noise = random.uniform(0.85, 1.15)
-        growth = 1 + (i * 0.02)
-        weeks.append({
-            "week": f"W{week_num}",
-            "week_label": f"Nov {5 + i * 7}" if i < 4 else (f"Dec {(i - 4) * 7 + 3}" if i < 8 else f"Jan {(i - 8) * 7 + 1}"),
-            "dau": int(base_dau * noise * growth),
-            "wau": int(base_wau * noise * growth),
-            "signups": int(base_signups * noise * growth),
-            "churn": int(base_churn * random.uniform(0.7, 1.3)),
-            "nps": round(random.uniform(32, 48), 1),
-        })
+async def engagement_data(
+    start: date | None = None,
+    end: date | None = None,
+    granularity: str = Query("week", pattern=f"^({'|'.join(GRANULARITIES)})$"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Signups / DAU / WAU per bucket from precomputed daily rollups
+    (default: last 12 weeks), plus static funnel and segment data.
+    """
+    try:
+        weeks = await get_engagement_series(db, start=start, end=end, granularity=granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
     # Funnel data
     funnel = [
@@ -84,6 +154,7 @@ async def engagement_data():
     ]
 
     return {
+        "granularity": granularity,
         "weekly_trends": weeks,
         "funnel": funnel,
         "feature_adoption": feature_adoption,
@@ -0,0 +1,48 @@
+"""
+GET /leads/top              — users ranked by ICP fit score, paginated.
+GET /leads/fit-distribution — high / medium / low fit counts from the stored scores.
+
+Both serve the stored scores as they are. When they lag the data (users
+without a score, or a newer brief than the one scored against) the
+response says `pending: true` and the background LeadScorer is asked for
+a refresh; the request never scores users itself.
+"""
+
+from fastapi import APIRouter, Query
+
+from db import read_session
+from services.lead_service import (
+    LEAD_STATUSES,
+    LEADS_MAX_PAGE_SIZE,
+    get_fit_distribution,
+    get_top_leads,
+    lead_scorer,
+)
+
+router = APIRouter()
+
+_STATUS_PATTERN = "^(" + "|".join(LEAD_STATUSES) + ")$"
+
+
+@router.get("/leads/top")
+async def top_leads(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=LEADS_MAX_PAGE_SIZE),
+    status: str = Query("not_engaged", pattern=_STATUS_PATTERN),
+):
+    async with read_session("users", "fit_model", "briefs") as db:
+        result = await get_top_leads(db, page=page, page_size=page_size, status=status)
+    if result["pending"]:
+        lead_scorer.request()
+    return result
+
+
+@router.get("/leads/fit-distribution")
+async def fit_distribution(
+    status: str | None = Query(None, pattern=_STATUS_PATTERN),
+):
+    async with read_session("users", "fit_model", "briefs") as db:
+        result = await get_fit_distribution(db, status=status)
+    if result["pending"]:
+        lead_scorer.request()
+    return result
@@ -0,0 +1,110 @@
+"""
+Operational endpoints — load and health of the service itself.
+GET /ops/admission  — brief-generation concurrency, queue depth, rejections.
+GET /ops/startup    — how long this worker took to import and start.
+GET /ops/loop-lag   — event-loop lag percentiles and recent stalls with call sites.
+GET /ops/pregen     — background brief pre-generation state and last run.
+GET /ops/routing    — model tiers, agent assignments, SLOs and rolling p95 latencies.
+GET /ops/exports    — recent /export runs: rows, bytes, rows/sec.
+GET /ops/db         — writer / reader pools, replica lag window, read-your-writes routing.
+GET /debug/traces   — recent request traces from the in-process span buffer (admin only).
+POST /debug/profile — sample every thread of this worker for N seconds (admin only).
+GET /debug/profiles — stored profiles; /debug/profiles/{name} returns one.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from agents.routing import router as model_router
+from core import profiling
+from core.admission import brief_admission
+from core.loop_monitor import loop_monitor
+from core.tracing import exporter
+from db import routing_stats as db_routing_stats
+from db.local_replica import local_replica
+from services.brief_scheduler import brief_scheduler
+from services.export_service import export_tracker
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    if not profiling.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not profiling.is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/ops/admission")
+async def admission_stats():
+    return brief_admission.stats()
+
+
+@router.get("/ops/startup")
+async def startup_stats(request: Request):
+    return getattr(request.app.state, "startup", {})
+
+
+@router.get("/ops/loop-lag")
+async def loop_lag(limit: int = Query(20, ge=1, le=100)):
+    return loop_monitor.stats(limit=limit)
+
+
+@router.get("/ops/pregen")
+async def pregen_stats():
+    return brief_scheduler.stats()
+
+
+@router.get("/ops/routing")
+async def routing_stats():
+    return model_router.stats()
+
+
+@router.get("/ops/exports")
+async def export_stats():
+    return export_tracker.stats()
+
+
+@router.get("/ops/db")
+async def db_stats():
+    return {**db_routing_stats(), "local_replica": local_replica.stats()}
+
+
+@router.get("/debug/traces", dependencies=[Depends(require_admin)])
+async def recent_traces(
+    limit: int = Query(20, ge=1, le=200),
+    trace_id: str | None = Query(None, description="Return only this trace (see the X-Trace-Id header)"),
+):
+    return {"traces": exporter.traces(limit=limit, trace_id=trace_id)}
+
+
+@router.post("/debug/profile", dependencies=[Depends(require_admin)])
+async def profile_process(
+    seconds: float = Query(10.0, gt=0, le=profiling.MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(profiling.PROFILE_INTERVAL_MS, ge=1, le=1000),
+):
+    """Sample every thread (event loop, executor pool, helpers) for `seconds` and store collapsed stacks."""
+    profiler = profiling.SamplingProfiler(interval_ms=interval_ms, all_threads=True).start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    path = profiler.write(profiling.profile_path("process"))
+    return {"file": path.name, **profiler.summary()}
+
+
+@router.get("/debug/profiles", dependencies=[Depends(require_admin)])
+async def stored_profiles():
+    return {"profiles": profiling.list_profiles()}
+
+
+@router.get("/debug/profiles/{name}", dependencies=[Depends(require_admin)])
+async def stored_profile(name: str):
+    try:
+        return PlainTextResponse(profiling.read_profile(name))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
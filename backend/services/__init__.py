@@ -3,6 +3,7 @@ from .brief_service import (
     generate_brief_stream,
     regenerate_brief_with_feedback,
     get_latest_brief,
+    get_data_version,
     get_metrics,
     get_users,
 )
@@ -12,6 +13,7 @@ __all__ = [
     "generate_brief_stream",
     "regenerate_brief_with_feedback",
     "get_latest_brief",
+    "get_data_version",
     "get_metrics",
     "get_users",
 ]
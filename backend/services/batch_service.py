@@ -0,0 +1,182 @@
+"""
+Bulk brief runs — one brief per segment, generated through the batch backend.
+
+start() launches a run in the background and returns immediately; the run
+loads the users, splits them by a dimension (industry, role, …), runs
+agents/batch.orchestrate_batch() over all segments and stores one Brief per
+segment with scope "<dimension>=<value>". With include_overall, a brief
+over all users (scope NULL, i.e. the regular latest brief) is added to the
+same batches.
+
+No DB session or admission slot is held while the provider works — a real
+batch can take hours. Run state is per worker (the 202 response names the
+worker_pid; with several workers, poll until the segment briefs appear
+under GET /api/brief?scope=... instead) and kept for the last
+BATCH_RUNS_KEPT runs; the JSONL files stay under BATCH_DIR.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from agents.batch import new_run_id, orchestrate_batch
+from agents.batch_providers import get_provider
+from agents.map_reduce import SHARD_DIMENSIONS, shard_users
+from db import async_session, mark_written, read_session
+from db.models import Brief
+from services.brief_service import _load_stats, _load_users, get_data_version
+from services.interview_ranker import select_interview_context
+from services.interview_service import refresh_db_corpus
+from services.lead_service import lead_scorer
+
+logger = logging.getLogger(__name__)
+
+BATCH_RUNS_KEPT = int(os.getenv("BATCH_RUNS_KEPT", "20"))
+BATCH_MAX_SEGMENTS = int(os.getenv("BATCH_MAX_SEGMENTS", "50"))
+
+
+def _segment_stats(users: list[dict]) -> dict:
+    """_load_stats() shape, computed over one segment's users."""
+
+    def group(key: str) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for u in users:
+            counts[u.get(key)] = counts.get(u.get(key), 0) + 1
+        return counts
+
+    return {
+        "total": len(users),
+        "signed_up": sum(1 for u in users if u.get("status") == "signed_up"),
+        "not_engaged": sum(1 for u in users if u.get("status") == "not_engaged"),
+        "by_source": group("source"),
+        "by_company_size": group("company_size"),
+        "by_role": group("role"),
+        "by_industry": group("industry"),
+    }
+
+
+async def load_segment_inputs(scope: str) -> tuple[int, dict, list[dict]]:
+    """(data_version, stats, users) for one segment scope ("industry=SaaS"), split as a batch run splits it."""
+    dimension, _, key = scope.partition("=")
+    if dimension not in SHARD_DIMENSIONS or not key:
+        raise ValueError(f"Unknown brief scope {scope!r}")
+    async with read_session("users", "interviews") as db:
+        data_version = await get_data_version(db)
+        users = await _load_users(db)
+        await refresh_db_corpus(db)
+    members = shard_users(users, dimension, max_shards=BATCH_MAX_SEGMENTS).get(key)
+    if not members:
+        raise ValueError(f"Segment {scope!r} has no users")
+    return data_version, _segment_stats(members), members
+
+
+class BatchRunner:
+    def __init__(self):
+        self.runs: dict[str, dict] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def start(self, dimension: str, include_overall: bool = False, provider: str | None = None) -> dict:
+        """Validate, register and launch a run; returns its initial state."""
+        if dimension not in SHARD_DIMENSIONS:
+            raise ValueError(f"Cannot split briefs by {dimension!r}; expected one of {SHARD_DIMENSIONS}")
+        batch_provider = get_provider(provider)
+        run_id = new_run_id()
+        run = {
+            "run_id": run_id,
+            "state": "running",
+            "dimension": dimension,
+            "include_overall": include_overall,
+            "provider": batch_provider.name,
+            # Run state lives in this worker's memory; other workers 404 on it
+            "worker_pid": os.getpid(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "finished_at": None,
+            "briefs": {},
+            "report": None,
+            "error": None,
+        }
+        self.runs[run_id] = run
+        while len(self.runs) > BATCH_RUNS_KEPT:
+            oldest = next(iter(self.runs))
+            if self.runs[oldest]["state"] == "running":
+                break
+            del self.runs[oldest]
+        self._tasks[run_id] = asyncio.create_task(self._run(run, batch_provider))
+        return run
+
+    async def _run(self, run: dict, provider) -> None:
+        started = time.monotonic()
+        try:
+            async with read_session("users", "interviews") as db:
+                data_version = await get_data_version(db)
+                users = await _load_users(db)
+                overall_stats = await _load_stats(db) if run["include_overall"] else None
+                await refresh_db_corpus(db)
+
+            segments = shard_users(users, run["dimension"], max_shards=BATCH_MAX_SEGMENTS)
+            jobs = [
+                {"key": f"{run['dimension']}={key}", "users": members, "stats": _segment_stats(members)}
+                for key, members in segments.items()
+            ]
+            if run["include_overall"]:
+                jobs.append({"key": None, "users": users, "stats": overall_stats})
+            run["jobs"] = len(jobs)
+
+            results, report = await orchestrate_batch(
+                jobs, provider, interview_context_builder=select_interview_context, run_id=run["run_id"]
+            )
+
+            async with async_session() as db:
+                briefs = []
+                for job, result in zip(jobs, results):
+                    result["agent_outputs"]["batch_run"] = run["run_id"]
+                    briefs.append(Brief(
+                        content=result["brief"],
+                        summary=result["brief"].get("executive_summary", ""),
+                        confidence_score=result["confidence_score"],
+                        agent_outputs=result["agent_outputs"],
+                        stats_snapshot=job["stats"],
+                        data_version=data_version,
+                        scope=job["key"],
+                    ))
+                db.add_all(briefs)
+                await db.commit()
+            mark_written("briefs")
+            if run["include_overall"]:
+                lead_scorer.request()
+            run["briefs"] = {b.scope or "all": b.id for b in briefs}
+            run["report"] = report
+            run["state"] = "completed"
+        except asyncio.CancelledError:
+            run["state"] = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Batch run %s failed", run["run_id"])
+            run["state"], run["error"] = "failed", str(e)
+        finally:
+            run["finished_at"] = datetime.now(timezone.utc).isoformat()
+            run["elapsed_s"] = round(time.monotonic() - started, 2)
+            self._tasks.pop(run["run_id"], None)
+
+    def get(self, run_id: str) -> dict | None:
+        return self.runs.get(run_id)
+
+    def list(self) -> list[dict]:
+        return [
+            {k: v for k, v in run.items() if k not in ("briefs", "report")}
+            for run in reversed(self.runs.values())
+        ]
+
+    async def stop(self) -> None:
+        """Cancel runs in progress (their batch files stay in BATCH_DIR)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+batch_runner = BatchRunner()
@@ -0,0 +1,265 @@
+"""
+Brief pre-generation — regenerates the brief in the background after data changes.
+
+Commits that change users or interviews bump data_version and signal the
+scheduler (db/events.py). Signals are debounced: a run starts once no new
+signal has arrived for BRIEF_PREGEN_DEBOUNCE_S, or BRIEF_PREGEN_MAX_DELAY_S
+after the first one if changes keep arriving. No run starts inside the
+quiet-hours window; pending work waits for it to end.
+
+A run takes a brief-generation slot at background priority, so it counts
+against BRIEF_MAX_CONCURRENCY and yields to user requests. It is skipped
+when the latest brief already reflects the current data version, and
+otherwise goes through generate_brief (so a low-drift change reuses the
+existing brief). At most one run is in flight per worker.
+
+Every worker runs a scheduler and every one of them is signalled by its
+own commits, so before generating a run claims the data version in the
+data_version row (UPDATE … WHERE pregen_version < :v): one worker
+generates, the others record "claimed_elsewhere". A claim older than
+BRIEF_PREGEN_CLAIM_TTL_S (a worker that died mid-run) can be taken over.
+A run that fails releases its claim and is retried after
+BRIEF_PREGEN_RETRY_S, doubling per consecutive failure up to an hour.
+
+Pre-generation is off by default when OPENAI_API_KEY is not set, since
+every run would only store an error brief.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from core.admission import PRIORITY_BACKGROUND, AdmissionRejected, brief_admission
+from db import async_session, engine, on_data_change
+from db.models import DataVersion
+from services.brief_service import generate_brief, get_data_version, get_latest_brief, get_metrics
+
+logger = logging.getLogger(__name__)
+
+PREGEN_ENABLED = os.getenv(
+    "BRIEF_PREGEN_ENABLED", "1" if os.getenv("OPENAI_API_KEY") else "0"
+) not in ("0", "false", "False")
+PREGEN_CLAIM_TTL_S = float(os.getenv("BRIEF_PREGEN_CLAIM_TTL_S", "900"))
+PREGEN_DEBOUNCE_S = float(os.getenv("BRIEF_PREGEN_DEBOUNCE_S", "30"))
+PREGEN_MAX_DELAY_S = float(os.getenv("BRIEF_PREGEN_MAX_DELAY_S", "300"))
+PREGEN_QUIET_HOURS = os.getenv("BRIEF_PREGEN_QUIET_HOURS", "")  # e.g. "22-6", UTC
+PREGEN_RETRY_S = float(os.getenv("BRIEF_PREGEN_RETRY_S", "60"))
+PREGEN_RETRY_MAX_S = 3600.0
+
+
+async def claim_version(version: int, ttl_s: float = PREGEN_CLAIM_TTL_S) -> datetime | None:
+    """
+    Atomically claim pre-generation of `version` for this worker. Returns
+    the claim time (pass it to release_claim) or None if another worker
+    holds the claim.
+    """
+    table = DataVersion.__table__
+    now = datetime.now(timezone.utc)
+    async with engine.begin() as conn:
+        # No row yet on a database that has users but predates data versioning
+        insert = pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+        await conn.execute(
+            insert(table).values(id=1, version=0, changed_at=now).on_conflict_do_nothing(index_elements=["id"])
+        )
+        result = await conn.execute(
+            table.update()
+            .where(
+                table.c.id == 1,
+                or_(
+                    table.c.pregen_version.is_(None),
+                    table.c.pregen_version < version,
+                    table.c.pregen_claimed_at < now - timedelta(seconds=ttl_s),
+                ),
+            )
+            .values(pregen_version=version, pregen_claimed_at=now)
+        )
+    return now if result.rowcount == 1 else None
+
+
+async def release_claim(version: int, claimed_at: datetime) -> None:
+    """Drop this worker's claim on `version` so a retry (here or in another worker) can take it."""
+    table = DataVersion.__table__
+    async with engine.begin() as conn:
+        await conn.execute(
+            table.update()
+            .where(table.c.id == 1, table.c.pregen_version == version, table.c.pregen_claimed_at == claimed_at)
+            .values(pregen_version=None, pregen_claimed_at=None)
+        )
+
+
+def parse_quiet_hours(spec: str) -> tuple[int, int] | None:
+    """'22-6' → (22, 6): quiet from 22:00 to 06:00 UTC. Empty → no window."""
+    if not spec.strip():
+        return None
+    start, end = (int(h) % 24 for h in spec.split("-", 1))
+    return None if start == end else (start, end)
+
+
+def seconds_until_quiet_end(now: datetime, window: tuple[int, int] | None) -> float:
+    """0 outside the window, else seconds until it ends."""
+    if window is None:
+        return 0.0
+    start, end = window
+    h = now.hour
+    inside = start <= h < end if start < end else (h >= start or h < end)
+    if not inside:
+        return 0.0
+    ends = now.replace(hour=end, minute=0, second=0, microsecond=0)
+    if ends <= now:
+        ends += timedelta(days=1)
+    return (ends - now).total_seconds()
+
+
+class BriefScheduler:
+    def __init__(
+        self,
+        debounce_s: float = PREGEN_DEBOUNCE_S,
+        max_delay_s: float = PREGEN_MAX_DELAY_S,
+        quiet_hours: tuple[int, int] | None = parse_quiet_hours(PREGEN_QUIET_HOURS),
+    ):
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self.quiet_hours = quiet_hours
+        self.state = "stopped"
+        self.signals = 0
+        self.runs: dict[str, int] = {
+            "generated": 0, "reused": 0, "up_to_date": 0, "no_users": 0, "claimed_elsewhere": 0, "failed": 0,
+        }
+        self.last_run: dict | None = None
+        self._failures = 0  # consecutive failed runs, for the retry backoff
+        self._first_signal: float | None = None
+        self._last_signal = 0.0
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._subscribed = False
+
+    def notify(self) -> None:
+        """Data changed; called after commit on the event-loop thread."""
+        now = time.monotonic()
+        self.signals += 1
+        if self._first_signal is None:
+            self._first_signal = now
+        self._last_signal = now
+        self._wake.set()
+
+    def start(self) -> "BriefScheduler":
+        if not self._subscribed:
+            on_data_change(self.notify)
+            self._subscribed = True
+        self._task = asyncio.create_task(self._loop())
+        self.state = "idle"
+        self.notify()  # catch up on changes made while no worker was running
+        return self
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.state = "stopped"
+
+    async def _loop(self) -> None:
+        while True:
+            self.state = "idle"
+            await self._wake.wait()
+            self._wake.clear()
+
+            # Debounce: wait for a quiet gap, but no longer than max_delay overall
+            while True:
+                due = min(self._last_signal + self.debounce_s, self._first_signal + self.max_delay_s)
+                remaining = due - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.state = "debouncing"
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=remaining)
+                    self._wake.clear()
+                except asyncio.TimeoutError:
+                    pass
+
+            while (wait := seconds_until_quiet_end(datetime.now(timezone.utc), self.quiet_hours)) > 0:
+                self.state = "quiet_hours"
+                await asyncio.sleep(wait)
+
+            self._first_signal = None
+            retry_after = await self._run_once()
+            if retry_after is not None:
+                self.state = "backing_off"
+                await asyncio.sleep(retry_after)
+                self.notify()
+
+    async def _run_once(self) -> float | None:
+        """One pre-generation attempt; returns a delay to retry after, if rejected or failed."""
+        started = time.monotonic()
+        outcome, detail, retry_after = "failed", None, None
+        version = claimed_at = None
+        try:
+            self.state = "waiting_for_slot"
+            async with brief_admission.slot(PRIORITY_BACKGROUND):
+                self.state = "generating"
+                async with async_session() as db:
+                    version = await get_data_version(db)
+                    latest = await get_latest_brief(db)
+                    if latest is not None and (latest.data_version or 0) >= version:
+                        outcome = "up_to_date"
+                    elif not (await get_metrics(db))["total"]:
+                        outcome = "no_users"
+                    elif (claimed_at := await claim_version(version)) is None:
+                        outcome = "claimed_elsewhere"
+                    else:
+                        brief, reuse = await generate_brief(db)
+                        outcome = "reused" if reuse["reused"] else "generated"
+                        detail = {"brief_id": brief.id, "data_version": version}
+        except AdmissionRejected as e:
+            logger.info("Brief pre-generation deferred (%s), retrying in %ds", e.reason, e.retry_after)
+            return e.retry_after
+        except Exception as e:
+            self._failures += 1
+            retry_after = min(PREGEN_RETRY_S * 2 ** (self._failures - 1), PREGEN_RETRY_MAX_S)
+            logger.exception("Brief pre-generation failed, retrying in %.0fs", retry_after)
+            detail = {"error": str(e), "retry_in_s": retry_after}
+            if claimed_at is not None:
+                try:
+                    await release_claim(version, claimed_at)
+                except Exception:
+                    logger.exception("Releasing the pre-generation claim failed")  # the TTL frees it
+        else:
+            self._failures = 0
+        self.runs[outcome] += 1
+        self.last_run = {
+            "outcome": outcome,
+            "at": datetime.now(timezone.utc).isoformat(),
+            "elapsed_s": round(time.monotonic() - started, 2),
+            **(detail or {}),
+        }
+        if outcome in ("generated", "reused"):
+            logger.info("Brief pre-generation: %s", self.last_run)
+        return retry_after
+
+    def stats(self) -> dict:
+        return {
+            "enabled": PREGEN_ENABLED,
+            "state": self.state,
+            "pending": self._first_signal is not None,
+            "signals": self.signals,
+            "debounce_s": self.debounce_s,
+            "max_delay_s": self.max_delay_s,
+            "claim_ttl_s": PREGEN_CLAIM_TTL_S,
+            "quiet_hours_utc": f"{self.quiet_hours[0]}-{self.quiet_hours[1]}" if self.quiet_hours else None,
+            "runs": dict(self.runs),
+            "last_run": self.last_run,
+        }
+
+
+brief_scheduler = BriefScheduler()
@@ -1,22 +1,36 @@
 """
 Brief service — handles orchestration calls and DB persistence.
+
+The users, stats and data_version a run starts from are read together on
+the reader pool (db.read_session); the latest-brief lookup and the insert
+use the caller's writer session.
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import os
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from db.models import User, Brief
+from core.executor import run_in_thread
+from core.serialization import sse_event
+from db import mark_written, read_session
+from db.models import DataVersion, User, Brief
 from agents.orchestrator import orchestrate, orchestrate_stream
-from services.interview_service import get_interview_context_for_agents
+from services.interview_ranker import select_interview_context
+from services.interview_service import refresh_db_corpus
+from services.lead_service import lead_scorer
+from services.stats_drift import stats_drift
 
 logger = logging.getLogger(__name__)
 
+# generate_brief returns the latest brief instead of re-running the agents
+# when stats drift from its snapshot is below this (0 disables reuse)
+BRIEF_REUSE_MAX_DRIFT = float(os.getenv("BRIEF_REUSE_MAX_DRIFT", "0.02"))
+
 
 async def _load_users(db: AsyncSession) -> list[dict]:
     """Load all users as plain dicts for agent context."""
@@ -73,97 +87,169 @@ async def _load_stats(db: AsyncSession) -> dict:
     }
 
 
-async def generate_brief(db: AsyncSession) -> Brief:
-    """Run the full multi-agent pipeline and persist the brief."""
-    users = await _load_users(db)
-    stats = await _load_stats(db)
-    interview_context = get_interview_context_for_agents()
+async def get_data_version(db: AsyncSession) -> int:
+    """Current DataVersion.version (0 before the first data change)."""
+    return (await db.execute(select(DataVersion.version).where(DataVersion.id == 1))).scalar() or 0
 
-    result = await orchestrate(users=users, stats=stats, interview_context=interview_context)
 
-    brief = Brief(
-        content=result["brief"],
-        summary=result["brief"].get("executive_summary", ""),
-        confidence_score=result["confidence_score"],
-        agent_outputs=result["agent_outputs"],
-    )
+async def _load_inputs() -> tuple[int, dict, list[dict]]:
+    """
+    (data_version, stats, users) for a run, from one read session so they
+    describe the same data. Also brings the ranker's DB-only interviews up
+    to date.
+    """
+    async with read_session("users", "interviews") as rdb:
+        await refresh_db_corpus(rdb)
+        return await get_data_version(rdb), await _load_stats(rdb), await _load_users(rdb)
+
+
+async def _store(db: AsyncSession, brief: Brief) -> Brief:
     db.add(brief)
     await db.commit()
+    mark_written("briefs")
     await db.refresh(brief)
+    if brief.scope is None:
+        lead_scorer.request()  # rescore users against the new ICP
     return brief
 
 
-async def generate_brief_stream(db: AsyncSession) -> AsyncGenerator[str, None]:
+async def generate_brief(db: AsyncSession, force: bool = False) -> tuple[Brief, dict]:
+    """
+    Run the full multi-agent pipeline and persist the brief.
+
+    Unless `force`, the latest brief is returned as-is when the current
+    stats have drifted less than BRIEF_REUSE_MAX_DRIFT from its snapshot
+    and the interview corpus has not changed since it was generated; its
+    data_version then moves up to the version it was checked against, so
+    it is no longer reported stale. stats_snapshot stays, so drift keeps
+    accumulating against the data the brief was actually generated from.
+    Also returns {"reused": bool, "drift": stats_drift(...) or None}.
+    """
+    async with read_session("users", "interviews") as rdb:
+        data_version = await get_data_version(rdb)
+        stats = await _load_stats(rdb)
+        drift = None
+        latest = await get_latest_brief(db)
+        if latest is not None and latest.stats_snapshot:
+            drift = stats_drift(stats, latest.stats_snapshot)
+            interviews_version = (
+                await rdb.execute(select(DataVersion.interviews_version).where(DataVersion.id == 1))
+            ).scalar() or 0
+            drift["interviews_changed"] = interviews_version > (latest.data_version or 0)
+            if not force and not drift["interviews_changed"] and drift["score"] < BRIEF_REUSE_MAX_DRIFT:
+                logger.info("Reusing brief %s (drift %.4f)", latest.id, drift["score"])
+                if (latest.data_version or 0) < data_version:
+                    # Checked against this version and still current: no longer stale
+                    latest.data_version = data_version
+                    await db.commit()
+                    mark_written("briefs")
+                return latest, {"reused": True, "drift": drift}
+
+        users = await _load_users(rdb)
+        await refresh_db_corpus(rdb)
+
+    result = await orchestrate(
+        users=users, stats=stats, interview_context_builder=select_interview_context, data_version=data_version
+    )
+
+    brief = await _store(db, Brief(
+        content=result["brief"],
+        summary=result["brief"].get("executive_summary", ""),
+        confidence_score=result["confidence_score"],
+        agent_outputs=result["agent_outputs"],
+        stats_snapshot=stats,
+        data_version=data_version,
+    ))
+    return brief, {"reused": False, "drift": drift}
+
+
+async def generate_brief_stream(db: AsyncSession) -> AsyncGenerator[bytes, None]:
     """
     Stream SSE events during brief generation.
     Yields newline-delimited JSON events for each agent phase.
     Persists the final brief to DB.
     """
-    users = await _load_users(db)
-    stats = await _load_stats(db)
-    interview_context = get_interview_context_for_agents()
+    data_version, stats, users = await _load_inputs()
 
     final_result = None
 
-    async for event in orchestrate_stream(users=users, stats=stats, interview_context=interview_context):
+    async for event in orchestrate_stream(
+        users=users, stats=stats, interview_context_builder=select_interview_context, data_version=data_version
+    ):
         event_type = event.get("event", "info")
 
         if event_type == "complete":
             # Persist the brief
             final_result = event
-            brief = Brief(
+            brief = await _store(db, Brief(
                 content=event["brief"],
                 summary=event["brief"].get("executive_summary", ""),
                 confidence_score=event["confidence_score"],
                 agent_outputs=event["agent_outputs"],
-            )
-            db.add(brief)
-            await db.commit()
-            await db.refresh(brief)
+                stats_snapshot=stats,
+                data_version=data_version,
+            ))
 
             # Send complete event with brief ID
             event["brief_id"] = brief.id
             event["created_at"] = brief.created_at.isoformat() if brief.created_at else None
 
-        yield f"event: {event_type}\ndata: {json.dumps(event, default=str)}\n\n"
+            # The only large frame: full brief plus every agent's output
+            yield await run_in_thread(sse_event, event_type, event)
+            continue
+
+        yield sse_event(event_type, event)
 
 
 async def regenerate_brief_with_feedback(
     db: AsyncSession, brief_id: str, feedback: str
 ) -> Brief:
-    """Re-run agents with user feedback and link to parent brief."""
+    """
+    Re-run agents with user feedback and link to parent brief.
+
+    A segment brief from a batch run is regenerated over that segment's
+    current users and keeps its scope.
+    """
     parent = (
         await db.execute(select(Brief).where(Brief.id == brief_id))
     ).scalar_one_or_none()
     if not parent:
         raise ValueError(f"Brief {brief_id} not found")
 
-    users = await _load_users(db)
-    stats = await _load_stats(db)
+    if parent.scope:
+        # Deferred: batch_service imports this module
+        from services.batch_service import load_segment_inputs
+
+        data_version, stats, users = await load_segment_inputs(parent.scope)
+    else:
+        data_version, stats, users = await _load_inputs()
 
     result = await orchestrate(
         users=users,
         stats=stats,
         previous_brief=parent.content,
         feedback=feedback,
+        interview_context_builder=select_interview_context,
+        data_version=data_version,
     )
 
-    new_brief = Brief(
+    return await _store(db, Brief(
         content=result["brief"],
         summary=result["brief"].get("executive_summary", ""),
         confidence_score=result["confidence_score"],
         agent_outputs=result["agent_outputs"],
+        stats_snapshot=stats,
+        data_version=data_version,
         feedback=feedback,
         parent_brief_id=brief_id,
-    )
-    db.add(new_brief)
-    await db.commit()
-    await db.refresh(new_brief)
-    return new_brief
+        scope=parent.scope,
+    ))
 
 
-async def get_latest_brief(db: AsyncSession) -> Brief | None:
-    result = await db.execute(select(Brief).order_by(Brief.created_at.desc()).limit(1))
+async def get_latest_brief(db: AsyncSession, scope: str | None = None) -> Brief | None:
+    """Latest brief over all users, or over one segment (scope "industry=SaaS") from a batch run."""
+    match = Brief.scope.is_(None) if scope is None else Brief.scope == scope
+    result = await db.execute(select(Brief).where(match).order_by(Brief.created_at.desc()).limit(1))
     return result.scalar_one_or_none()
 
 
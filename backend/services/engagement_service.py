@@ -0,0 +1,197 @@
+"""
+Engagement service — signup / activity time series from real user data.
+
+Counts live in a per-day rollup table (engagement_daily). User writes mark
+the affected days dirty (db/events.py); a refresh recomputes only those days
+with indexed range scans on signed_up_at / last_active. Series at any
+granularity are then summed from the daily rows for the requested range.
+
+A refresh claims the dirty days with DELETE … RETURNING and upserts their
+rollups in the same transaction, so refreshes in several workers never
+recompute a day twice or collide on engagement_daily keys.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import Date, cast, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import EngagementDaily, EngagementDirtyDay, User
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ("day", "week", "month")
+DEFAULT_WEEKS = 12
+
+
+def _day_expr(col, dialect: str):
+    """SQL expression bucketing a UTC timestamp column to its calendar day."""
+    if dialect == "postgresql":
+        return cast(func.timezone("UTC", col), Date)
+    return func.date(col)
+
+
+def _as_date(v) -> date:
+    if isinstance(v, datetime):
+        return v.date()
+    return v if isinstance(v, date) else date.fromisoformat(str(v)[:10])
+
+
+def _utc_start(d: date) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=timezone.utc)
+
+
+async def _count_by_day(db: AsyncSession, col, lo: date, hi: date) -> dict[date, int]:
+    """Per-day counts of col within [lo, hi] — a range scan on col's index."""
+    day = _day_expr(col, db.bind.dialect.name)
+    rows = await db.execute(
+        select(day, func.count())
+        .where(col >= _utc_start(lo), col < _utc_start(hi + timedelta(days=1)))
+        .group_by(day)
+    )
+    return {_as_date(d): n for d, n in rows.all()}
+
+
+async def _recompute_days(db: AsyncSession, days: list[date]) -> None:
+    lo, hi = min(days), max(days)
+    signups = await _count_by_day(db, User.signed_up_at, lo, hi)
+    active = await _count_by_day(db, User.last_active, lo, hi)
+    rows = [
+        {"day": d, "signups": signups.get(d, 0), "active": active.get(d, 0)}
+        for d in days
+        if signups.get(d) or active.get(d)
+    ]
+    empty = [d for d in days if not (signups.get(d) or active.get(d))]
+    if empty:
+        await db.execute(delete(EngagementDaily).where(EngagementDaily.day.in_(empty)))
+    if rows:
+        insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(EngagementDaily.__table__)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["day"], set_={"signups": stmt.excluded.signups, "active": stmt.excluded.active}
+            ),
+            rows,
+        )
+
+
+async def refresh_engagement_rollups(db: AsyncSession) -> int:
+    """
+    Recompute rollups for dirty days only. Returns days refreshed.
+
+    Days are claimed by deleting their dirty rows; a concurrent refresh
+    gets only the days nobody has claimed, and a failed refresh rolls its
+    claim back with the recompute.
+    """
+    if (await db.execute(select(EngagementDirtyDay.day).limit(1))).first() is None:
+        return 0
+    claimed = await db.execute(delete(EngagementDirtyDay).returning(EngagementDirtyDay.day))
+    days = [_as_date(d) for d in claimed.scalars().all()]
+    if days:
+        await _recompute_days(db, days)
+    await db.commit()
+    return len(days)
+
+
+async def backfill_engagement_rollups(db: AsyncSession) -> int:
+    """One-time full build when users exist but the rollup table is empty."""
+    has_rollups = (await db.execute(select(EngagementDaily.day).limit(1))).first()
+    if has_rollups:
+        return 0
+    bounds = (
+        await db.execute(
+            select(
+                func.min(User.signed_up_at), func.max(User.signed_up_at),
+                func.min(User.last_active), func.max(User.last_active),
+            )
+        )
+    ).one()
+    present = [_as_date(v) for v in bounds if v is not None]
+    if not present:
+        return 0
+    lo, hi = min(present), max(present)
+    days = [lo + timedelta(days=i) for i in range((hi - lo).days + 1)]
+    await _recompute_days(db, days)
+    await db.execute(delete(EngagementDirtyDay))
+    await db.commit()
+    logger.info("Backfilled engagement rollups for %d days", len(days))
+    return len(days)
+
+
+def _bucket_start(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d - timedelta(days=d.weekday())
+    if granularity == "month":
+        return d.replace(day=1)
+    return d
+
+
+def _next_bucket(d: date, granularity: str) -> date:
+    if granularity == "week":
+        return d + timedelta(days=7)
+    if granularity == "month":
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return d + timedelta(days=1)
+
+
+async def get_engagement_series(
+    db: AsyncSession,
+    start: date | None = None,
+    end: date | None = None,
+    granularity: str = "week",
+) -> list[dict]:
+    """
+    Signups and activity per bucket over [start, end].
+
+    dau is the mean daily count of users last active in the bucket; wau is
+    the trailing 7-day count at the bucket's last day.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+
+    await refresh_engagement_rollups(db)
+
+    end = end or datetime.now(timezone.utc).date()
+    start = start or _bucket_start(end, "week") - timedelta(weeks=DEFAULT_WEEKS - 1)
+    if start > end:
+        raise ValueError("start must be on or before end")
+
+    # Read 6 extra days before start for the trailing 7-day window
+    rows = await db.execute(
+        select(EngagementDaily).where(
+            EngagementDaily.day >= start - timedelta(days=6), EngagementDaily.day <= end
+        )
+    )
+    daily = {r.day: r for r in rows.scalars().all()}
+
+    def active_on(d: date) -> int:
+        r = daily.get(d)
+        return r.active if r else 0
+
+    series = []
+    bucket = _bucket_start(start, granularity)
+    while bucket <= end:
+        lo = max(bucket, start)
+        hi = min(_next_bucket(bucket, granularity) - timedelta(days=1), end)
+        n_days = (hi - lo).days + 1
+        span = [lo + timedelta(days=i) for i in range(n_days)]
+        active = sum(active_on(d) for d in span)
+        series.append({
+            "week": f"{granularity[0].upper()}{len(series) + 1}",
+            "week_label": lo.strftime("%b %d").replace(" 0", " "),
+            "start": lo.isoformat(),
+            "end": hi.isoformat(),
+            "signups": sum(daily[d].signups for d in span if d in daily),
+            "active": active,
+            "dau": round(active / n_days, 1),
+            "wau": sum(active_on(hi - timedelta(days=i)) for i in range(7)),
+            # No churn source data yet
+            "churn": None,
+        })
+        bucket = _next_bucket(bucket, granularity)
+    return series
@@ -0,0 +1,316 @@
+"""
+Export service — users and brief actions as streamed CSV or Parquet.
+
+Rows are read in keyset pages of EXPORT_CHUNK_ROWS (users by id, briefs by
+created_at, id), and each chunk is encoded and sent before the next page is
+fetched, so memory is bounded by one chunk whatever the row count. Every
+page is its own short read on the reader pool: a cursor held open for the
+whole download would keep SQLite's read lock and stall writers until the
+client finished.
+CSV chunks are plain text; Parquet writes one row group per chunk through
+pyarrow (optional dependency) into a sink that is drained after every
+group.
+
+Datasets:
+  users                    one row per user, with its stored fit_score
+  actions                  recommended_actions of every brief (or one)
+  product_recommendations  product_recommendations of every brief (or one)
+
+Every export is tracked (rows, bytes, elapsed, rows/sec) for /ops/exports;
+the last EXPORTS_KEPT are kept per worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from sqlalchemy import select, tuple_
+
+from core.executor import run_in_thread
+from core.metrics import EXPORT_ROWS
+from db import read_connection
+from db.models import Brief, User
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional — CSV only
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "10000"))
+EXPORT_BRIEFS_PER_FETCH = 50  # briefs are large JSON documents
+EXPORTS_KEPT = 20
+
+FORMATS = {"csv": "text/csv; charset=utf-8", "parquet": "application/vnd.apache.parquet"}
+
+_USER_COLUMNS = (
+    "id", "email", "name", "company", "company_size", "role", "industry", "source", "status",
+    "fit_score", "signed_up_at", "last_active", "created_at",
+)
+_BRIEF_COLUMNS = ("brief_id", "brief_created_at", "scope", "position")
+_BRIEF_LISTS = {
+    "actions": ("recommended_actions", ("action", "type", "target_segment", "priority", "details")),
+    "product_recommendations": (
+        "product_recommendations",
+        ("title", "description", "source", "impact", "effort", "category", "action_type"),
+    ),
+}
+DATASETS = ("users", *_BRIEF_LISTS)
+
+_TIMESTAMPS = {"signed_up_at", "last_active", "created_at", "brief_created_at"}
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def columns(dataset: str) -> tuple[str, ...]:
+    if dataset == "users":
+        return _USER_COLUMNS
+    return (*_BRIEF_COLUMNS, *_BRIEF_LISTS[dataset][1])
+
+
+# ── Row sources (chunks of tuples in columns() order) ──
+
+async def _user_chunks() -> AsyncIterator[list[tuple]]:
+    table = User.__table__
+    query = select(*(table.c[c] for c in _USER_COLUMNS)).order_by(table.c.id).limit(EXPORT_CHUNK_ROWS)
+    after = ""
+    while True:
+        async with read_connection("users") as conn:
+            rows = (await conn.execute(query.where(table.c.id > after))).all()
+        if not rows:
+            return
+        yield [tuple(r) for r in rows]
+        if len(rows) < EXPORT_CHUNK_ROWS:
+            return
+        after = rows[-1].id
+
+
+def _cell(value) -> str | None:
+    """Brief JSON values as text cells: nested objects become JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+async def _brief_item_chunks(dataset: str, brief_id: str | None) -> AsyncIterator[list[tuple]]:
+    key, fields = _BRIEF_LISTS[dataset]
+    query = (
+        select(Brief.id, Brief.created_at, Brief.scope, Brief.content)
+        .order_by(Brief.created_at, Brief.id)
+        .limit(EXPORT_BRIEFS_PER_FETCH)
+    )
+    if brief_id is not None:
+        query = query.where(Brief.id == brief_id)
+    chunk: list[tuple] = []
+    after: tuple | None = None
+    while True:
+        page = query if after is None else query.where(tuple_(Brief.created_at, Brief.id) > tuple_(*after))
+        async with read_connection("briefs") as conn:
+            briefs = (await conn.execute(page)).all()
+        for bid, created_at, scope, content in briefs:
+            for position, item in enumerate((content or {}).get(key) or ()):
+                if isinstance(item, dict):
+                    chunk.append((bid, created_at, scope, position, *(_cell(item.get(f)) for f in fields)))
+            if len(chunk) >= EXPORT_CHUNK_ROWS:
+                yield chunk
+                chunk = []
+        if len(briefs) < EXPORT_BRIEFS_PER_FETCH:
+            break
+        after = (briefs[-1].created_at, briefs[-1].id)
+    if chunk:
+        yield chunk
+
+
+def _chunks(dataset: str, brief_id: str | None) -> AsyncIterator[list[tuple]]:
+    return _user_chunks() if dataset == "users" else _brief_item_chunks(dataset, brief_id)
+
+
+# ── Encoders ──
+
+def _iso(value: datetime | None) -> str | None:
+    """CSV cell for a timestamp: ISO 8601 with offset."""
+    if value is None:
+        return None
+    return value.isoformat() if value.tzinfo is not None else value.isoformat() + "+00:00"  # SQLite: naive UTC
+
+
+class _CsvEncoder:
+    def __init__(self, names: tuple[str, ...]):
+        self._timestamps = [i for i, n in enumerate(names) if n in _TIMESTAMPS]
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._writer.writerow(names)
+
+    def _take(self) -> bytes:
+        out = self._buf.getvalue().encode()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return out
+
+    def encode(self, rows: list[tuple]) -> bytes:
+        if self._timestamps:
+            rows = [list(r) for r in rows]
+            for r in rows:
+                for i in self._timestamps:
+                    r[i] = _iso(r[i])
+        self._writer.writerows(rows)
+        return self._take()
+
+    def finish(self) -> bytes:
+        return self._take()
+
+
+class _Sink:
+    """Write-only file object that hands back what pyarrow wrote since the last drain."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def _arrow_type(name: str):
+    if name in _TIMESTAMPS:
+        return pa.timestamp("us", tz="UTC")
+    if name == "fit_score":
+        return pa.float64()
+    if name == "position":
+        return pa.int32()
+    return pa.string()
+
+
+class _ParquetEncoder:
+    def __init__(self, names: tuple[str, ...]):
+        self._names = names
+        self._schema = pa.schema([(n, _arrow_type(n)) for n in names])
+        self._sink = _Sink()
+        self._writer = pq.ParquetWriter(pa.PythonFile(self._sink, mode="w"), self._schema, compression="snappy")
+
+    def encode(self, rows: list[tuple]) -> bytes:
+        cols = list(zip(*rows))
+        table = pa.Table.from_arrays(
+            [pa.array(cols[i], type=self._schema.field(i).type) for i in range(len(self._names))],
+            schema=self._schema,
+        )
+        self._writer.write_table(table, row_group_size=len(rows))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+# ── Tracking ──
+
+class ExportTracker:
+    def __init__(self, kept: int = EXPORTS_KEPT):
+        self.kept = kept
+        self.exports: OrderedDict[str, dict] = OrderedDict()
+
+    def begin(self, dataset: str, fmt: str, brief_id: str | None) -> dict:
+        export = {
+            "export_id": uuid.uuid4().hex[:12],
+            "dataset": dataset,
+            "format": fmt,
+            "brief_id": brief_id,
+            "state": "running",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "rows": 0,
+            "bytes": 0,
+            "elapsed_s": 0.0,
+            "rows_per_s": None,
+        }
+        self.exports[export["export_id"]] = export
+        while len(self.exports) > self.kept:
+            self.exports.popitem(last=False)
+        return export
+
+    def stats(self) -> dict:
+        return {
+            "chunk_rows": EXPORT_CHUNK_ROWS,
+            "parquet": parquet_available(),
+            "exports": list(reversed(self.exports.values())),
+        }
+
+
+export_tracker = ExportTracker()
+
+
+async def stream_export(export: dict) -> AsyncIterator[bytes]:
+    """
+    Encoded chunks of `export` (from export_tracker.begin); updates its
+    counters as it goes. The next page is fetched while the current one is
+    encoded on the thread pool, so at most two chunks are in memory.
+    """
+    names = columns(export["dataset"])
+    encoder = _CsvEncoder(names) if export["format"] == "csv" else _ParquetEncoder(names)
+    started = time.perf_counter()
+
+    def tick(data: bytes) -> bytes:
+        export["bytes"] += len(data)
+        export["elapsed_s"] = round(time.perf_counter() - started, 3)
+        if export["elapsed_s"]:
+            export["rows_per_s"] = round(export["rows"] / export["elapsed_s"], 1)
+        return data
+
+    chunks = _chunks(export["dataset"], export["brief_id"])
+    fetch = asyncio.ensure_future(anext(chunks, None))
+    try:
+        while (rows := await fetch) is not None:
+            fetch = asyncio.ensure_future(anext(chunks, None))
+            export["rows"] += len(rows)
+            EXPORT_ROWS.labels(export["dataset"], export["format"]).inc(len(rows))
+            yield tick(await run_in_thread(encoder.encode, rows))
+        yield tick(await run_in_thread(encoder.finish))
+        export["state"] = "completed"
+        logger.info(
+            "Export %s: %s %s, %d rows in %.2fs (%s rows/s)",
+            export["export_id"], export["dataset"], export["format"], export["rows"], export["elapsed_s"],
+            export["rows_per_s"],
+        )
+    except BaseException:
+        # Client gone (cancelled / GeneratorExit) or a failure mid-stream
+        export["state"] = "aborted"
+        raise
+    finally:
+        if not fetch.done():
+            fetch.cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+        await chunks.aclose()
+        tick(b"")
@@ -0,0 +1,157 @@
+"""
+Friction clusters — near-duplicate grouping of friction points with MinHash LSH.
+
+Each friction point becomes a set of word uni/bi-gram shingles, summarized
+as a MinHash signature (vectorized with NumPy). Signatures are split into
+LSH bands; only items sharing a band bucket are compared, so the work grows
+with the number of near-duplicates rather than quadratically with the corpus.
+Candidate pairs above the Jaccard threshold are merged with union-find.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERM = 120
+BANDS = 40                      # 40 bands x 3 rows: ~93% recall for pairs at Jaccard 0.4
+SIMILARITY_THRESHOLD = 0.4      # estimated Jaccard needed to merge a candidate pair
+MAX_BUCKET_PAIRWISE = 64        # larger buckets are compared as a chain, not all pairs
+
+_BAND_MIX = np.uint64(0x9E3779B97F4A7C15)
+_SIG_CHUNK = 1 << 15            # shingles hashed per NumPy batch
+_VERIFY_CHUNK = 1 << 16         # candidate pairs verified per NumPy batch
+
+_ROWS = NUM_PERM // BANDS
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or so "
+    "that the their them they this to was were will with not no can".split()
+)
+
+# Fixed seed: signatures (and therefore clusters) are stable across runs
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(0, 2**64 - 1, size=NUM_PERM, dtype=np.uint64, endpoint=True) | np.uint64(1)
+_B = _rng.integers(0, 2**64 - 1, size=NUM_PERM, dtype=np.uint64, endpoint=True)
+
+
+def _shingles(text: str) -> np.ndarray:
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+    grams = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    if not grams:
+        grams = {text.lower()}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "little") for g in grams),
+        dtype=np.uint64,
+        count=len(grams),
+    )
+
+
+def _signatures(shingle_sets: list[np.ndarray]) -> np.ndarray:
+    """MinHash signatures, shape (n_items, NUM_PERM), computed in chunks."""
+    sigs = np.empty((len(shingle_sets), NUM_PERM), dtype=np.uint64)
+    start = 0
+    while start < len(shingle_sets):
+        # Grow the chunk until it holds ~_SIG_CHUNK shingles
+        end, total = start, 0
+        while end < len(shingle_sets) and (total == 0 or total + len(shingle_sets[end]) <= _SIG_CHUNK):
+            total += len(shingle_sets[end])
+            end += 1
+        chunk = shingle_sets[start:end]
+        x = np.concatenate(chunk)
+        offsets = np.cumsum([0] + [len(c) for c in chunk[:-1]])
+        # Multiply-shift hashing over 64-bit keys: (a*x + b) mod 2^64, keep the high 32 bits
+        hashed = (_A[:, None] * x[None, :] + _B[:, None]) >> np.uint64(32)
+        sigs[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return sigs
+
+
+def _candidate_pairs(sigs: np.ndarray) -> np.ndarray:
+    """Unique (i, j) pairs, i < j, that share at least one LSH band bucket."""
+    n = len(sigs)
+    codes = []
+    for band in range(BANDS):
+        rows = sigs[:, band * _ROWS:(band + 1) * _ROWS]
+        # Fold the band's rows into one key; a rare collision only adds a
+        # candidate that verification rejects.
+        keys = rows[:, 0].copy()
+        for r in range(1, _ROWS):
+            keys = keys * _BAND_MIX + rows[:, r]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        group = np.concatenate(([0], np.cumsum(sorted_keys[1:] != sorted_keys[:-1])))
+        size_at = np.bincount(group)[group]
+        # Pair each member with the one d places later in its bucket; buckets
+        # above MAX_BUCKET_PAIRWISE only get d=1 (a chain).
+        for d in range(1, min(int(size_at.max()), MAX_BUCKET_PAIRWISE)):
+            same = group[d:] == group[:-d]
+            if d > 1:
+                same &= size_at[d:] <= MAX_BUCKET_PAIRWISE
+            if not same.any():
+                break
+            a, b = order[:-d][same], order[d:][same]
+            codes.append(np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b))
+    if not codes:
+        return np.empty((0, 2), dtype=np.int64)
+    uniq = np.unique(np.concatenate(codes))
+    return np.stack([uniq // n, uniq % n], axis=1)
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_friction_points(items: list[dict]) -> list[dict]:
+    """
+    Group near-duplicate friction points.
+
+    items: [{ interview_id, area, description, action? }]
+    Returns clusters sorted by mention count:
+      [{ area, description, action, mention_count, interview_ids, variants }]
+    The representative is the most concise member, so verbose phrasing
+    doesn't dominate the rollup. action is the representative's, or the
+    first member's that has one.
+    """
+    n = len(items)
+    if not n:
+        return []
+
+    sigs = _signatures([_shingles(f"{it['area']} {it['description']}") for it in items])
+    pairs = _candidate_pairs(sigs)
+
+    parent = list(range(n))
+    for lo in range(0, len(pairs), _VERIFY_CHUNK):
+        chunk = pairs[lo:lo + _VERIFY_CHUNK]
+        similarity = (sigs[chunk[:, 0]] == sigs[chunk[:, 1]]).mean(axis=1)
+        for a, b in chunk[similarity >= SIMILARITY_THRESHOLD].tolist():
+            ra, rb = _find(parent, a), _find(parent, b)
+            if ra != rb:
+                parent[rb] = ra
+
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i in range(n):
+        groups[_find(parent, i)].append(i)
+
+    clusters = []
+    for members in groups.values():
+        rep = min(members, key=lambda i: (len(items[i]["description"]), i))
+        action = items[rep].get("action") or next(
+            (items[i]["action"] for i in members if items[i].get("action")), None
+        )
+        clusters.append({
+            "area": items[rep]["area"],
+            "description": items[rep]["description"],
+            "action": action,
+            "mention_count": len(members),
+            "interview_ids": sorted({items[i]["interview_id"] for i in members}),
+            "variants": [items[i]["description"] for i in members if i != rep],
+        })
+    clusters.sort(key=lambda c: (-c["mention_count"], c["area"]))
+    return clusters
@@ -0,0 +1,200 @@
+"""
+Interview ranker — BM25 over interview insight lines.
+
+Each friction-point cluster and bottom-line impact line is a document.
+Near-duplicate friction points (services/friction_clusters.py) collapse to
+their cluster's representative with a mention count, so the same complaint
+from several interviews costs one line of the budget. The index is
+stored column-wise (per-term postings with precomputed BM25 weights) so a
+query is one gather + np.bincount. It's rebuilt only when the transcript
+corpus version changes.
+
+select_interview_context() scores those lines against the ICP and
+segmentation outputs and renders only the top-k that fit a token budget,
+so the MessagingAgent prompt stays flat as the corpus grows.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+from services.interview_service import corpus_version, get_friction_clusters, get_indexed_interviews
+
+TOKEN_BUDGET = int(os.getenv("INTERVIEW_CONTEXT_TOKEN_BUDGET", "1200"))
+TOP_K = int(os.getenv("INTERVIEW_CONTEXT_TOP_K", "20"))
+
+# Reserved for the "Showing N of M insights" line
+_SUMMARY_LINE_TOKENS = 16
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or so "
+    "that the their them they this to was were will with not no can our we you your "
+    "all any more most than then there these those which who what when how".split()
+)
+
+
+def _tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token) — no tokenizer dependency."""
+    return len(text) // 4 + 1
+
+
+class _Index:
+    """Postings-list BM25 index over insight lines."""
+
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+        n = len(docs)
+        vocab: dict[str, int] = {}
+        doc_terms: list[Counter] = []
+        for d in docs:
+            tf = Counter(_tokenize(d["text"]))
+            doc_terms.append(tf)
+            for t in tf:
+                vocab.setdefault(t, len(vocab))
+        self.vocab = vocab
+
+        lengths = np.array([sum(tf.values()) for tf in doc_terms], dtype=np.float32)
+        avgdl = float(lengths.mean()) if n else 1.0
+        norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * lengths / max(avgdl, 1e-9))
+
+        # Build CSC postings: for term t, docs indices[indptr[t]:indptr[t+1]]
+        term_ids, doc_ids, tfs = [], [], []
+        for i, tf in enumerate(doc_terms):
+            for t, c in tf.items():
+                term_ids.append(vocab[t])
+                doc_ids.append(i)
+                tfs.append(c)
+        term_ids_a = np.array(term_ids, dtype=np.int64)
+        order = np.argsort(term_ids_a, kind="stable")
+        self.indices = np.array(doc_ids, dtype=np.int64)[order]
+        tf_a = np.array(tfs, dtype=np.float32)[order]
+        df = np.bincount(term_ids_a, minlength=len(vocab)).astype(np.float32)
+        self.indptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+
+        idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        sorted_terms = term_ids_a[order]
+        self.weights = idf[sorted_terms] * tf_a * (_BM25_K1 + 1) / (tf_a + norm[self.indices])
+
+    def score(self, query: str) -> np.ndarray:
+        ids = {self.vocab[t] for t in _tokenize(query) if t in self.vocab}
+        if not ids:
+            return np.zeros(len(self.docs), dtype=np.float32)
+        slices = [slice(self.indptr[t], self.indptr[t + 1]) for t in ids]
+        idx = np.concatenate([self.indices[s] for s in slices])
+        w = np.concatenate([self.weights[s] for s in slices])
+        return np.bincount(idx, weights=w, minlength=len(self.docs))
+
+
+_index_cache: dict[tuple, _Index] = {}
+_index_lock = threading.Lock()
+
+
+def _build_docs(active_ids: list[int] | None) -> list[dict]:
+    indexed = get_indexed_interviews(active_ids)
+    by_id = {meta["id"]: meta for meta, _ in indexed}
+    docs = []
+    # One doc per cluster, filed under the first interview that raised it
+    for c in get_friction_clusters(list(by_id)):
+        line = f"  - [{c['area']}] {c['description']}"
+        if c["action"]:
+            line += f" → Action: {c['action']}"
+        if c["mention_count"] > 1:
+            others = [str(i) for i in c["interview_ids"][1:]]
+            line += f" (×{c['mention_count']}" + (f", also interviews {', '.join(others)})" if others else ")")
+        text = " ".join([c["area"], c["description"], c["action"] or "", *c["variants"]])
+        docs.append({"interview": by_id[c["interview_ids"][0]], "line": line, "text": text})
+    for meta, entry in indexed:
+        for ins in entry["key_insights"]:
+            if ins["type"] == "bottom_line":
+                docs.append({"interview": meta, "line": f"  - [Revenue] {ins['description']}", "text": ins["description"]})
+    # Corpus order: by interview, friction before revenue
+    position = {iid: n for n, iid in enumerate(by_id)}
+    docs.sort(key=lambda d: position[d["interview"]["id"]])
+    return docs
+
+
+def get_index(active_ids: list[int] | None = None) -> _Index:
+    """Return the cached index for the current corpus version."""
+    key = (tuple(active_ids) if active_ids is not None else None, corpus_version(active_ids))
+    index = _index_cache.get(key)
+    if index is None:
+        with _index_lock:
+            index = _index_cache.get(key)
+            if index is None:
+                index = _Index(_build_docs(active_ids))
+                _index_cache.clear()
+                _index_cache[key] = index
+    return index
+
+
+def select_interview_context(
+    query: str,
+    active_ids: list[int] | None = None,
+    token_budget: int | None = None,
+    top_k: int | None = None,
+) -> str:
+    """
+    Render the interview insight lines most relevant to `query`, grouped by
+    interview, keeping at most top_k lines within token_budget.
+    """
+    token_budget = TOKEN_BUDGET if token_budget is None else token_budget
+    top_k = TOP_K if top_k is None else top_k
+
+    index = get_index(active_ids)
+    if not index.docs:
+        return "No interview data available."
+
+    scores = index.score(query)
+    # Highest score first; ties keep corpus order so output is deterministic
+    order = np.lexsort((np.arange(len(scores)), -scores))
+
+    header = "USER INTERVIEW INSIGHTS (ranked by relevance)\n" + "=" * 40 + "\n"
+    used = estimate_tokens(header) + _SUMMARY_LINE_TOKENS
+    chosen: list[int] = []
+    seen_interviews: set[int] = set()
+    for i in order[:top_k]:
+        doc = index.docs[i]
+        cost = estimate_tokens(doc["line"])
+        iid = doc["interview"]["id"]
+        if iid not in seen_interviews:
+            cost += estimate_tokens(_interview_heading(doc["interview"]))
+        if used + cost > token_budget:
+            continue
+        used += cost
+        chosen.append(int(i))
+        seen_interviews.add(iid)
+
+    if not chosen:
+        return "No interview data available."
+
+    # Render in corpus order so each interview's lines stay together
+    sections: dict[int, list[str]] = {}
+    headings: dict[int, str] = {}
+    for i in sorted(chosen):
+        meta = index.docs[i]["interview"]
+        headings.setdefault(meta["id"], _interview_heading(meta))
+        sections.setdefault(meta["id"], []).append(index.docs[i]["line"])
+
+    body = "\n".join(headings[iid] + "\n".join(lines) + "\n" for iid, lines in sections.items())
+    return (
+        header
+        + f"Showing {len(chosen)} of {len(index.docs)} insights from {len(sections)} interviews\n\n"
+        + body
+    )
+
+
+def _interview_heading(meta: dict) -> str:
+    return f"Interview {meta['id']}: {meta['title']} — {meta['participant']} ({meta['role']})\n"
@@ -1,19 +1,38 @@
 """
 Interview service — loads transcripts from assets/, extracts insights,
 and provides them as context for the agent pipeline.
+
+Also owns the DB-backed interview corpus: ingestion into normalized
+insight / Q&A rows and ranked full-text search.
 """
 
 from __future__ import annotations
 
+import asyncio
+import html
 import os
 import re
 import logging
+import threading
 from pathlib import Path
 
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.executor import run_cpu
+from db.models import DataVersion, Interview, InterviewInsight, InterviewQuestion
+from services.friction_clusters import cluster_friction_points
+from services.transcript_parser import parse_text
+
 logger = logging.getLogger(__name__)
 
 ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets"
 
+# Transcript regex extraction runs ~12 ms per MB. Thread above 512 KB;
+# above 16 MB a separate process is worth the spawn and the pickled copy.
+PARSE_THREAD_AT = 512 * 1024
+PARSE_PROCESS_AT = 16 * 1024 * 1024
+
 # ── Interview metadata (matches transcript files) ──
 INTERVIEWS = [
     {
@@ -187,18 +206,131 @@ def _extract_pm_questions(text: str) -> list[dict]:
     return questions
 
 
+# ── Parsed-interview index ──
+# Transcripts are parsed once and cached per interview id. Each entry keeps
+# the file's (mtime_ns, size) signature; a lookup re-stats the file and only
+# re-parses that one transcript when the signature changes.
+
+_INTERVIEWS_BY_ID: dict[int, dict] = {m["id"]: m for m in INTERVIEWS}
+_index: dict[int, dict] = {}
+_index_lock = threading.Lock()
+_clusters_cache: dict[tuple, list[dict]] = {}
+
+# Interviews that exist only in the DB (POST /api/interviews with a new id),
+# mirrored for the ranker and the clusters by refresh_db_corpus():
+# (interviews_version loaded, {id: (metadata, index entry)})
+_db_corpus: tuple[int | None, dict[int, tuple[dict, dict]]] = (None, {})
+
+
+def _transcript_signature(interview_id: int) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a transcript file, or None if it doesn't exist."""
+    try:
+        st = os.stat(ASSETS_DIR / f"transcript{interview_id}.txt")
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _parse_entry(meta: dict, signature: tuple[int, int] | None) -> dict:
+    """Read and parse one transcript into an index entry."""
+    transcript = _load_transcript(meta["id"]) if signature else None
+    parsed = parse_text(transcript) if transcript else {}
+    insights = parsed.get("key_insights", [])
+    pm_questions = parsed.get("pm_questions", [])
+    return {
+        "signature": signature,
+        "transcript": transcript,
+        "key_insights": insights,
+        "pm_questions": pm_questions,
+    }
+
+
+def _get_entry(interview_id: int) -> dict | None:
+    """Return the cached index entry, re-parsing only if the file changed."""
+    meta = _INTERVIEWS_BY_ID.get(interview_id)
+    if not meta:
+        return None
+    signature = _transcript_signature(interview_id)
+    entry = _index.get(interview_id)
+    if entry is not None and entry["signature"] == signature:
+        return entry
+    with _index_lock:
+        entry = _index.get(interview_id)
+        if entry is None or entry["signature"] != signature:
+            entry = _parse_entry(meta, signature)
+            _index[interview_id] = entry
+    return entry
+
+
+def build_interview_index() -> int:
+    """Parse every known transcript into the index. Returns entry count."""
+    for iid in _INTERVIEWS_BY_ID:
+        _get_entry(iid)
+    return len(_index)
+
+
+def get_indexed_interviews(active_ids: list[int] | None = None) -> list[tuple[dict, dict]]:
+    """(metadata, index entry) for each interview that has a transcript, bundled or DB-only."""
+    db_only = _db_corpus[1]
+    if active_ids is None:
+        active_ids = [m["id"] for m in INTERVIEWS] + list(db_only)
+    out = []
+    for iid in active_ids:
+        if iid in db_only:
+            out.append(db_only[iid])
+            continue
+        entry = _get_entry(iid)
+        if entry is not None and entry["transcript"]:
+            out.append((_INTERVIEWS_BY_ID[iid], entry))
+    return out
+
+
+def corpus_version(active_ids: list[int] | None = None) -> tuple:
+    """Hashable version of the transcript corpus; changes when any file or DB-only interview does."""
+    return tuple((meta["id"], entry["signature"]) for meta, entry in get_indexed_interviews(active_ids))
+
+
+def get_friction_clusters(active_ids: list[int] | None = None) -> list[dict]:
+    """Near-duplicate friction point clusters, cached per corpus version."""
+    key = (tuple(active_ids) if active_ids is not None else None, corpus_version(active_ids))
+    clusters = _clusters_cache.get(key)
+    if clusters is None:
+        items = [
+            {
+                "interview_id": meta["id"],
+                "area": i["area"],
+                "description": i["description"],
+                "action": i["action"],
+            }
+            for meta, entry in get_indexed_interviews(active_ids)
+            for i in entry["key_insights"]
+            if i["type"] == "friction"
+        ]
+        clusters = cluster_friction_points(items)
+        if len(_clusters_cache) > 8:
+            _clusters_cache.clear()
+        _clusters_cache[key] = clusters
+    return clusters
+
+
+async def warm_interview_index() -> int:
+    """Cold-start parse in a worker thread so the event loop never blocks."""
+    count = await asyncio.to_thread(build_interview_index)
+    logger.info("Interview index warmed: %d transcripts", count)
+    return count
+
+
 def get_all_interviews() -> list[dict]:
     """Return all interview metadata with key insights."""
     result = []
     for meta in INTERVIEWS:
-        transcript = _load_transcript(meta["id"])
-        insights = _extract_key_insights(transcript) if transcript else []
-        pm_questions = _extract_pm_questions(transcript) if transcript else []
+        entry = _get_entry(meta["id"])
+        transcript = entry["transcript"]
         result.append({
             **meta,
             "has_transcript": transcript is not None,
-            "key_insights": insights,
-            "pm_questions": pm_questions[:5],  # Top 5 PM questions
+            "key_insights": entry["key_insights"],
+            "pm_questions": entry["pm_questions"][:5],  # Top 5 PM questions
             "transcript_preview": (transcript[:300] + "...") if transcript else None,
         })
     return result
@@ -206,68 +338,250 @@ def get_all_interviews() -> list[dict]:
 
 def get_interview(interview_id: int) -> dict | None:
     """Return full interview details including complete transcript."""
-    meta = next((m for m in INTERVIEWS if m["id"] == interview_id), None)
-    if not meta:
+    entry = _get_entry(interview_id)
+    if entry is None:
         return None
-    transcript = _load_transcript(interview_id)
-    insights = _extract_key_insights(transcript) if transcript else []
-    pm_questions = _extract_pm_questions(transcript) if transcript else []
+    transcript = entry["transcript"]
     return {
-        **meta,
+        **_INTERVIEWS_BY_ID[interview_id],
         "has_transcript": transcript is not None,
         "transcript": transcript,
-        "key_insights": insights,
-        "pm_questions": pm_questions,
+        "key_insights": entry["key_insights"],
+        "pm_questions": entry["pm_questions"],
     }
 
 
-def get_interview_context_for_agents(active_ids: list[int] | None = None) -> str:
+# ── DB-backed corpus ──
+
+_INTERVIEW_META_FIELDS = (
+    "title", "participant", "role", "company_type", "date", "duration", "video_id", "focus",
+)
+
+SEARCH_MAX_PAGE_SIZE = 100
+# The database brackets matches with private-use sentinels; the text is
+# HTML-escaped and only then are the sentinels turned into <mark> tags
+_SNIPPET_OPEN, _SNIPPET_CLOSE = "\ue000", "\ue001"
+
+
+async def ingest_interview(
+    db: AsyncSession,
+    data: dict,
+    interview_id: int | None = None,
+) -> Interview:
     """
-    Build a combined context string from selected interview transcripts
-    for injection into agent prompts.
+    Parse a transcript and store it with its insights and Q&A as rows.
+    Replaces the existing interview when `interview_id` is already taken.
     """
-    if active_ids is None:
-        active_ids = [m["id"] for m in INTERVIEWS]
+    transcript = data["transcript"]
+    parsed = await run_cpu(
+        parse_text, transcript, size=len(transcript), thread_at=PARSE_THREAD_AT, process_at=PARSE_PROCESS_AT
+    )
+    friction_text = "\n".join(
+        f"{i['area']}: {i['description']}"
+        for i in parsed["key_insights"]
+        if i["type"] == "friction"
+    )
 
-    sections: list[str] = []
-    all_friction: list[str] = []
-    all_impact: list[str] = []
+    if interview_id is not None:
+        await _delete_interview_rows(db, interview_id)
 
-    for iid in active_ids:
-        meta = next((m for m in INTERVIEWS if m["id"] == iid), None)
-        if not meta:
+    interview = Interview(
+        **({"id": interview_id} if interview_id is not None else {}),
+        **{f: data.get(f) for f in _INTERVIEW_META_FIELDS},
+        transcript=transcript,
+        friction_text=friction_text,
+        insights=[
+            InterviewInsight(
+                position=n,
+                type=i["type"],
+                area=i["area"],
+                description=i["description"],
+                action=i["action"],
+            )
+            for n, i in enumerate(parsed["key_insights"])
+        ],
+        questions=[
+            InterviewQuestion(position=n, question=q["question"], answer=q["answer"])
+            for n, q in enumerate(parsed["pm_questions"])
+        ],
+    )
+    db.add(interview)
+    await db.flush()
+
+    if db.bind.dialect.name == "sqlite":
+        await db.execute(
+            text(
+                "INSERT INTO interviews_fts(rowid, title, transcript, friction) "
+                "VALUES (:id, :title, :transcript, :friction)"
+            ),
+            {
+                "id": interview.id,
+                "title": interview.title,
+                "transcript": transcript,
+                "friction": friction_text,
+            },
+        )
+
+    await db.commit()
+    return interview
+
+
+async def _delete_interview_rows(db: AsyncSession, interview_id: int) -> None:
+    await db.execute(delete(InterviewInsight).where(InterviewInsight.interview_id == interview_id))
+    await db.execute(delete(InterviewQuestion).where(InterviewQuestion.interview_id == interview_id))
+    await db.execute(delete(Interview).where(Interview.id == interview_id))
+    if db.bind.dialect.name == "sqlite":
+        await db.execute(text("DELETE FROM interviews_fts WHERE rowid = :id"), {"id": interview_id})
+
+
+async def sync_bundled_interviews(db: AsyncSession) -> int:
+    """Ingest bundled asset transcripts missing from the DB. Returns count added."""
+    existing = set((await db.execute(select(Interview.id))).scalars().all())
+    added = 0
+    for meta in INTERVIEWS:
+        if meta["id"] in existing:
             continue
-        transcript = _load_transcript(iid)
-        if not transcript:
+        entry = _get_entry(meta["id"])
+        if not entry or not entry["transcript"]:
             continue
+        await ingest_interview(db, {**meta, "transcript": entry["transcript"]}, interview_id=meta["id"])
+        added += 1
+    if added:
+        logger.info("Ingested %d bundled interviews into the corpus", added)
+    return added
+
+
+async def refresh_db_corpus(db: AsyncSession) -> int:
+    """
+    Load the DB-only interviews' insights for the ranker and the clusters,
+    once per interviews_version. Bundled ids keep their transcript files.
+    Returns how many DB-only interviews are loaded.
+    """
+    global _db_corpus
+    version = (await db.execute(select(DataVersion.interviews_version).where(DataVersion.id == 1))).scalar()
+    if _db_corpus[0] is not None and version == _db_corpus[0]:
+        return len(_db_corpus[1])
+    metas = (await db.execute(
+        select(Interview.id, *(getattr(Interview, f) for f in _INTERVIEW_META_FIELDS))
+        .where(Interview.id.not_in(list(_INTERVIEWS_BY_ID)))
+        .order_by(Interview.id)
+    )).all()
+    insights = (await db.execute(
+        select(InterviewInsight)
+        .where(InterviewInsight.interview_id.in_([m.id for m in metas]))
+        .order_by(InterviewInsight.interview_id, InterviewInsight.position)
+    )).scalars().all()
+    by_interview: dict[int, list[dict]] = {}
+    for i in insights:
+        by_interview.setdefault(i.interview_id, []).append(
+            {"type": i.type, "area": i.area, "description": i.description, "action": i.action}
+        )
+    corpus = {
+        m.id: (
+            {"id": m.id, **{f: getattr(m, f) for f in _INTERVIEW_META_FIELDS}},
+            {"signature": ("db", version), "key_insights": by_interview.get(m.id, [])},
+        )
+        for m in metas
+    }
+    _db_corpus = (version or 0, corpus)
+    return len(corpus)
+
+
+def _render_snippet(raw: str | None) -> str | None:
+    """Escape a database snippet as HTML, then mark its matches."""
+    if raw is None:
+        return None
+    return html.escape(raw).replace(_SNIPPET_OPEN, "<mark>").replace(_SNIPPET_CLOSE, "</mark>")
+
+
+def _fts5_query(q: str) -> str:
+    """Quote each term so user input can't hit FTS5 query syntax; terms are ANDed."""
+    return " ".join(f'"{t}"' for t in re.findall(r"\w+", q))
+
+
+async def search_interviews(
+    db: AsyncSession,
+    q: str,
+    page: int = 1,
+    page_size: int = 20,
+) -> dict:
+    """Ranked full-text search over transcripts and friction points."""
+    page = max(page, 1)
+    page_size = max(1, min(page_size, SEARCH_MAX_PAGE_SIZE))
+    offset = (page - 1) * page_size
+
+    if db.bind.dialect.name == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return {"query": q, "results": [], "total": 0, "page": page, "page_size": page_size}
+        params = {"q": match, "limit": page_size, "offset": offset}
+        total = (
+            await db.execute(
+                text("SELECT count(*) FROM interviews_fts WHERE interviews_fts MATCH :q"), params
+            )
+        ).scalar() or 0
+        # bm25 column weights: title, transcript, friction
+        rows = (
+            await db.execute(
+                text(
+                    "SELECT i.id, i.title, i.participant, i.role, i.company_type, i.date, "
+                    "-bm25(interviews_fts, 10.0, 1.0, 4.0) AS score, "
+                    f"snippet(interviews_fts, 1, '{_SNIPPET_OPEN}', '{_SNIPPET_CLOSE}', '…', 24) AS snippet, "
+                    f"snippet(interviews_fts, 2, '{_SNIPPET_OPEN}', '{_SNIPPET_CLOSE}', '…', 16) AS friction_snippet "
+                    "FROM interviews_fts JOIN interviews i ON i.id = interviews_fts.rowid "
+                    "WHERE interviews_fts MATCH :q "
+                    "ORDER BY bm25(interviews_fts, 10.0, 1.0, 4.0) "
+                    "LIMIT :limit OFFSET :offset"
+                ),
+                params,
+            )
+        ).mappings().all()
+    else:
+        # Must match the ix_interviews_search expression for the GIN index to be used
+        doc = (
+            "to_tsvector('english', coalesce(i.title, '') || ' ' || i.transcript "
+            "|| ' ' || coalesce(i.friction_text, ''))"
+        )
+        headline_opts = f'StartSel="{_SNIPPET_OPEN}", StopSel="{_SNIPPET_CLOSE}", MaxFragments=2'
+        params = {"q": q, "limit": page_size, "offset": offset}
+        total = (
+            await db.execute(
+                text(
+                    f"SELECT count(*) FROM interviews i, websearch_to_tsquery('english', :q) query "
+                    f"WHERE {doc} @@ query"
+                ),
+                params,
+            )
+        ).scalar() or 0
+        rows = (
+            await db.execute(
+                text(
+                    "SELECT i.id, i.title, i.participant, i.role, i.company_type, i.date, "
+                    f"ts_rank({doc}, query) AS score, "
+                    f"ts_headline('english', i.transcript, query, '{headline_opts}') AS snippet, "
+                    f"ts_headline('english', coalesce(i.friction_text, ''), query, '{headline_opts}') "
+                    "AS friction_snippet "
+                    "FROM interviews i, websearch_to_tsquery('english', :q) query "
+                    f"WHERE {doc} @@ query "
+                    "ORDER BY score DESC LIMIT :limit OFFSET :offset"
+                ),
+                params,
+            )
+        ).mappings().all()
+
+    return {
+        "query": q,
+        "results": [
+            {
+                **r,
+                "score": round(float(r["score"]), 4),
+                "snippet": _render_snippet(r["snippet"]),
+                "friction_snippet": _render_snippet(r["friction_snippet"]),
+            }
+            for r in rows
+        ],
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+    }
 
-        insights = _extract_key_insights(transcript)
-        friction_points = [i for i in insights if i["type"] == "friction"]
-        impact_points = [i for i in insights if i["type"] == "bottom_line"]
-
-        section = f"Interview {iid}: {meta['title']} — {meta['participant']} ({meta['role']})\n"
-        for fp in friction_points:
-            desc = f"  - [{fp['area']}] {fp['description']}"
-            if fp["action"]:
-                desc += f" → Action: {fp['action']}"
-            section += desc + "\n"
-            all_friction.append(f"{fp['area']}: {fp['description']}")
-        for ip in impact_points:
-            section += f"  - [Revenue] {ip['description']}\n"
-            all_impact.append(ip["description"])
-
-        sections.append(section)
-
-    if not sections:
-        return "No interview data available."
-
-    summary = "USER INTERVIEW INSIGHTS\n"
-    summary += "=" * 40 + "\n"
-    summary += f"Total Interviews Analyzed: {len(sections)}\n\n"
-    summary += "\n".join(sections)
-    summary += "\n\nAGGREGATE FRICTION THEMES:\n"
-    summary += "\n".join(f"  • {f}" for f in all_friction)
-    summary += "\n\nREVENUE IMPACT SIGNALS:\n"
-    summary += "\n".join(f"  • {i}" for i in all_impact)
-
-    return summary
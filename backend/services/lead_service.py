@@ -0,0 +1,331 @@
+"""
+Lead service — stored ICP fit scores and the top-k leads list.
+
+User.fit_score holds each user's fit (agents/fit_scoring.py) against the ICP
+of the latest all-users brief; the fit_model row records which brief that
+was. refresh_fit_scores() rescores every user when a newer brief exists and
+otherwise only users whose score is NULL: new users and users whose
+company_size / role / industry changed (db/events.py clears their score).
+
+Scores are read and written in keyset chunks of FIT_REFRESH_CHUNK users
+with Core statements on their own writer connections, so a refresh never bumps
+data_version (no brief pre-generation) and holds no write transaction
+while it computes. LeadScorer runs refreshes in the background after data
+changes and after a new brief is stored; the leads routes only read the
+stored scores and, when they report `pending`, nudge it with request().
+
+Every worker runs a LeadScorer, so a refresh first claims the fit_model row
+with a conditional UPDATE; the claim is renewed after every chunk and taken
+over once it is FIT_REFRESH_CLAIM_TTL_S old. A worker that finds the claim
+held retries after FIT_CLAIM_RETRY_S, when the refresh has usually finished
+and only the users it missed are left.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from agents.fit_scoring import FIT_ATTRIBUTES, FIT_HIGH_AT, FIT_MEDIUM_AT, fit_scores, icp_segments
+from core.executor import run_cpu
+from db import engine, mark_written, on_data_change
+from db.models import Brief, FitModel, User
+
+logger = logging.getLogger(__name__)
+
+FIT_REFRESH_CHUNK = int(os.getenv("FIT_REFRESH_CHUNK", "5000"))
+FIT_THREAD_AT = 20_000  # rows per chunk before scoring leaves the event loop
+FIT_REFRESH_CLAIM_TTL_S = float(os.getenv("FIT_REFRESH_CLAIM_TTL_S", "120"))
+if FIT_REFRESH_CLAIM_TTL_S <= 0:
+    raise ValueError(f"FIT_REFRESH_CLAIM_TTL_S must be > 0, got {FIT_REFRESH_CLAIM_TTL_S}")
+FIT_CLAIM_RETRY_S = 15.0  # a worker that lost the claim looks again after this long
+LEADS_MAX_PAGE_SIZE = 200
+STOP_GRACE_S = 5.0  # shutdown lets a refresh in progress finish for this long before cancelling it
+LEAD_STATUSES = ("not_engaged", "signed_up")
+
+# Two refreshes would score the same rows twice and race on fit_model
+# (across workers: _claim_refresh)
+_refresh_lock = asyncio.Lock()
+
+_users = User.__table__
+_fit_model = FitModel.__table__
+
+
+async def _latest_icp() -> tuple[str | None, list[tuple[float, dict]], str | None]:
+    """(latest all-users brief id, its ICP segments, brief the stored scores come from); id None without an ICP."""
+    async with engine.connect() as conn:
+        row = (await conn.execute(
+            select(Brief.id, Brief.agent_outputs)
+            .where(Brief.scope.is_(None))
+            .order_by(Brief.created_at.desc())
+            .limit(1)
+        )).first()
+        model_brief = (await conn.execute(select(_fit_model.c.brief_id).where(_fit_model.c.id == 1))).scalar()
+    if row is None:
+        return None, [], model_brief
+    segments = icp_segments((row.agent_outputs or {}).get("icp_agent"))
+    return (row.id if segments else None), segments, model_brief
+
+
+def _fit_model_insert(conn):
+    return pg_insert if conn.dialect.name == "postgresql" else sqlite_insert
+
+
+async def _claim_refresh(token: str, ttl_s: float = FIT_REFRESH_CLAIM_TTL_S) -> bool:
+    """Atomically claim the fit score refresh for `token`; False while another worker's claim is live."""
+    now = datetime.now(timezone.utc)
+    async with engine.begin() as conn:
+        # The row may not exist before the first refresh; brief_id stays NULL until one finishes
+        await conn.execute(
+            _fit_model_insert(conn)(_fit_model).values(id=1, users_scored=0, scored_at=now)
+            .on_conflict_do_nothing(index_elements=["id"])
+        )
+        result = await conn.execute(
+            _fit_model.update()
+            .where(
+                _fit_model.c.id == 1,
+                or_(
+                    _fit_model.c.refresh_claimed_by.is_(None),
+                    _fit_model.c.refresh_claimed_at < now - timedelta(seconds=ttl_s),
+                ),
+            )
+            .values(refresh_claimed_by=token, refresh_claimed_at=now)
+        )
+    return result.rowcount == 1
+
+
+def _own_claim(token: str):
+    return _fit_model.update().where(_fit_model.c.id == 1, _fit_model.c.refresh_claimed_by == token)
+
+
+async def refresh_fit_scores(full: bool = False) -> dict:
+    """
+    Bring User.fit_score up to date with the latest brief's ICP.
+    {"outcome": "rescored" | "incremental" | "up_to_date" | "no_icp" | "claimed_elsewhere",
+     "brief_id", "users_scored", "elapsed_s"}
+    """
+    async with _refresh_lock:
+        token = str(uuid.uuid4())
+        if not await _claim_refresh(token):
+            return {"outcome": "claimed_elsewhere", "brief_id": None, "users_scored": 0, "elapsed_s": 0.0}
+        try:
+            return await _refresh(token, full)
+        finally:
+            async with engine.begin() as conn:
+                await conn.execute(_own_claim(token).values(refresh_claimed_by=None, refresh_claimed_at=None))
+
+
+async def _refresh(token: str, full: bool) -> dict:
+    started = time.perf_counter()
+    brief_id, segments, model_brief = await _latest_icp()
+    if brief_id is None:
+        return {"outcome": "no_icp", "brief_id": None, "users_scored": 0, "elapsed_s": 0.0}
+    full = full or model_brief != brief_id
+
+    columns = [_users.c.id, *(_users.c[a] for a in FIT_ATTRIBUTES)]
+    write = (
+        _users.update()
+        .where(_users.c.id == bindparam("b_id"))
+        .values(fit_score=bindparam("b_score"))
+    )
+    scored, after = 0, ""
+    while True:
+        query = select(*columns).where(_users.c.id > after).order_by(_users.c.id).limit(FIT_REFRESH_CHUNK)
+        if not full:
+            query = query.where(_users.c.fit_score.is_(None))
+        async with engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+        if not rows:
+            break
+        values = {a: [r[i + 1] for r in rows] for i, a in enumerate(FIT_ATTRIBUTES)}
+        scores = await run_cpu(fit_scores, values, segments, size=len(rows), thread_at=FIT_THREAD_AT)
+        async with engine.begin() as conn:
+            await conn.execute(write, [{"b_id": r.id, "b_score": round(float(s), 4)} for r, s in zip(rows, scores)])
+            # Heartbeat: the claim stays live for as long as chunks keep landing
+            await conn.execute(_own_claim(token).values(refresh_claimed_at=datetime.now(timezone.utc)))
+        mark_written("users")
+        scored += len(rows)
+        after = rows[-1].id
+        if len(rows) < FIT_REFRESH_CHUNK:
+            break
+
+    if full or scored:
+        values = {
+            "brief_id": brief_id,
+            "segments": [list(s) for s in segments],
+            "users_scored": scored,
+            "scored_at": datetime.now(timezone.utc),
+        }
+        async with engine.begin() as conn:
+            await conn.execute(
+                _fit_model_insert(conn)(_fit_model).values(id=1, **values)
+                .on_conflict_do_update(index_elements=["id"], set_=values)
+            )
+        mark_written("fit_model")
+
+    result = {
+        "outcome": "rescored" if full else ("incremental" if scored else "up_to_date"),
+        "brief_id": brief_id,
+        "users_scored": scored,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+    if scored:
+        logger.info("Fit scores: %s", result)
+    return result
+
+
+async def _model_info(db: AsyncSession) -> dict | None:
+    model = await db.get(FitModel, 1)
+    if model is None or model.brief_id is None:
+        return None  # no refresh has finished yet
+    return {
+        "brief_id": model.brief_id,
+        "segments": model.segments,
+        "scored_at": model.scored_at.isoformat() if model.scored_at else None,
+    }
+
+
+async def _pending(db: AsyncSession, model: dict | None, unscored: int) -> bool:
+    """Whether a refresh is due: the latest brief with an ICP isn't the scored one, or users lack a score."""
+    row = (await db.execute(
+        select(Brief.id, Brief.agent_outputs).where(Brief.scope.is_(None)).order_by(Brief.created_at.desc()).limit(1)
+    )).first()
+    if row is None or not icp_segments((row.agent_outputs or {}).get("icp_agent")):
+        return False
+    return unscored > 0 or model is None or model["brief_id"] != row.id
+
+
+async def get_fit_distribution(db: AsyncSession, status: str | None = None) -> dict:
+    """high / medium / low counts over stored scores (index range counts), plus unscored users."""
+    score = User.fit_score
+    row = (await db.execute(
+        select(
+            func.count().filter(score >= FIT_HIGH_AT),
+            func.count().filter(score >= FIT_MEDIUM_AT, score < FIT_HIGH_AT),
+            func.count().filter(score < FIT_MEDIUM_AT),
+            func.count().filter(score.is_(None)),
+        ).where(*([User.status == status] if status else []))
+    )).one()
+    model = await _model_info(db)
+    return {
+        "fit_score_distribution": {"high_fit": row[0], "medium_fit": row[1], "low_fit": row[2]},
+        "unscored": row[3],
+        "thresholds": {"high": FIT_HIGH_AT, "medium": FIT_MEDIUM_AT},
+        "model": model,
+        "pending": await _pending(db, model, row[3]),
+    }
+
+
+async def get_top_leads(
+    db: AsyncSession, page: int = 1, page_size: int = 50, status: str = "not_engaged"
+) -> dict:
+    """
+    Users with `status` ranked by fit score (ties by id), one page at a time.
+    Users not scored yet are left out and counted in `unscored`.
+    """
+    page = max(page, 1)
+    page_size = max(1, min(page_size, LEADS_MAX_PAGE_SIZE))
+    where = (User.status == status, User.fit_score.is_not(None))
+    total, unscored = (await db.execute(
+        select(func.count().filter(User.fit_score.is_not(None)), func.count().filter(User.fit_score.is_(None)))
+        .where(User.status == status)
+    )).one()
+    model = await _model_info(db)
+    rows = (await db.execute(
+        select(User)
+        .where(*where)
+        .order_by(User.fit_score.desc(), User.id)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )).scalars().all()
+    return {
+        "leads": [
+            {
+                "id": u.id,
+                "name": u.name,
+                "email": u.email,
+                "company": u.company,
+                "company_size": u.company_size,
+                "role": u.role,
+                "industry": u.industry,
+                "source": u.source,
+                "status": u.status,
+                "fit_score": u.fit_score,
+            }
+            for u in rows
+        ],
+        "total": total,
+        "unscored": unscored,
+        "page": page,
+        "page_size": page_size,
+        "model": model,
+        "pending": await _pending(db, model, unscored),
+    }
+
+
+class LeadScorer:
+    """
+    Background refresher. request() only sets a flag, so it is cheap to call
+    after every commit; the loop task (started in the app lifespan, outside
+    any request's trace context) coalesces requests into one refresh.
+    """
+
+    def __init__(self):
+        self.last_run: dict | None = None
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._subscribed = False
+        self._stopping = False
+
+    def request(self) -> None:
+        self._wake.set()
+
+    def start(self) -> "LeadScorer":
+        if not self._subscribed:
+            on_data_change(self.request)
+            self._subscribed = True
+        self._stopping = False
+        self._task = asyncio.create_task(self._loop())
+        self.request()  # scores for users added while no worker was running
+        return self
+
+    async def _loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                self.last_run = await refresh_fit_scores()
+            except Exception:
+                logger.exception("Fit score refresh failed")
+                continue
+            if self.last_run["outcome"] == "claimed_elsewhere":
+                # Look again once the other worker's refresh has likely finished
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=FIT_CLAIM_RETRY_S)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=STOP_GRACE_S)  # cancels it on timeout
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self._task = None
+
+
+lead_scorer = LeadScorer()
@@ -0,0 +1,70 @@
+"""
+Stats drift — how far the user distribution has moved since a brief was made.
+
+Compares two `_load_stats()` results dimension by dimension (source,
+company size, role, industry, signup status) with a distance between the
+normalized distributions, plus the relative change in total users. The
+drift score is the largest of these, so one segment shifting is enough to
+count as drift even if the others are unchanged.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Callable
+
+_DIMENSIONS = ("by_source", "by_company_size", "by_role", "by_industry")
+
+
+def total_variation(p: dict[str, float], q: dict[str, float]) -> float:
+    return 0.5 * sum(abs(p.get(k, 0.0) - q.get(k, 0.0)) for k in p.keys() | q.keys())
+
+
+def hellinger(p: dict[str, float], q: dict[str, float]) -> float:
+    s = sum((math.sqrt(p.get(k, 0.0)) - math.sqrt(q.get(k, 0.0))) ** 2 for k in p.keys() | q.keys())
+    return math.sqrt(s / 2)
+
+
+DRIFT_METRICS: dict[str, Callable[[dict[str, float], dict[str, float]], float]] = {
+    "tv": total_variation,
+    "hellinger": hellinger,
+}
+
+DRIFT_METRIC = os.getenv("BRIEF_DRIFT_METRIC", "tv")
+if DRIFT_METRIC not in DRIFT_METRICS:
+    raise ValueError(f"BRIEF_DRIFT_METRIC must be one of {sorted(DRIFT_METRICS)}, got {DRIFT_METRIC!r}")
+
+
+def _normalize(counts: dict) -> dict[str, float]:
+    # Keys as the JSON column stores them, so live stats match a snapshot
+    total = sum(counts.values())
+    if not total:
+        return {}
+    return {("null" if k is None else str(k)): v / total for k, v in counts.items()}
+
+
+def _status(stats: dict) -> dict[str, int]:
+    signed, not_engaged = stats.get("signed_up", 0), stats.get("not_engaged", 0)
+    return {
+        "signed_up": signed,
+        "not_engaged": not_engaged,
+        "other": max(0, stats.get("total", 0) - signed - not_engaged),
+    }
+
+
+def stats_drift(current: dict, snapshot: dict, metric: str = DRIFT_METRIC) -> dict:
+    """{metric, score, by_dimension}; score is the max over dimensions, in [0, 1]."""
+    distance = DRIFT_METRICS[metric]
+    dims = {
+        d: distance(_normalize(current.get(d) or {}), _normalize(snapshot.get(d) or {}))
+        for d in _DIMENSIONS
+    }
+    dims["status"] = distance(_normalize(_status(current)), _normalize(_status(snapshot)))
+    a, b = current.get("total", 0), snapshot.get("total", 0)
+    dims["total"] = abs(a - b) / max(a, b) if max(a, b) else 0.0
+    return {
+        "metric": metric,
+        "score": round(max(dims.values()), 6),
+        "by_dimension": {k: round(v, 6) for k, v in dims.items()},
+    }
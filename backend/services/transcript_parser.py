@@ -0,0 +1,117 @@
+"""
+Transcript parser — single-pass line tokenizer for interview transcripts.
+
+Extracts friction points, the bottom-line impact and PM Q&A pairs in one
+sweep over the lines, so a transcript is never split into a list or
+rescanned. Files are read through a buffered stream; memory is bounded by
+the longest line plus the extracted results, regardless of file size.
+
+Output matches `_extract_key_insights` + `_extract_pm_questions` in
+interview_service for line-oriented transcripts.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+_FRICTION_RE = re.compile(r"Friction Point \d+ \(([^)]+)\):\s*(.+?)(?:Action:\s*(.+))?$")
+_BOTTOM_LINE_RE = re.compile(r"Bottom Line Impact:\s*(.+?)$")
+_PM_PREFIX_RE = re.compile(r"^\[[\d:]+\]\s*PM:\s*")
+_SPEAKER_PREFIX_RE = re.compile(r"^\[[\d:]+\]\s*\w+:\s*")
+
+# A PM question is answered by the first non-PM, non-blank line within
+# this many lines after it.
+_ANSWER_WINDOW = 3
+
+_READ_BUFFER = 1 << 20
+
+# Below this many files the process pool costs more than it saves
+PARALLEL_MIN_FILES = 4
+
+
+def parse_lines(lines: Iterable[str]) -> dict:
+    """
+    Tokenize transcript lines in a single pass.
+    Returns: { key_insights, pm_questions }
+    """
+    friction: list[dict] = []
+    bottom_line: dict | None = None
+    questions: list[dict] = []
+    # Open questions awaiting an answer: [question_text, lines_remaining]
+    pending: list[list] = []
+
+    # Lines keep their trailing newline: `$` matches before it and every
+    # extracted field is stripped, so there is no need to rstrip each line.
+    for line in lines:
+        is_pm = "] PM:" in line
+
+        if pending:
+            if not is_pm and line.strip():
+                answer = _SPEAKER_PREFIX_RE.sub("", line).strip()
+                if answer:
+                    questions.extend({"question": q, "answer": answer} for q, _ in pending)
+                pending.clear()
+            else:
+                for p in pending:
+                    p[1] -= 1
+                pending = [p for p in pending if p[1] > 0]
+
+        if is_pm and "?" in line:
+            q_text = _PM_PREFIX_RE.sub("", line).strip()
+            if q_text:
+                pending.append([q_text, _ANSWER_WINDOW])
+
+        if "Friction Point" in line:
+            m = _FRICTION_RE.search(line)
+            if m:
+                friction.append({
+                    "type": "friction",
+                    "area": m.group(1).strip(),
+                    "description": m.group(2).strip().rstrip("."),
+                    "action": m.group(3).strip().rstrip(".") if m.group(3) else None,
+                })
+        if bottom_line is None and "Bottom Line Impact:" in line:
+            m = _BOTTOM_LINE_RE.search(line)
+            if m:
+                bottom_line = {
+                    "type": "bottom_line",
+                    "area": "Revenue Impact",
+                    "description": m.group(1).strip(),
+                    "action": None,
+                }
+
+    insights = friction + ([bottom_line] if bottom_line else [])
+    return {"key_insights": insights, "pm_questions": questions}
+
+
+def parse_text(text: str) -> dict:
+    """Parse an in-memory transcript."""
+    return parse_lines(text.split("\n"))
+
+
+def parse_file(path: str | os.PathLike) -> dict:
+    """Stream-parse a transcript file without loading it whole."""
+    with open(path, encoding="utf-8", buffering=_READ_BUFFER) as f:
+        return parse_lines(f)
+
+
+def parse_files(
+    paths: list[str | os.PathLike],
+    max_workers: int | None = None,
+) -> dict[str, dict]:
+    """
+    Parse many transcript files, fanning out across a process pool when
+    there are enough of them. Returns { str(path): parsed }.
+    """
+    keys = [str(Path(p)) for p in paths]
+    if len(keys) < PARALLEL_MIN_FILES or max_workers == 1:
+        return {k: parse_file(k) for k in keys}
+
+    workers = max_workers or min(len(keys), os.cpu_count() or 1)
+    chunksize = max(1, len(keys) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(keys, pool.map(parse_file, keys, chunksize=chunksize)))
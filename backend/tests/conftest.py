@@ -0,0 +1,27 @@
+"""
+Test configuration — every test module shares one throwaway SQLite file.
+
+Settings are read from the environment at import time, so they are set
+here, before any application module is imported.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+_TMP = Path(tempfile.mkdtemp(prefix="apm-tests-"))
+
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{_TMP / 'primary.db'}",
+    # A replica that only catches up when a test syncs it (db/local_replica.py)
+    DATABASE_READ_URL=f"sqlite+aiosqlite:///{_TMP / 'replica.db'}",
+    DATABASE_REPLICA_LAG_S="30",
+    BATCH_DIR=str(_TMP / "batches"),
+    BATCH_POLL_S="0.01",
+    BRIEF_PREGEN_ENABLED="0",
+    WARM_CACHES="0",
+)
+os.environ.pop("OPENAI_API_KEY", None)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
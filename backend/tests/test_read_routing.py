@@ -0,0 +1,69 @@
+"""Read-your-writes routing against a local SQLite replica."""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+
+import db.database as database
+from db import Brief, ReadYourWritesMiddleware, engine, get_db, init_db, mark_written, read_db, read_engine
+from db.local_replica import LocalReplica, _sqlite_file
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/briefs")
+    async def create(db=Depends(get_db)):
+        brief = Brief(content={}, summary="fresh")
+        db.add(brief)
+        await db.commit()
+        mark_written("briefs")
+        return {"id": brief.id}
+
+    @app.get("/briefs/{brief_id}")
+    async def read(brief_id: str, db=Depends(read_db("briefs"))):
+        return {"found": await db.get(Brief, brief_id) is not None, "writer": db.bind is engine}
+
+    return app
+
+
+def test_write_token_keeps_reads_on_writer_across_workers():
+    assert database.HAS_REPLICA
+
+    async def scenario():
+        await init_db()
+        replica = LocalReplica(_sqlite_file(database.DATABASE_URL), _sqlite_file(database.DATABASE_READ_URL), 1.0)
+        await asyncio.to_thread(replica.sync)  # schema only: the brief below is written afterwards
+
+        transport = httpx.ASGITransport(app=_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post("/briefs")
+            brief_id = created.json()["id"]
+            token = created.headers[database.WRITE_AT_HEADER]
+            assert abs(float(token) - time.time()) < 5
+            assert client.cookies[database.WRITE_AT_COOKIE] == token
+
+            # Same worker: its own write record routes the read to the writer
+            assert (await client.get(f"/briefs/{brief_id}")).json() == {"found": True, "writer": True}
+
+            # Another worker has no record of the write; the cookie still routes to the writer
+            database._last_write.clear()
+            assert (await client.get(f"/briefs/{brief_id}")).json() == {"found": True, "writer": True}
+
+            # A client without the token reads the lagging replica and misses the brief
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as other:
+                assert (await other.get(f"/briefs/{brief_id}")).json() == {"found": False, "writer": False}
+
+                # Once the token is older than the lag window, reads go back to the replica
+                stale = f"{time.time() - database.REPLICA_LAG_S - 1:.3f}"
+                await asyncio.to_thread(replica.sync)
+                response = await other.get(f"/briefs/{brief_id}", headers={database.WRITE_AT_HEADER: stale})
+                assert response.json() == {"found": True, "writer": False}
+
+        await engine.dispose()
+        await read_engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,101 @@
+"""Schema validation and field-level repair in BaseAgent, with scripted completions."""
+
+import asyncio
+import json
+
+from agents.base import MAX_REPAIR_ATTEMPTS
+from agents.segmentation_agent import SegmentationAgent
+
+_ACTION = {"action": "Nudge", "type": "send_email", "target_segment": "stalled", "priority": "high", "details": "d"}
+_VALID = {
+    "engagement_summary": "Most sign-ups stall before activation",
+    "conversion_rate": "33%",
+    "drop_off_points": [],
+    "engagement_patterns": [],
+    "at_risk_segments": [],
+    "recommended_actions": [_ACTION],
+}
+
+
+class ScriptedAgent(SegmentationAgent):
+    """Answers the primary call and each repair call from `replies`, in order."""
+
+    def __init__(self, *replies):
+        self.replies = [r if isinstance(r, str) else json.dumps(r) for r in replies]
+        self.prompts: list[str] = []
+
+    async def _complete(self, user_prompt, usage, route, temperature=None):
+        self.prompts.append(user_prompt)
+        return self.replies.pop(0)
+
+
+def _without(key: str) -> dict:
+    return {k: v for k, v in _VALID.items() if k != key}
+
+
+def _run(agent: ScriptedAgent) -> dict:
+    out = asyncio.run(agent.run(user_summary="users", stats={}))
+    assert not agent.replies, "every scripted reply should be consumed"
+    return out
+
+
+def test_missing_field_repaired_in_one_call():
+    agent = ScriptedAgent(_without("engagement_summary"), {"engagement_summary": "Fixed"})
+
+    out = _run(agent)
+
+    assert out["validation"]["valid"] is True
+    assert out["validation"]["repairs"] == 1
+    assert out["validation"]["invalid_fields"] == ["engagement_summary"]
+    assert out["result"]["engagement_summary"] == "Fixed"
+    assert out["result"]["conversion_rate"] == "33%"
+    # The repair prompt asks for the failing field only
+    assert agent.prompts[1].rstrip().endswith("ONLY these keys, corrected to match the schema in your instructions: engagement_summary.")
+
+
+def test_out_of_enum_priority_repaired():
+    bad = {**_VALID, "recommended_actions": [{**_ACTION, "priority": "urgent"}]}
+    agent = ScriptedAgent(bad, {"recommended_actions": [_ACTION]})
+
+    out = _run(agent)
+
+    assert out["validation"]["valid"] is True
+    assert out["validation"]["invalid_fields"] == ["recommended_actions"]
+    assert out["result"]["recommended_actions"][0]["priority"] == "high"
+    assert "urgent" in agent.prompts[1]
+
+
+def test_repair_reply_merges_only_requested_keys():
+    patch = {"engagement_summary": "Fixed", "conversion_rate": "99%", "injected": True}
+    agent = ScriptedAgent(_without("engagement_summary"), patch)
+
+    out = _run(agent)
+
+    assert out["validation"]["valid"] is True
+    assert out["result"]["engagement_summary"] == "Fixed"
+    assert out["result"]["conversion_rate"] == "33%"
+    assert "injected" not in out["result"]
+
+
+def test_non_json_response_requests_every_required_field():
+    agent = ScriptedAgent("Sorry, I can't help with that.", _VALID)
+
+    out = _run(agent)
+
+    assert out["validation"]["valid"] is True
+    assert out["validation"]["invalid_fields"] == sorted(_VALID)
+    assert out["result"]["recommended_actions"] == [_ACTION]
+
+
+def test_exhausted_repairs_return_original_data_as_invalid():
+    original = _without("engagement_summary")
+    # One reply that doesn't parse, then answers without the requested key
+    replies = ["not json"] + [{"conversion_rate": "99%"}] * (MAX_REPAIR_ATTEMPTS - 1)
+    agent = ScriptedAgent(original, *replies)
+
+    out = _run(agent)
+
+    assert out["validation"]["valid"] is False
+    assert out["validation"]["repairs"] == MAX_REPAIR_ATTEMPTS
+    assert out["result"] == original
+    assert len(agent.prompts) == 1 + MAX_REPAIR_ATTEMPTS
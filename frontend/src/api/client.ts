@@ -40,7 +40,11 @@ export interface Brief {
   agent_outputs: any;
   feedback: string | null;
   parent_brief_id: string | null;
+  scope?: string | null;  // segment of a bulk run, e.g. "industry=SaaS"; null = all users
   created_at: string;
+  // generate-brief only: whether the latest brief was returned as-is
+  reused?: boolean;
+  drift?: { metric: string; score: number; by_dimension: Record<string, number> } | null;
 }
 
 export interface CrmUser {
@@ -55,6 +59,18 @@ export interface CrmUser {
   status: string;
 }
 
+export interface Lead extends CrmUser {
+  fit_score: number;  // 0–1 fit against the latest brief's ICP
+}
+
+export interface TopLeads {
+  leads: Lead[];
+  total: number;
+  page: number;
+  page_size: number;
+  model: { brief_id: string; segments: [number, Record<string, string>][]; scored_at: string } | null;
+}
+
 export interface RecommendedAction {
   action: string;
   type: 'send_email' | 'schedule_zoom' | 'schedule_meeting' | 'crm_update' | 'create_campaign' | 'send_slack';
@@ -91,7 +107,7 @@ export interface Interview {
 }
 
 export interface EngagementData {
-  weekly_trends: { week: string; week_label: string; dau: number; wau: number; signups: number; churn: number; nps: number }[];
+  weekly_trends: { week: string; week_label: string; start: string; end: string; dau: number; wau: number; active: number; signups: number; churn: number | null }[];
   funnel: { stage: string; count: number; rate: number }[];
   feature_adoption: { feature: string; enterprise: number; mid_market: number; smb: number; free: number }[];
   segments: { name: string; users: number; revenue: number; dau_mau: number; health: number }[];
@@ -105,12 +121,14 @@ export interface AgentEvent {
   thinking?: string[];
   summary?: string;
   elapsed_s?: number;
+  routing?: { tier?: string; model?: string; reason?: string } & Record<string, any>;
   phase?: number;
   agents?: string[];
   brief?: any;
   brief_id?: string;
   confidence_score?: number;
   agent_outputs?: any;
+  clusters?: any[];
   timing?: Record<string, number>;
   created_at?: string;
 }
@@ -123,8 +141,8 @@ export const mockConnectCrm = () =>
 export const fetchMetrics = () =>
   request<Stats>('/metrics');
 
-export const generateBrief = () =>
-  request<Brief>('/generate-brief', { method: 'POST' });
+export const generateBrief = (force = false) =>
+  request<Brief>(`/generate-brief${force ? '?force=true' : ''}`, { method: 'POST' });
 
 export const submitFeedback = (brief_id: string, feedback: string) =>
   request<Brief>('/feedback', {
@@ -144,6 +162,16 @@ export const fetchInterviews = () =>
 export const fetchInterview = (id: number) =>
   request<Interview>(`/interviews/${id}`);
 
+export const fetchTopLeads = (page = 1, page_size = 50, status: 'not_engaged' | 'signed_up' = 'not_engaged') =>
+  request<TopLeads>(`/leads/top?page=${page}&page_size=${page_size}&status=${status}`);
+
+/** Download URL (not fetched: the file streams straight to the browser). */
+export const exportUrl = (
+  dataset: 'users' | 'actions' | 'product_recommendations',
+  format: 'csv' | 'parquet' = 'csv',
+  brief_id?: string,
+) => `${BASE}/export/${dataset}?format=${format}${brief_id ? `&brief_id=${encodeURIComponent(brief_id)}` : ''}`;
+
 export const fetchEngagementData = () =>
   request<EngagementData>('/engagement-data');
 
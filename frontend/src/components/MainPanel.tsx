@@ -415,27 +415,6 @@ function renderEngagementCharts(data: EngagementData) {
           </tbody>
         </table>
       </div>
-
-      {/* NPS Trend */}
-      <div className="card compact">
-        <h3>NPS Score (Weekly)</h3>
-        <div style={{ height: 140 }}>
-          <ResponsiveContainer width="100%" height="100%">
-            <AreaChart data={data.weekly_trends}>
-              <defs>
-                <linearGradient id="npsGrad" x1="0" y1="0" x2="0" y2="1">
-                  <stop offset="5%" stopColor="#00b894" stopOpacity={0.4} />
-                  <stop offset="95%" stopColor="#00b894" stopOpacity={0} />
-                </linearGradient>
-              </defs>
-              <XAxis dataKey="week" tick={{ fontSize: 10, fill: '#8b8fa3' }} />
-              <YAxis tick={{ fontSize: 10, fill: '#8b8fa3' }} width={30} domain={[20, 55]} />
-              <Tooltip contentStyle={{ background: '#1a1d27', border: '1px solid #2d3141', borderRadius: 6, fontSize: 11 }} />
-              <Area type="monotone" dataKey="nps" stroke="#00b894" fill="url(#npsGrad)" strokeWidth={2} />
-            </AreaChart>
-          </ResponsiveContainer>
-        </div>
-      </div>
     </>
   )
 }